@@ -0,0 +1,90 @@
+"""
+Benchmark of loading edges: ORM `add_all` of mapped edges, as ingest used to do, against the
+streaming parser & binary COPY of `insert_edges`.
+
+Needs a PostGIS database with the application schema at DATABASE_URL. Edges & nodes are written
+to temporary tables shadowing the real ones, which are dropped with the rolled back transaction.
+
+    python -m benchmarks.bench_edge_copy --edges 50000
+"""
+import argparse
+import asyncio
+import io
+import json
+import time
+import uuid
+
+from geoalchemy2.shape import from_shape
+from shapely.geometry import shape
+from sqlalchemy import text
+from starlette.datastructures import UploadFile
+
+from src.database import async_session
+from src.apps.road_network.models import EdgeModel, RoadNetworkModel
+from src.apps.road_network.utils import insert_edges
+from .data import feature_collection_bytes, synthetic_features
+
+
+async def _shadow_tables(session) -> None:
+    # Temporary tables come first in the search path, so they shadow the real tables
+    for table in ("edge", "node"):
+        await session.execute(
+            text(f"CREATE TEMP TABLE {table} (LIKE public.{table} INCLUDING DEFAULTS) ON COMMIT DROP")
+        )
+
+
+async def _orm_load(document: bytes, road_network: RoadNetworkModel) -> float:
+    async with async_session() as session:
+        await _shadow_tables(session)
+        start = time.perf_counter()
+
+        edges = [
+            EdgeModel(
+                network_id=road_network.id,
+                root_network_id=road_network.root_id,
+                valid_from_version=road_network.version,
+                properties=feature.get("properties", {}),
+                geometry=from_shape(shape(feature["geometry"]), srid=4326),
+            )
+            for feature in json.loads(document)["features"]
+        ]
+        session.add_all(edges)
+        await session.flush()
+
+        elapsed = time.perf_counter() - start
+        await session.rollback()
+
+    return elapsed
+
+
+async def _copy_load(document: bytes, road_network: RoadNetworkModel) -> float:
+    async with async_session() as session:
+        await _shadow_tables(session)
+        start = time.perf_counter()
+
+        await insert_edges(session, road_network, UploadFile(io.BytesIO(document)))
+
+        elapsed = time.perf_counter() - start
+        await session.rollback()
+
+    return elapsed
+
+
+async def main(edge_count: int, repeat: int) -> None:
+    document = feature_collection_bytes(synthetic_features(edge_count))
+    network_id = str(uuid.uuid4())
+    road_network = RoadNetworkModel(
+        id=network_id, name="benchmark", version=1.0, customer_id=str(uuid.uuid4()), root_id=network_id
+    )
+
+    for name, load in (("ORM add_all", _orm_load), ("COPY", _copy_load)):
+        elapsed = min([await load(document, road_network) for _ in range(repeat)])
+        print(f"{name:12} {edge_count} edges in {elapsed:.2f} s, {edge_count / elapsed:,.0f} edges/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--edges", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.edges, arguments.repeat))
@@ -0,0 +1,106 @@
+"""
+Benchmark of serving the edges of a network version: ORM rows turned into GeoJSON in Python, as
+the edges endpoint used to do, against the Feature JSON built by PostGIS in `stream_edges_geojson`.
+
+Needs a PostGIS database with the application schema at DATABASE_URL. A benchmark customer & network
+are created for the run & deleted afterwards.
+
+    python -m benchmarks.bench_edges_stream --edges 50000
+"""
+import argparse
+import asyncio
+import io
+import json
+import time
+import uuid
+
+from geoalchemy2.shape import to_shape
+from shapely.geometry import mapping
+from sqlmodel import delete, select
+from starlette.datastructures import UploadFile
+
+from src.database import async_session
+from src.apps.customer.models import CustomerModel
+from src.apps.road_network.models import EdgeModel, NodeModel, RoadNetworkModel
+from src.apps.road_network.utils import (
+    PROMOTED_PROPERTY_COLUMNS, insert_edges, live_edge_filters, stream_edges_geojson
+)
+from .data import feature_collection_bytes, synthetic_features
+
+
+async def _create_network(edge_count: int) -> RoadNetworkModel:
+    async with async_session() as session:
+        customer = CustomerModel(name=f"benchmark-{uuid.uuid4()}")
+        road_network = RoadNetworkModel(name="benchmark", version=1.0, customer_id=customer.id)
+        road_network.root_id = road_network.id
+        session.add(customer)
+        await session.flush()
+        session.add(road_network)
+        await session.flush()
+
+        document = feature_collection_bytes(synthetic_features(edge_count))
+        await insert_edges(session, road_network, UploadFile(io.BytesIO(document)))
+        await session.commit()
+
+    return road_network
+
+
+async def _delete_network(road_network: RoadNetworkModel) -> None:
+    async with async_session() as session:
+        await session.execute(delete(EdgeModel).where(EdgeModel.root_network_id == road_network.root_id))
+        await session.execute(delete(NodeModel).where(NodeModel.root_network_id == road_network.root_id))
+        await session.execute(delete(RoadNetworkModel).where(RoadNetworkModel.id == road_network.id))
+        await session.execute(delete(CustomerModel).where(CustomerModel.id == road_network.customer_id))
+        await session.commit()
+
+
+async def _orm_geojson(road_network: RoadNetworkModel) -> bytes:
+    async with async_session() as session:
+        edges_result = await session.execute(select(EdgeModel).where(*live_edge_filters(road_network)))
+        features = []
+
+        for edge in edges_result.scalars():
+            properties = dict(edge.properties or {})
+            for column in PROMOTED_PROPERTY_COLUMNS:
+                if getattr(edge, column) is not None:
+                    properties[column] = getattr(edge, column)
+
+            features.append({
+                "type": "Feature",
+                "geometry": mapping(to_shape(edge.geometry)),
+                "properties": properties,
+            })
+
+    return json.dumps({"type": "FeatureCollection", "features": features}).encode()
+
+
+async def _postgis_geojson(road_network: RoadNetworkModel) -> bytes:
+    return b"".join([chunk async for chunk in stream_edges_geojson(road_network)])
+
+
+async def main(edge_count: int, repeat: int) -> None:
+    road_network = await _create_network(edge_count)
+
+    try:
+        for name, render in (("ORM", _orm_geojson), ("PostGIS", _postgis_geojson)):
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                document = await render(road_network)
+                timings.append(time.perf_counter() - start)
+
+            elapsed = min(timings)
+            print(
+                f"{name:8} {edge_count} edges in {elapsed:.2f} s, {edge_count / elapsed:,.0f} edges/s, "
+                f"{len(document) / 1e6:.1f} MB"
+            )
+    finally:
+        await _delete_network(road_network)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--edges", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.edges, arguments.repeat))
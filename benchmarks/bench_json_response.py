@@ -0,0 +1,74 @@
+"""
+Microbenchmark of rendering typical JSON responses: `jsonable_encoder` & Starlette's `JSONResponse`,
+as `success_response` used to do, against `FastJSONResponse`. Needs no database.
+
+    python -m benchmarks.bench_json_response
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src.global_utils import FastJSONResponse
+from src.apps.road_network.models import RoadNetworkModel
+from .data import measure
+
+
+def _payloads(size: int) -> dict[str, dict]:
+    generator = random.Random(0)
+    created_at = datetime(2025, 1, 1)
+    networks = [
+        RoadNetworkModel(
+            name=f"network-{index % 50}",
+            version=1.0 + index // 50 / 10,
+            customer_id="customer",
+            root_id="root",
+            created_at=created_at + timedelta(minutes=index),
+        )
+        for index in range(size)
+    ]
+    coordinates = [[11.9 + index * 1e-5, 47.6 + generator.uniform(0, 1e-3)] for index in range(size * 5)]
+    matrix_size = int(size ** 0.5) * 3
+
+    return {
+        "network list": {"status_code": 200, "detail": "", "data": networks},
+        "route": {
+            "status_code": 200,
+            "detail": "",
+            "data": {
+                "type": "Feature",
+                "geometry": {"type": "LineString", "coordinates": coordinates},
+                "properties": {"distance": 12345.67, "edge_ids": [f"edge-{index}" for index in range(size)]},
+            },
+        },
+        f"{matrix_size}x{matrix_size} matrix": {
+            "status_code": 200,
+            "detail": "",
+            "data": {
+                "distances": [
+                    [round(generator.uniform(0, 50000), 2) for _ in range(matrix_size)]
+                    for _ in range(matrix_size)
+                ]
+            },
+        },
+    }
+
+
+def main(size: int, repeat: int) -> None:
+    for name, content in _payloads(size).items():
+        stdlib = measure(lambda: JSONResponse(content=jsonable_encoder(content)), repeat)
+        fast = measure(lambda: FastJSONResponse(content=content), repeat)
+        print(
+            f"{name:18} jsonable_encoder + json {stdlib * 1000:8.2f} ms   "
+            f"FastJSONResponse {fast * 1000:7.2f} ms   {stdlib / fast:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+    main(arguments.size, arguments.repeat)
@@ -0,0 +1,59 @@
+"""
+Microbenchmark of `EdgeIndex.snap` & `EdgeIndex.match` on a synthetic network, in points per
+second. Needs no database.
+
+    python -m benchmarks.bench_snap
+"""
+import argparse
+
+import numpy as np
+import shapely
+
+from src.apps.road_network.graph import RoadGraph
+from src.apps.road_network.snapping import EdgeIndex
+from .data import measure, synthetic_features
+
+
+def _edge_index(edges: int) -> EdgeIndex:
+    features = synthetic_features(edges)
+    graph = RoadGraph.build(
+        edge_ids=[f"edge-{index}" for index in range(edges)],
+        geometries_wkb=shapely.to_wkb(
+            shapely.linestrings([feature["geometry"]["coordinates"] for feature in features])
+        ).tolist(),
+        lengths=[feature["properties"]["length"] for feature in features],
+        oneways=[feature["properties"]["oneway"] for feature in features],
+    )
+    return EdgeIndex(graph)
+
+
+def main(edges: int, points: int, repeat: int) -> None:
+    edge_index = _edge_index(edges)
+    generator = np.random.default_rng(0)
+
+    # Points within ~10 m of the roads, & points in the empty space between the grid rows
+    vertices = edge_index.segment_a[generator.integers(0, len(edge_index.segment_a), points)]
+    near_lons = vertices[:, 0] / edge_index.lon_scale + generator.normal(0, 5e-5, points)
+    near_lats = vertices[:, 1] + generator.normal(0, 5e-5, points)
+    far_lats = near_lats + 5e-4
+
+    # A trace driving along one road, a point every ~4 m
+    trace_lons = np.linspace(11.9, 11.9007, 200)
+    trace_lats = np.full(200, 47.6) + generator.normal(0, 2e-5, 200)
+
+    for name, function, count in (
+        ("snap near roads", lambda: edge_index.snap(near_lons, near_lats), points),
+        ("snap off roads", lambda: edge_index.snap(near_lons, far_lats), points),
+        ("match trace", lambda: edge_index.match(trace_lons, trace_lats), len(trace_lons)),
+    ):
+        seconds = measure(function, repeat)
+        print(f"{name:16} {count:8} points {seconds * 1000:8.2f} ms   {count / seconds:12,.0f} points/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--edges", type=int, default=100_000)
+    parser.add_argument("--points", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+    main(arguments.edges, arguments.points, arguments.repeat)
@@ -0,0 +1,75 @@
+import json
+import random
+import time
+from collections.abc import Callable, Iterator
+from typing import Any
+
+HIGHWAYS = ("residential", "primary", "secondary", "tertiary", "service")
+
+
+def synthetic_features(count: int, points: int = 8, seed: int = 0) -> list[dict]:
+    """
+    Builds GeoJSON LineString features shaped like OSM road edges, on a grid around Bayrischzell.
+
+    Args:
+        count (int): Number of features.
+        points (int): Number of coordinates of each LineString.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        list[dict]: The features.
+    """
+    generator = random.Random(seed)
+    features = []
+
+    for index in range(count):
+        lon = 11.9 + (index % 1000) * 1e-3
+        lat = 47.6 + (index // 1000) * 1e-3
+        coordinates = [
+            [round(lon + step * 1e-4 + generator.uniform(-2e-5, 2e-5), 7),
+             round(lat + generator.uniform(-2e-5, 2e-5), 7)]
+            for step in range(points)
+        ]
+        features.append({
+            "type": "Feature",
+            "properties": {
+                "name": f"Road {index}",
+                "highway": generator.choice(HIGHWAYS),
+                "lanes": generator.randint(1, 4),
+                "oneway": generator.random() < 0.2,
+                "length": round(generator.uniform(10, 500), 2),
+                "osm_id": 100000 + index,
+            },
+            "geometry": {"type": "LineString", "coordinates": coordinates},
+        })
+
+    return features
+
+
+def feature_collection_bytes(features: list[dict]) -> bytes:
+    """
+    Encodes features as a GeoJSON FeatureCollection document.
+    """
+    return json.dumps({"type": "FeatureCollection", "features": features}).encode()
+
+
+def measure(function: Callable[[], Any], repeat: int = 5) -> float:
+    """
+    Returns the best wall time of `repeat` calls of a function, in seconds.
+    """
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def chunks(items: list[Any], size: int) -> Iterator[list[Any]]:
+    """
+    Splits a list into lists of at most `size` items.
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
@@ -20,7 +20,7 @@ async def create_customer(
     Creates a new customer with the given details. Requires an admin user to perform the operation.
 
     Args:
-        payload (CreateCustomerSchema): Customer data including the name.
+        payload (CreateCustomerSchema): Customer data including the name & the default coordinate precision of edge responses.
         current_user (UserModel): Currently authenticated admin user dependency.
         session (AsyncSession): Database session dependency.
 
@@ -30,6 +30,7 @@ async def create_customer(
     try:
         customer = CustomerModel(
             name=payload.name,
+            coordinate_precision=payload.coordinate_precision,
         )
         session.add(customer)
         await session.commit()
@@ -1,3 +1,4 @@
+from typing import Optional
 from sqlmodel import Field, Relationship
 from datetime import datetime
 
@@ -17,6 +18,8 @@ class CustomerModel(BaseModel, table=True):
     __tablename__ = "customer"
 
     name: str = Field(unique=True, index=True)
+    # Default number of decimal digits of coordinates in edge responses, None for full precision
+    coordinate_precision: Optional[int] = Field(default=None, nullable=True)
     created_at: datetime = Field(default_factory=time_now)
     updated_at: datetime = Field(default_factory=time_now)
 
@@ -1,8 +1,11 @@
-from pydantic import BaseModel, field_validator
+from typing import Optional
+
+from pydantic import BaseModel, Field, field_validator
 
 
 class CreateCustomerSchema(BaseModel):
     name: str
+    coordinate_precision: Optional[int] = Field(None, ge=0, le=15)
 
     @field_validator("name", mode="before")
     def convert_name_to_lowercase(cls, value: str) -> str:
@@ -1,13 +1,11 @@
-import json
-
-from fastapi import UploadFile, File, Depends, Form
+from fastapi import UploadFile, File, Depends, Form, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from geoalchemy2.shape import from_shape
-from shapely.geometry import shape
+from sqlalchemy.exc import SQLAlchemyError
 
-from ..models import RoadNetworkModel, EdgeModel
+from ..catalog import road_network_catalog
+from ..jobs import IngestJobLimitError, create_ingest_job
+from ..models import IngestOperation
 from src.database import get_db
 from src.global_utils import success_response, error_response
 from src.apps.user.models import UserModel
@@ -22,7 +20,7 @@ async def create_road_network(
     user: UserModel = Depends(get_current_user),
 ) -> JSONResponse:
     """
-    Creates a new road network from an uploaded .geojson file.
+    Accepts a .geojson file for a new road network & queues a background job that loads it.
 
     Args:
         name (str): Name of the road network.
@@ -30,7 +28,8 @@ async def create_road_network(
         file (UploadFile): A .geojson file containing the road network geometry.
 
     Returns:
-        JSONResponse: A success message upon successful upload, or an error message with the appropriate status code.
+        JSONResponse: HTTP 202 ACCEPTED with the ID of the ingest job, which can be followed on
+                      `/road-network/jobs/{job_id}`, or an error message with the appropriate status code.
     """
     try:
         if not file.filename.endswith(".geojson"):
@@ -38,47 +37,32 @@ async def create_road_network(
                 status_code=400, 
                 detail="Only .geojson files allowed"
             )
-        
-        # Create RoadNetwork
-        road_network = RoadNetworkModel(
-            name=name,
-            version=version,
-            customer_id=user.customer_id
-        )
-        session.add(road_network)
-        await session.flush()
-
-        content = await file.read()
-        geojson_data = json.loads(content)
 
-        edges = []
-        # Extract Features & Save as Edges
-        for feature in geojson_data.get("features", []):
-            geometry_obj = shape(feature["geometry"])
-            geom_wkb = from_shape(geometry_obj, srid=4326)
+        # Check the network version doesn't exist yet
+        existing_network = await road_network_catalog.resolve(user.customer_id, name, version=version)
 
-            edge = EdgeModel(
-                network_id=road_network.id,
-                properties=feature.get("properties", {}),
-                geometry=geom_wkb,
+        if existing_network:
+            return error_response(
+                status_code=409,
+                detail=f"Network `{name}` already exists"
             )
-            edges.append(edge)
 
-        session.add_all(edges)
+        job = await create_ingest_job(session, user, IngestOperation.CREATE, name, version, file)
 
-        await session.commit()
-        
         return success_response(
-            detail="Road network uploaded successfully"
+            status_code=status.HTTP_202_ACCEPTED,
+            detail="Road network upload accepted",
+            data={"job_id": job.id, "status": job.status}
         )
-    except IntegrityError as e:
+    except IngestJobLimitError:
+        await session.rollback()
         return error_response(
-            status_code=409,
-            detail=f"Network `{name}` already exists"
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many road network uploads in progress, please try again later"
         )
     except SQLAlchemyError as e:
         await session.rollback()
         return error_response(
             status_code=500,
             detail=f"Error occured while adding roadnetwork"
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,144 @@
+import json
+import math
+import struct
+from collections.abc import AsyncIterator
+
+import numpy as np
+from fastapi import Depends, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..catalog import road_network_catalog
+from ..graph import get_road_graph
+from ..matrix import travel_matrix_runner
+from ..models import MatrixFormat
+from ..schemas import TravelMatrixSchema
+from src.database import get_db
+from src.global_utils import error_response, success_response
+from src.settings import app_settings
+from src.apps.user.models import UserModel
+from src.apps.auth.utils import get_current_user
+
+
+def _json_row(costs: np.ndarray) -> list:
+    return [cost if math.isfinite(cost) else None for cost in np.round(costs, 2).tolist()]
+
+
+async def create_travel_matrix(
+    matrix: TravelMatrixSchema,
+    session: AsyncSession = Depends(get_db),
+    user: UserModel = Depends(get_current_user),
+) -> Response:
+    """
+    Computes the travel costs between many origins & destinations over the edges of a road network.
+
+    Origins & destinations are snapped to their closest graph nodes, see `RoadGraph`; a one-to-many
+    search per distinct origin runs in the matrix process pool, see `TravelMatrixRunner`. Costs are
+    in the unit of the edge costs, meters.
+
+    Args:
+        matrix (TravelMatrixSchema): The network, the `[lon, lat]` origins & destinations, the
+                                     response format & whether rows are streamed.
+
+    Returns:
+        Response:
+        - `format=json`: `distances`, a row per origin with a cost per destination, null if unreachable.
+        - `format=binary`: the matrix as little-endian float64 values in row-major order, `inf` if
+          unreachable, with its `rows,columns` in an `X-Matrix-Shape` header.
+        - With `stream`, rows are sent as they are computed, in any order: NDJSON lines
+          `{"origin": i, "distances": [...]}`, or per row a little-endian uint32 origin index
+          followed by the row.
+        - On error: returns a JSON error response with the appropriate status code.
+    """
+    try:
+        road_network = await road_network_catalog.resolve(
+            user.customer_id, matrix.name, version=matrix.version
+        )
+
+        if not road_network:
+            return error_response(
+                status_code=404,
+                detail="Road network not found"
+            )
+
+        graph = await get_road_graph(road_network)
+
+        if not len(graph.node_lons):
+            return error_response(
+                status_code=404,
+                detail="Road network has no edges"
+            )
+
+        positions = np.array(matrix.origins + matrix.destinations, dtype=np.float64)
+        nodes, distances = await run_in_threadpool(graph.nearest_nodes, positions[:, 0], positions[:, 1])
+
+        if distances.max() > app_settings.GRAPH_MAX_SNAP_DISTANCE:
+            return error_response(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Origins & destinations must be within {app_settings.GRAPH_MAX_SNAP_DISTANCE:g} m of the road network"
+            )
+
+        # Every distinct node is searched once, origins & destinations on the same node share it
+        origin_count, destination_count = len(matrix.origins), len(matrix.destinations)
+        source_nodes, origin_sources = np.unique(nodes[:origin_count], return_inverse=True)
+        target_nodes, destination_targets = np.unique(nodes[origin_count:], return_inverse=True)
+        origins_by_source = [[] for _ in source_nodes]
+        for origin, source in enumerate(origin_sources.reshape(-1).tolist()):
+            origins_by_source[source].append(origin)
+        destination_targets = destination_targets.reshape(-1)
+
+        async def iter_origin_rows() -> AsyncIterator[tuple[int, np.ndarray]]:
+            async for batch, costs in travel_matrix_runner.iter_rows(
+                road_network.id, graph, source_nodes.tolist(), target_nodes.tolist()
+            ):
+                for source, source_costs in zip(batch, costs[:, destination_targets]):
+                    for origin in origins_by_source[source]:
+                        yield origin, source_costs
+
+        shape_headers = {"X-Matrix-Shape": f"{origin_count},{destination_count}"}
+
+        if matrix.stream:
+            async def stream_rows() -> AsyncIterator[bytes]:
+                async for origin, costs in iter_origin_rows():
+                    if matrix.format == MatrixFormat.BINARY:
+                        yield struct.pack("<I", origin) + costs.astype("<f8").tobytes()
+                    else:
+                        yield (json.dumps({"origin": origin, "distances": _json_row(costs)}) + "\n").encode()
+
+            return StreamingResponse(
+                stream_rows(),
+                media_type=(
+                    "application/octet-stream"
+                    if matrix.format == MatrixFormat.BINARY
+                    else "application/x-ndjson"
+                ),
+                headers=shape_headers,
+            )
+
+        costs = np.empty((origin_count, destination_count), dtype=np.float64)
+        async for origin, origin_costs in iter_origin_rows():
+            costs[origin] = origin_costs
+
+        if matrix.format == MatrixFormat.BINARY:
+            return Response(
+                content=costs.astype("<f8").tobytes(),
+                media_type="application/octet-stream",
+                headers=shape_headers,
+            )
+
+        return success_response(
+            detail="Travel matrix computed successfully",
+            data={
+                "network_id": road_network.id,
+                "version": road_network.version,
+                "distances": [_json_row(row) for row in costs],
+            }
+        )
+    except SQLAlchemyError as e:
+        await session.rollback()
+        return error_response(
+            status_code=500,
+            detail=f"Error occured while computing travel matrix"
+        )
@@ -0,0 +1,57 @@
+from fastapi import Depends
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import select
+
+from ..models import IngestJobModel
+from src.database import get_db
+from src.global_utils import success_response, error_response
+from src.apps.user.models import UserModel
+from src.apps.auth.utils import get_current_user
+
+
+async def get_ingest_job(
+    job_id: str,
+    session: AsyncSession = Depends(get_db),
+    user: UserModel = Depends(get_current_user),
+) -> JSONResponse:
+    """
+    Retrieves the status & progress of a road network ingest job of the authenticated user's customer.
+
+    Args:
+        job_id (str): ID of the ingest job returned by the create or update endpoint.
+
+    Returns:
+        JSONResponse: The job status, the number of features parsed & inserted so far, the insert
+                      throughput (features per second) & the error message of a failed job,
+                      or an error message with the appropriate status code.
+    """
+    try:
+        job_query = (
+            select(IngestJobModel)
+            .where(IngestJobModel.id == job_id)
+            .where(IngestJobModel.customer_id == user.customer_id)
+        )
+        job_result = await session.execute(job_query)
+        job = job_result.scalars().first()
+
+        if not job:
+            return error_response(
+                status_code=404,
+                detail="Ingest job not found"
+            )
+
+        return success_response(
+            detail="Ingest job retrieved successfully",
+            data={
+                **job.model_dump(exclude={"spool_path"}),
+                "throughput": job.throughput,
+            }
+        )
+    except SQLAlchemyError as e:
+        await session.rollback()
+        return error_response(
+            status_code=500,
+            detail=f"Error occured while fetching ingest job"
+        )
@@ -0,0 +1,80 @@
+from typing import Optional
+
+from fastapi import Depends, Header, Query, Response, status
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..cache import export_cache
+from ..catalog import road_network_catalog
+from ..utils import edge_diff_query, etag_matches, stream_feature_collection
+from src.database import get_db
+from src.global_utils import error_response
+from src.apps.user.models import UserModel
+from src.apps.auth.utils import get_current_user
+
+
+async def get_road_network_diff(
+    name: str = Query(...),
+    from_version: float = Query(..., alias="from"),
+    to_version: float = Query(..., alias="to"),
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_db),
+    user: UserModel = Depends(get_current_user),
+) -> Response:
+    """
+    Fetches the edges that changed between two versions of a road network as GeoJSON.
+
+    The difference is computed in the database, see `edge_diff_query`. Both versions are immutable,
+    so the result is built once per version pair & served from the export cache afterwards.
+
+    Args:
+        name (str): Name of the road network.
+        from_version (float): Version compared from, passed as `from`.
+        to_version (float): Version compared to, passed as `to`.
+        if_none_match (Optional[str]): ETags of the client's cached copies of the diff.
+
+    Returns:
+        FileResponse or JSONResponse:
+        - A GeoJSON FeatureCollection of the changed edges, each Feature with a `change` member of
+          `added`, `removed` or `modified`; modified edges carry their former properties in
+          `previous_properties`.
+        - If `If-None-Match` matches the diff: an empty 304 response.
+        - On error: returns a JSON error response with the appropriate status code.
+    """
+    try:
+        from_network = await road_network_catalog.resolve(user.customer_id, name, version=from_version)
+        to_network = await road_network_catalog.resolve(user.customer_id, name, version=to_version)
+
+        if not from_network or not to_network:
+            return error_response(
+                status_code=404,
+                detail="Road network not found"
+            )
+
+        diff_key = f"diff-{from_network.id}-{to_network.id}"
+        cache_headers = {
+            "ETag": f'"{diff_key}"',
+            "Cache-Control": "private, max-age=31536000, immutable",
+        }
+
+        if etag_matches(if_none_match, cache_headers["ETag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+        diff_path = await export_cache.lease(
+            diff_key, lambda: stream_feature_collection(edge_diff_query(from_network, to_network))
+        )
+
+        return FileResponse(
+            diff_path,
+            media_type="application/geo+json",
+            headers=cache_headers,
+            background=BackgroundTask(export_cache.release, diff_path),
+        )
+    except SQLAlchemyError as e:
+        await session.rollback()
+        return error_response(
+            status_code=500,
+            detail=f"Error occured while comparing road network versions"
+        )
@@ -1,32 +1,51 @@
-from typing import Optional, Union
+from collections.abc import AsyncIterator
+from typing import Optional
 from datetime import datetime
-import json
-from tempfile import NamedTemporaryFile
 
-from fastapi import Depends, Query, status
-from fastapi.responses import JSONResponse
-from fastapi.responses import FileResponse
+from fastapi import Depends, Header, Query, Request, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from sqlmodel import select
-from shapely.geometry import mapping
-from geoalchemy2.shape import to_shape
 
-from ..models import RoadNetworkModel, EdgeModel
+from ..cache import export_cache
+from ..catalog import road_network_catalog
+from ..models import GeometryResolution
+from ..utils import (
+    EdgeFilterError, edge_feature_json, edge_response_key, etag_matches, fetch_edges_page,
+    property_edge_filters, spatial_edge_filters, stream_edges_geojson
+)
 from src.database import get_db
-from src.global_utils import error_response
+from src.settings import app_settings
+from src.global_utils import (
+    DEFAULT_COMPRESSION_LEVELS, ENCODING_SUFFIXES, error_response, iter_compressed_file, negotiate_encoding
+)
 from src.apps.user.models import UserModel
+from src.apps.customer.models import CustomerModel
 from src.apps.auth.utils import get_current_user
 
 
 async def get_road_network_edges(
+    request: Request,
     name: str = Query(...),
     timestamp: Optional[datetime] = Query(None),
     version: Optional[float] = Query(None),
     export: Optional[bool] = Query(False),
+    bbox: Optional[str] = Query(None),
+    intersects: Optional[str] = Query(None),
+    within_distance: Optional[str] = Query(None),
+    properties_filter: Optional[str] = Query(None, alias="filter"),
+    page_size: Optional[int] = Query(None, ge=1, le=app_settings.EDGE_MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+    before: Optional[str] = Query(None),
+    resolution: GeometryResolution = Query(GeometryResolution.FULL),
+    precision: Optional[int] = Query(None, ge=0, le=15),
+    remove_repeated_points: bool = Query(False),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
     session: AsyncSession = Depends(get_db),
     user: UserModel = Depends(get_current_user),
-) -> JSONResponse | JSONResponse:
+) -> Response:
     """
     Fetches edges of a specified road network optional filtered by either timestamp or version.
 
@@ -35,80 +54,167 @@ async def get_road_network_edges(
         timestamp (Optional[datetime]): Filter to get the latest network created on or before this timestamp.
         version (Optional[float]): Filter to get the network of a specific version.
         export (Optional[bool]): If True, returns the result as a downloadable GeoJSON file. Defaults to False.
+        bbox (Optional[str]): `min_lon,min_lat,max_lon,max_lat`; only edges whose bounding box overlaps it.
+        intersects (Optional[str]): WKT or GeoJSON polygon; only edges intersecting it.
+        within_distance (Optional[str]): `lon,lat,meters`; only edges within that distance of the point.
+        properties_filter (Optional[str]): `filter` expression on the edge properties, e.g.
+            `highway in (primary,secondary);lanes>=2`; see `property_edge_filters`.
+        page_size (Optional[int]): Number of edges per page; enables paginated mode.
+        after (Optional[str]): Cursor of the previous page; enables paginated mode.
+        before (Optional[str]): Upper bound of the edge IDs returned in paginated mode.
+        resolution (GeometryResolution): Resolution of the edge geometries; `medium` & `low` serve
+            copies simplified at ingest, for overviews.
+        precision (Optional[int]): Number of decimal digits of the coordinates; defaults to the
+            customer's `coordinate_precision`, else full precision.
+        remove_repeated_points (bool): If True, drops consecutive vertices equal after rounding.
+        if_none_match (Optional[str]): ETags of the client's cached copies of the response.
+        accept_encoding (Optional[str]): Content codings accepted by the client; exports are served
+            precompressed in the preferred one.
 
     Returns:
-        JSONResponse or FileResponse:
-        - If `export` is False (default): returns a GeoJSON FeatureCollection of edges.
-        - If `export` is True: returns the GeoJSON as a downloadable `.geojson` file.
+        StreamingResponse, FileResponse or JSONResponse:
+        - If `export` is False (default): streams a GeoJSON FeatureCollection of edges.
+        - In paginated mode: a page of the FeatureCollection ordered by edge ID, with the cursor of
+          the next page in its `next_cursor` member & in a `Link` header.
+        - If `export` is True: serves the GeoJSON as a downloadable `.geojson` file from the export
+          cache, precompressed in the negotiated content coding, with a strong ETag & support for
+          Range requests.
+        - If `If-None-Match` matches the resolved network version: an empty 304 response.
         - On error: returns a JSON error response with the appropriate status code.
     """
     try:
-        filters = [
-            RoadNetworkModel.name == name,
-            RoadNetworkModel.customer_id == user.customer_id
-        ]
-        
         if timestamp and version:
             return error_response(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="You can filter by either 'timestamp' or 'version', not both. Please provide only one."
             )
 
-        if timestamp:
-            filters.append(RoadNetworkModel.created_at <= timestamp)
+        is_paginated = page_size is not None or after is not None or before is not None
 
-        if version:
-            filters.append(RoadNetworkModel.version == version)
+        if is_paginated and export:
+            return error_response(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Exports can't be paginated. Please provide either 'export' or pagination parameters."
+            )
 
-        road_network_query = (
-            select(RoadNetworkModel)
-            .where(*filters)
-            .order_by(RoadNetworkModel.version.desc())
-            .limit(1)
+        if is_paginated and page_size is None:
+            page_size = app_settings.EDGE_PAGE_SIZE
+
+        try:
+            edge_filters = [
+                *spatial_edge_filters(bbox, intersects, within_distance),
+                *property_edge_filters(properties_filter),
+            ]
+        except EdgeFilterError as e:
+            return error_response(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+        road_network = await road_network_catalog.resolve(
+            user.customer_id, name, version=version, timestamp=timestamp
         )
-        road_network_result = await session.execute(road_network_query)
-        road_network = road_network_result.scalars().first()
 
         if not road_network:
             return error_response(
                 status_code=404, 
                 detail="Road network not found"
             )
-        
-        edges_query = (
-            select(EdgeModel)
-            .where(EdgeModel.network_id == road_network.id)
-        )
 
-        edges_result = await session.execute(edges_query)
-        edges = edges_result.scalars().all()
+        if precision is None:
+            customer = await session.get(CustomerModel, user.customer_id)
+            precision = customer.coordinate_precision if customer else None
 
-        geojson = {
-            "type": "FeatureCollection",
-            "features": []
+        # A network version never changes, so its ID & the filters identify the response body
+        response_key = edge_response_key(
+            road_network,
+            bbox=bbox,
+            intersects=intersects,
+            within_distance=within_distance,
+            properties_filter=properties_filter,
+            page_size=page_size,
+            after=after,
+            before=before,
+            resolution=resolution.value if resolution != GeometryResolution.FULL else None,
+            precision=precision,
+            remove_repeated_points=remove_repeated_points or None,
+        )
+        feature_json = edge_feature_json(resolution, precision, remove_repeated_points)
+        # Exports are stored precompressed, each coding being its own representation
+        export_encoding = negotiate_encoding(accept_encoding) if export else None
+        etag = f'"{response_key}-{export_encoding}"' if export_encoding else f'"{response_key}"'
+        cache_headers = {
+            "ETag": etag,
+            # Without a pinned version the request may resolve to a newer version later on
+            "Cache-Control": "private, max-age=31536000, immutable" if version is not None else "private, no-cache",
         }
 
-        for edge in edges:
-            geometry = to_shape(edge.geometry)
-            geojson["features"].append(
-                {
-                    "type": "Feature",
-                    "geometry": mapping(geometry),
-                    "properties": edge.properties
-                }
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+        # Pages are small enough to be built in full, so the next cursor is known up front
+        if is_paginated:
+            content, next_cursor = await fetch_edges_page(
+                session,
+                road_network,
+                page_size,
+                after=after,
+                before=before,
+                filters=edge_filters,
+                feature_json=feature_json,
             )
+            headers = dict(cache_headers)
+
+            if next_cursor:
+                next_url = request.url.include_query_params(after=next_cursor, page_size=page_size)
+                headers["Link"] = f'<{next_url}>; rel="next"'
 
+            return Response(content=content, media_type="application/json", headers=headers)
+
+        # A network version never changes, so its export is built once & served from disk afterwards
         if export:
-            with NamedTemporaryFile(delete=False, suffix=".geojson", mode='w', encoding='utf-8') as tmpfile:
-                json.dump(geojson, tmpfile)
-                tmpfile.flush()
-                return FileResponse(
-                    path=tmpfile.name,
-                    media_type="application/geo+json",
-                    filename=f"{name}_v{road_network.version}.geojson"
+            def produce_geojson() -> AsyncIterator[bytes]:
+                return stream_edges_geojson(road_network, edge_filters, feature_json)
+
+            async def produce_compressed() -> AsyncIterator[bytes]:
+                geojson_path = await export_cache.lease(response_key, produce_geojson)
+                try:
+                    async for chunk in iter_compressed_file(
+                        geojson_path,
+                        export_encoding,
+                        app_settings.EXPORT_COMPRESSION_LEVELS.get(
+                            export_encoding, DEFAULT_COMPRESSION_LEVELS[export_encoding]
+                        ),
+                    ):
+                        yield chunk
+                finally:
+                    export_cache.release(geojson_path)
+
+            if export_encoding:
+                export_path = await export_cache.lease(
+                    response_key,
+                    produce_compressed,
+                    suffix=f".geojson{ENCODING_SUFFIXES[export_encoding]}",
                 )
+                cache_headers.update({"Content-Encoding": export_encoding, "Vary": "Accept-Encoding"})
+            else:
+                export_path = await export_cache.lease(response_key, produce_geojson)
+
+            # The lease keeps the file readable until the response has opened it
+            return FileResponse(
+                export_path,
+                media_type="application/geo+json",
+                filename=f"{name}_v{road_network.version}.geojson",
+                headers=cache_headers,
+                background=BackgroundTask(export_cache.release, export_path),
+            )
 
-        return geojson
+        # Edges are read with a server side cursor & sent in chunks as they arrive
+        return StreamingResponse(
+            stream_edges_geojson(road_network, edge_filters, feature_json),
+            media_type="application/json",
+            headers=cache_headers
+        )
     except SQLAlchemyError as e:
         await session.rollback()
         return error_response(
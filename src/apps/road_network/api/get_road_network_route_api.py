@@ -0,0 +1,108 @@
+from typing import Optional
+
+from fastapi import Depends, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..catalog import road_network_catalog
+from ..graph import get_road_graph
+from ..utils import EdgeFilterError, parse_point
+from src.database import get_db
+from src.global_utils import error_response, success_response
+from src.settings import app_settings
+from src.apps.user.models import UserModel
+from src.apps.auth.utils import get_current_user
+
+
+async def get_road_network_route(
+    name: str = Query(...),
+    from_point: str = Query(..., alias="from"),
+    to_point: str = Query(..., alias="to"),
+    version: Optional[float] = Query(None),
+    session: AsyncSession = Depends(get_db),
+    user: UserModel = Depends(get_current_user),
+) -> JSONResponse:
+    """
+    Finds the shortest route between two points over the edges of a road network.
+
+    The route is searched with A* on the in-memory graph of the network version, see `RoadGraph`;
+    the points are snapped to their closest graph nodes.
+
+    Args:
+        name (str): Name of the road network.
+        from_point (str): Start of the route as `lon,lat`, passed as `from`.
+        to_point (str): End of the route as `lon,lat`, passed as `to`.
+        version (Optional[float]): Version of the network; defaults to the latest version.
+
+    Returns:
+        JSONResponse: A GeoJSON Feature of the route with its `distance` in meters & the IDs of the
+                      edges it follows, or an error message with the appropriate status code.
+    """
+    try:
+        try:
+            start = parse_point(from_point, "from")
+            end = parse_point(to_point, "to")
+        except EdgeFilterError as e:
+            return error_response(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+        road_network = await road_network_catalog.resolve(user.customer_id, name, version=version)
+
+        if not road_network:
+            return error_response(
+                status_code=404,
+                detail="Road network not found"
+            )
+
+        graph = await get_road_graph(road_network)
+
+        if not len(graph.node_lons):
+            return error_response(
+                status_code=404,
+                detail="Road network has no edges"
+            )
+
+        (source, source_distance), (target, target_distance) = (
+            graph.nearest_node(*start), graph.nearest_node(*end)
+        )
+
+        if max(source_distance, target_distance) > app_settings.GRAPH_MAX_SNAP_DISTANCE:
+            return error_response(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Route points must be within {app_settings.GRAPH_MAX_SNAP_DISTANCE:g} m of the road network"
+            )
+
+        path = await run_in_threadpool(graph.shortest_path, source, target)
+
+        if path is None:
+            return error_response(
+                status_code=404,
+                detail="No route found between the given points"
+            )
+
+        distance, arcs = path
+        coordinates = graph.path_coordinates(arcs)
+
+        return success_response(
+            detail="Route found successfully",
+            data={
+                "type": "Feature",
+                "geometry": {"type": "LineString", "coordinates": coordinates} if coordinates else None,
+                "properties": {
+                    "distance": round(distance, 2),
+                    "edge_ids": graph.path_edge_ids(arcs),
+                    "network_id": road_network.id,
+                    "version": road_network.version,
+                },
+            }
+        )
+    except SQLAlchemyError as e:
+        await session.rollback()
+        return error_response(
+            status_code=500,
+            detail=f"Error occured while finding route"
+        )
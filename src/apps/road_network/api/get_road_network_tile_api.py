@@ -0,0 +1,93 @@
+from typing import Optional
+
+from fastapi import Depends, Header, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..cache import tile_cache
+from ..catalog import road_network_catalog
+from ..utils import build_edge_tile, edge_response_key, etag_matches
+from src.database import get_db
+from src.global_utils import error_response
+from src.settings import app_settings
+from src.apps.user.models import UserModel
+from src.apps.auth.utils import get_current_user
+
+
+async def get_road_network_tile(
+    z: int,
+    x: int,
+    y: int,
+    name: str = Query(...),
+    version: Optional[float] = Query(None),
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_db),
+    user: UserModel = Depends(get_current_user),
+) -> Response:
+    """
+    Fetches the edges of a road network within a Web Mercator tile as a Mapbox Vector Tile.
+
+    Tiles are cached per network version & tile coordinates; the properties included depend on the
+    zoom level, see `TILE_ZOOM_PROPERTIES`.
+
+    Args:
+        z (int): Zoom level of the tile.
+        x (int): Column of the tile.
+        y (int): Row of the tile.
+        name (str): Name of the road network.
+        version (Optional[float]): Version of the network; defaults to the latest version.
+        if_none_match (Optional[str]): ETags of the client's cached copies of the tile.
+
+    Returns:
+        Response or JSONResponse:
+        - The encoded tile, or an empty 204 response if no edge crosses the tile.
+        - If `If-None-Match` matches the tile: an empty 304 response.
+        - On error: returns a JSON error response with the appropriate status code.
+    """
+    try:
+        if not 0 <= z <= app_settings.TILE_MAX_ZOOM or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+            return error_response(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid tile coordinates"
+            )
+
+        road_network = await road_network_catalog.resolve(user.customer_id, name, version=version)
+
+        if not road_network:
+            return error_response(
+                status_code=404,
+                detail="Road network not found"
+            )
+
+        etag = f'"{edge_response_key(road_network, tile=(z, x, y))}"'
+        cache_headers = {
+            "ETag": etag,
+            # Without a pinned version the request may resolve to a newer version later on
+            "Cache-Control": "private, max-age=31536000, immutable" if version is not None else "private, no-cache",
+        }
+
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+        # A network version never changes, so its tiles never have to be invalidated
+        tile_key = (road_network.id, z, x, y)
+        tile = tile_cache.get(tile_key)
+
+        if tile is None:
+            tile = await build_edge_tile(session, road_network, z, x, y)
+            tile_cache.set(tile_key, tile)
+
+        if not tile:
+            return Response(status_code=status.HTTP_204_NO_CONTENT, headers=cache_headers)
+
+        return Response(
+            content=tile,
+            media_type="application/vnd.mapbox-vector-tile",
+            headers=cache_headers
+        )
+    except SQLAlchemyError as e:
+        await session.rollback()
+        return error_response(
+            status_code=500,
+            detail=f"Error occured while fetching tile"
+        )
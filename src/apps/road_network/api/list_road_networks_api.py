@@ -2,9 +2,8 @@ from fastapi import Depends
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from sqlmodel import select
 
-from ..models import RoadNetworkModel
+from ..catalog import road_network_catalog
 from src.database import get_db
 from src.global_utils import success_response, error_response
 from src.apps.user.models import UserModel
@@ -22,18 +21,8 @@ async def list_road_networks(
         JSONResponse: A success response containing the list of road networks, or an error message with the appropriate status code.
     """
     try:
-        filters = [RoadNetworkModel.customer_id == user.customer_id]
-
-        road_networks_query = (
-            select(RoadNetworkModel)
-            .where(*filters)
-            .order_by(
-                RoadNetworkModel.name.asc(), 
-                RoadNetworkModel.version.desc()
-            )
-        )
-        road_networks_result = await session.execute(road_networks_query)
-        road_networks = road_networks_result.scalars().all()
+        catalog = await road_network_catalog.get(user.customer_id)
+        road_networks = catalog.road_networks()
 
         return success_response(
             detail="Road Network List retrieved successfully",
@@ -0,0 +1,63 @@
+import numpy as np
+from fastapi import Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..catalog import road_network_catalog
+from ..schemas import MatchTraceSchema
+from ..snapping import get_edge_index, snapped_points_data
+from src.database import get_db
+from src.global_utils import error_response, success_response
+from src.apps.user.models import UserModel
+from src.apps.auth.utils import get_current_user
+
+
+async def match_trace(
+    trace: MatchTraceSchema,
+    session: AsyncSession = Depends(get_db),
+    user: UserModel = Depends(get_current_user),
+) -> JSONResponse:
+    """
+    Matches a GPS trace to the edges of a road network it most likely followed.
+
+    Unlike snapping every point to its nearest edge, the match keeps consecutive points on the same
+    or adjacent edges, see `EdgeIndex.match`.
+
+    Args:
+        trace (MatchTraceSchema): The network, the `[lon, lat]` trace points in recording order &
+                                  the radius in meters candidate edges are searched in.
+
+    Returns:
+        JSONResponse: Columns with an entry per trace point, like the snap endpoint; null for
+                      points with no edge within the search radius. Or an error message with the
+                      appropriate status code.
+    """
+    try:
+        road_network = await road_network_catalog.resolve(user.customer_id, trace.name, version=trace.version)
+
+        if not road_network:
+            return error_response(
+                status_code=404,
+                detail="Road network not found"
+            )
+
+        edge_index = await get_edge_index(road_network)
+        points = np.array(trace.points, dtype=np.float64)
+        matched = await run_in_threadpool(edge_index.match, points[:, 0], points[:, 1], trace.search_radius)
+
+        return success_response(
+            detail="Trace matched successfully",
+            data={
+                "network_id": road_network.id,
+                "version": road_network.version,
+                **snapped_points_data(edge_index, *matched),
+            }
+        )
+    except SQLAlchemyError as e:
+        await session.rollback()
+        return error_response(
+            status_code=500,
+            detail=f"Error occured while matching trace"
+        )
@@ -0,0 +1,63 @@
+import numpy as np
+from fastapi import Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..catalog import road_network_catalog
+from ..schemas import SnapPointsSchema
+from ..snapping import get_edge_index, snapped_points_data
+from src.database import get_db
+from src.global_utils import error_response, success_response
+from src.apps.user.models import UserModel
+from src.apps.auth.utils import get_current_user
+
+
+async def snap_points(
+    snap: SnapPointsSchema,
+    session: AsyncSession = Depends(get_db),
+    user: UserModel = Depends(get_current_user),
+) -> JSONResponse:
+    """
+    Snaps a batch of points to their nearest edge of a road network.
+
+    Points are looked up in vectorized batches in the STRtree of the network version, see `EdgeIndex`.
+
+    Args:
+        snap (SnapPointsSchema): The network, the `[lon, lat]` points & the distance in meters
+                                 beyond which points are not snapped.
+
+    Returns:
+        JSONResponse: Columns with an entry per point: `edge_ids`, `distances` in meters,
+                      `positions` along the edges as fractions of their length & `coordinates` of
+                      the snapped points; null for points that are not snapped. Or an error message
+                      with the appropriate status code.
+    """
+    try:
+        road_network = await road_network_catalog.resolve(user.customer_id, snap.name, version=snap.version)
+
+        if not road_network:
+            return error_response(
+                status_code=404,
+                detail="Road network not found"
+            )
+
+        edge_index = await get_edge_index(road_network)
+        points = np.array(snap.points, dtype=np.float64)
+        snapped = await run_in_threadpool(edge_index.snap, points[:, 0], points[:, 1], snap.max_distance)
+
+        return success_response(
+            detail="Points snapped successfully",
+            data={
+                "network_id": road_network.id,
+                "version": road_network.version,
+                **snapped_points_data(edge_index, *snapped),
+            }
+        )
+    except SQLAlchemyError as e:
+        await session.rollback()
+        return error_response(
+            status_code=500,
+            detail=f"Error occured while snapping points"
+        )
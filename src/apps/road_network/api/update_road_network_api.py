@@ -1,14 +1,11 @@
-import json
-
-from fastapi import UploadFile, File, Depends, Form
+from fastapi import UploadFile, File, Depends, Form, status
 from fastapi.responses import JSONResponse
-from sqlmodel import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from geoalchemy2.shape import from_shape
-from shapely.geometry import shape
 
-from ..models import RoadNetworkModel, EdgeModel
+from ..catalog import road_network_catalog
+from ..jobs import IngestJobLimitError, create_ingest_job
+from ..models import IngestOperation
 from src.global_utils import success_response, error_response
 from src.database import get_db
 from src.apps.auth.utils import get_current_user
@@ -24,7 +21,8 @@ async def update_road_network(
     user: UserModel = Depends(get_current_user),
 ) -> JSONResponse:
     """
-    Updates an existing road network by creating a new version from an uploaded .geojson file. Marks edges from the previous version as inactive.
+    Accepts a .geojson file for a new version of an existing road network & queues a background job that loads it.
+    The new version is stored as a delta against the previous one: only the edges it adds & removes are written.
 
     Args:
         name (str): Name of the road network to update.
@@ -32,7 +30,8 @@ async def update_road_network(
         file (UploadFile): A .geojson file containing updated road network geometry.
         
     Returns:
-        JSONResponse: A success message upon successful update, or an error message with the appropriate status code.
+        JSONResponse: HTTP 202 ACCEPTED with the ID of the ingest job, which can be followed on
+                      `/road-network/jobs/{job_id}`, or an error message with the appropriate status code.
     """
     try:
         if not file.filename.endswith(".geojson"):
@@ -42,15 +41,7 @@ async def update_road_network(
             )
         
         # Fetch latest_network
-        latest_network_query = (
-            select(RoadNetworkModel)
-            .where(RoadNetworkModel.name == name)
-            .where(RoadNetworkModel.customer_id == user.customer_id)
-            .order_by(RoadNetworkModel.version.desc())
-            .limit(1)
-        )
-        latest_network_result = await session.execute(latest_network_query)
-        latest_network = latest_network_result.scalar_one_or_none()
+        latest_network = await road_network_catalog.resolve(user.customer_id, name)
 
         if not latest_network:
             return error_response(
@@ -63,47 +54,19 @@ async def update_road_network(
                 status_code=400,
                 detail=f"New version `({version})` must be higher than current latest `({latest_network.version})`"
             )
-        
-        # Parse GeoJSON
-        content = await file.read()
-        geojson_data = json.loads(content)
-
-        # Mark all old edges as inactive
-        await session.execute(
-            update(EdgeModel)
-            .where(EdgeModel.network_id == latest_network.id)
-            .values(is_active=False)
-        )
-
-        # Create new RoadNetwork as updated version
-        new_network = RoadNetworkModel(
-            name=latest_network.name,
-            version=version,
-            customer_id=user.customer_id
-        )
-        session.add(new_network)
-        await session.flush()
 
-        edges = []
-        # Add new edges
-        for feature in geojson_data.get("features", []):
-            geometry_obj = shape(feature["geometry"])
-            geom = from_shape(geometry_obj, srid=4326)
-
-            edge = EdgeModel(
-                network_id=new_network.id,
-                geometry=geom,
-                properties=feature.get("properties", {}),
-                is_active=True
-            )
-            edges.append(edge)
-
-        session.add_all(edges)
-
-        await session.commit()
+        job = await create_ingest_job(session, user, IngestOperation.UPDATE, name, version, file)
 
         return success_response(
-            detail="Road network updated successfully"
+            status_code=status.HTTP_202_ACCEPTED,
+            detail="Road network update accepted",
+            data={"job_id": job.id, "status": job.status}
+        )
+    except IngestJobLimitError:
+        await session.rollback()
+        return error_response(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many road network uploads in progress, please try again later"
         )
     except SQLAlchemyError as e:
         await session.rollback()
@@ -111,8 +74,3 @@ async def update_road_network(
             status_code=500,
             detail=f"Error occured during updating roadnetwork"
         )
-    except json.JSONDecodeError:
-        return error_response(
-            status_code=400, 
-            detail="Only .geojson files allowed"
-        )
\ No newline at end of file
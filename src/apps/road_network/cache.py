@@ -0,0 +1,312 @@
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Hashable
+from typing import Any, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from src.settings import app_settings
+
+
+class ExportCache:
+    """
+    Size bounded on-disk cache of export artifacts.
+
+    Artifacts are keyed by the ID of the immutable road network version they were built from, so an
+    entry never has to be invalidated, only evicted. The least recently used entries are evicted
+    once the cache grows beyond `max_bytes`.
+
+    A missing artifact is produced by a single writer: concurrent requests of the same worker share
+    one fill task & workers of other processes wait on a lock file next to the artifact. Artifacts
+    are written to a temporary file & renamed into place, so readers never see a partial file.
+
+    Responses read artifacts through a lease, a hard link of their own, so an artifact evicted by
+    any process before the response has opened it stays readable until the lease is released.
+    """
+
+    # Attempts of `lease` to link an artifact that keeps being evicted before it is linked
+    _LEASE_ATTEMPTS = 3
+
+    def __init__(self, directory: str, max_bytes: int, lock_timeout: float) -> None:
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._lock_timeout = lock_timeout
+        self._pending: dict[str, asyncio.Task] = {}
+
+    def path(self, key: str, suffix: str = ".geojson") -> str:
+        """
+        Returns the path of the artifact stored under `key`.
+        """
+        return os.path.join(self._directory, f"{key}{suffix}")
+
+    async def get(self, key: str, produce: Callable[[], AsyncIterator[bytes]], suffix: str = ".geojson") -> str:
+        """
+        Returns the path of a cached artifact, producing it first if it is not cached yet.
+
+        Args:
+            key (str): Key of the artifact, derived from the immutable network version(s) it is built from.
+            produce (Callable[[], AsyncIterator[bytes]]): Returns the content of the artifact in chunks.
+            suffix (str): File name suffix of the artifact.
+
+        Returns:
+            str: Path of the cached artifact.
+        """
+        path = self.path(key, suffix)
+
+        if await run_in_threadpool(self._touch, path):
+            return path
+
+        task = self._pending.get(path)
+        if task is None:
+            task = asyncio.ensure_future(self._fill(path, produce))
+            self._pending[path] = task
+            task.add_done_callback(lambda _: self._pending.pop(path, None))
+
+        # A client going away must not cancel the fill other requests are waiting on
+        return await asyncio.shield(task)
+
+    async def lease(
+        self, key: str, produce: Callable[[], AsyncIterator[bytes]], suffix: str = ".geojson"
+    ) -> str:
+        """
+        Returns a private path of a cached artifact, producing the artifact first if it is not cached
+        yet. The path stays readable until it is passed to `release`, even if the artifact is evicted.
+
+        Args:
+            key (str): Key of the artifact, derived from the immutable network version(s) it is built from.
+            produce (Callable[[], AsyncIterator[bytes]]): Returns the content of the artifact in chunks.
+            suffix (str): File name suffix of the artifact.
+
+        Returns:
+            str: Path of the leased artifact.
+
+        Raises:
+            FileNotFoundError: If the artifact was evicted before it could be linked every time.
+        """
+        for attempt in range(self._LEASE_ATTEMPTS):
+            path = await self.get(key, produce, suffix)
+            lease_path = f"{path}.{uuid.uuid4().hex}.lease"
+
+            try:
+                await run_in_threadpool(os.link, path, lease_path)
+                return lease_path
+            except FileNotFoundError:
+                # Evicted between being produced & linked
+                if attempt == self._LEASE_ATTEMPTS - 1:
+                    raise
+
+    def release(self, lease_path: str) -> None:
+        """
+        Releases a path returned by `lease`. Files already opened from it can still be read.
+        """
+        self._remove(lease_path)
+
+    async def _fill(self, path: str, produce: Callable[[], AsyncIterator[bytes]]) -> str:
+        lock_path = f"{path}.lock"
+
+        while not await run_in_threadpool(self._acquire, lock_path):
+            # Another process is writing the artifact
+            await asyncio.sleep(0.1)
+
+        try:
+            if await run_in_threadpool(self._touch, path):
+                return path
+
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            try:
+                with open(temp_path, "wb") as temp_file:
+                    async for chunk in produce():
+                        await run_in_threadpool(temp_file.write, chunk)
+
+                os.replace(temp_path, path)
+            except BaseException:
+                self._remove(temp_path)
+                raise
+        finally:
+            self._remove(lock_path)
+
+        await run_in_threadpool(self._evict, path)
+
+        return path
+
+    def _acquire(self, lock_path: str) -> bool:
+        os.makedirs(self._directory, exist_ok=True)
+
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            pass
+
+        # Take over the lock of a writer that died while filling the entry
+        try:
+            if time.time() - os.path.getmtime(lock_path) > self._lock_timeout:
+                self._remove(lock_path)
+        except FileNotFoundError:
+            pass
+
+        return False
+
+    def _evict(self, keep: str) -> None:
+        entries = []
+        now = time.time()
+
+        with os.scandir(self._directory) as directory_entries:
+            for entry in directory_entries:
+                if not entry.is_file() or entry.name.endswith((".lock", ".tmp")):
+                    continue
+
+                stat = entry.stat()
+
+                if entry.name.endswith(".lease"):
+                    # Responses open their lease right away, so an old one was never released
+                    if now - stat.st_mtime > self._lock_timeout:
+                        self._remove(entry.path)
+                    continue
+
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_size = sum(size for _, size, _ in entries)
+
+        for _, size, path in sorted(entries):
+            if total_size <= self._max_bytes:
+                break
+
+            if path == keep:
+                continue
+
+            self._remove(path)
+            total_size -= size
+
+    @staticmethod
+    def _touch(path: str) -> bool:
+        # The modification time doubles as the last access time for LRU eviction
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class LRUCache:
+    """
+    Bounded in-memory cache evicting the least recently used entries.
+
+    Every entry is weighed with `weigh` & entries are evicted once the total weight exceeds
+    `max_weight`; by default every entry weighs 1, which bounds the number of entries.
+    """
+
+    def __init__(self, max_weight: int, weigh: Callable[[Any], int] = lambda value: 1) -> None:
+        self._max_weight = max_weight
+        self._weigh = weigh
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._weight = 0
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """
+        Returns the value cached under `key` & marks it as recently used.
+
+        Args:
+            key (Hashable): Key of the entry.
+            default (Optional[Any]): Value returned if the key is not cached.
+
+        Returns:
+            Any: The cached value, or `default`.
+        """
+        entry = self._entries.get(key)
+
+        if entry is None:
+            return default
+
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Caches a value under `key`, evicting the least recently used entries if the cache is full.
+        A value weighing more than the whole cache is not cached.
+
+        Args:
+            key (Hashable): Key of the entry.
+            value (Any): Value to cache.
+        """
+        self.pop(key)
+        weight = self._weigh(value)
+
+        if weight > self._max_weight:
+            return None
+
+        self._entries[key] = (value, weight)
+        self._weight += weight
+
+        while self._weight > self._max_weight:
+            _, (_, evicted_weight) = self._entries.popitem(last=False)
+            self._weight -= evicted_weight
+
+    def pop(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """
+        Removes an entry from the cache.
+
+        Args:
+            key (Hashable): Key of the entry.
+            default (Optional[Any]): Value returned if the key is not cached.
+
+        Returns:
+            Any: The removed value, or `default`.
+        """
+        entry = self._entries.pop(key, None)
+
+        if entry is None:
+            return default
+
+        self._weight -= entry[1]
+        return entry[0]
+
+    def clear(self) -> None:
+        """
+        Removes all entries from the cache.
+        """
+        self._entries.clear()
+        self._weight = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+export_cache = ExportCache(
+    directory=app_settings.EXPORT_CACHE_DIR,
+    max_bytes=app_settings.EXPORT_CACHE_MAX_BYTES,
+    lock_timeout=app_settings.EXPORT_CACHE_LOCK_TIMEOUT.total_seconds(),
+)
+
+# Vector tiles of immutable network versions, weighed by their size in bytes plus a fixed overhead,
+# so cached empty tiles count as well
+tile_cache = LRUCache(
+    max_weight=app_settings.TILE_CACHE_MAX_BYTES,
+    weigh=lambda tile: len(tile) + 100,
+)
+
+# Routable graphs of network versions, weighed by the memory of their arrays
+graph_cache = LRUCache(
+    max_weight=app_settings.GRAPH_CACHE_MAX_BYTES,
+    weigh=lambda graph: graph.nbytes,
+)
+
+# STRtrees over the edges of network versions, for snapping & map matching
+edge_index_cache = LRUCache(
+    max_weight=app_settings.EDGE_INDEX_CACHE_MAX_BYTES,
+    weigh=lambda edge_index: edge_index.nbytes,
+)
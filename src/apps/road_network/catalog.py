@@ -0,0 +1,278 @@
+import asyncio
+import traceback
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from src.database import async_session, engine
+from src.settings import app_settings
+from .cache import LRUCache
+from .models import RoadNetworkModel
+
+
+class CustomerCatalog:
+    """
+    Snapshot of the road network versions of one customer, grouped by network name, so versions can
+    be resolved with a binary search.
+
+    Each network's versions are kept sorted by version, and additionally by creation time along
+    with the highest version created up to each point, as creation times need not follow the
+    version order, e.g. for versions created in concurrent transactions.
+    """
+
+    def __init__(self, road_networks: list[RoadNetworkModel]) -> None:
+        self._networks: dict[str, list[RoadNetworkModel]] = {}
+
+        for road_network in sorted(road_networks, key=lambda network: (network.name, network.version)):
+            self._networks.setdefault(road_network.name, []).append(road_network)
+
+        self._versions = {
+            name: [network.version for network in networks] for name, networks in self._networks.items()
+        }
+        self._created_ats: dict[str, list[datetime]] = {}
+        # The highest version created on or before the creation time at the same index
+        self._latest_created: dict[str, list[RoadNetworkModel]] = {}
+
+        for name, networks in self._networks.items():
+            created_ats = self._created_ats[name] = []
+            latest_created = self._latest_created[name] = []
+
+            for network in sorted(networks, key=lambda network: (network.created_at, network.version)):
+                if latest_created and latest_created[-1].version > network.version:
+                    latest_created.append(latest_created[-1])
+                else:
+                    latest_created.append(network)
+                created_ats.append(network.created_at)
+
+    def resolve(
+        self, name: str, version: Optional[float] = None, timestamp: Optional[datetime] = None
+    ) -> Optional[RoadNetworkModel]:
+        """
+        Resolves a network version: the given version, else the highest version created on or before
+        `timestamp`, else the latest version. A given version created after `timestamp` is not
+        resolved.
+
+        Args:
+            name (str): Name of the road network.
+            version (Optional[float]): Version number of the network.
+            timestamp (Optional[datetime]): Point in time the network is read at.
+
+        Returns:
+            Optional[RoadNetworkModel]: The resolved network version, or None if it does not exist.
+        """
+        networks = self._networks.get(name)
+
+        if not networks:
+            return None
+
+        if timestamp and timestamp.tzinfo:
+            # Creation times are stored as naive local times
+            timestamp = timestamp.astimezone().replace(tzinfo=None)
+
+        if version is not None:
+            index = bisect_left(self._versions[name], version)
+
+            if index == len(networks) or networks[index].version != version:
+                return None
+            if timestamp and networks[index].created_at > timestamp:
+                return None
+            return networks[index]
+
+        if timestamp:
+            end = bisect_right(self._created_ats[name], timestamp)
+            return self._latest_created[name][end - 1] if end else None
+
+        return networks[-1]
+
+    def road_networks(self) -> list[RoadNetworkModel]:
+        """
+        Returns all network versions, ordered by name & by version, newest first.
+
+        Returns:
+            list[RoadNetworkModel]: The network versions of the customer.
+        """
+        return [
+            road_network
+            for name in sorted(self._networks)
+            for road_network in reversed(self._networks[name])
+        ]
+
+
+class RoadNetworkCatalogCache:
+    """
+    In-process cache of the network version catalogs of the most recently active customers.
+
+    A catalog is loaded once & then serves version resolution without touching the database until
+    it is invalidated. Ingest jobs invalidate the catalog of their customer when they commit a new
+    version; with `notify_channel` set, the invalidation is also published through Postgres
+    NOTIFY, so every API worker listening on the channel drops its copy as well. While a worker
+    is not listening, e.g. during a reconnect, its catalogs are not cached.
+    """
+
+    def __init__(self, max_customers: int, notify_channel: Optional[str] = None) -> None:
+        self._catalogs = LRUCache(max_weight=max_customers)
+        self._notify_channel = notify_channel
+        self._loading: dict[str, asyncio.Task] = {}
+        # Bumped on every invalidation, so a load racing with one is not cached
+        self._generations: dict[str, int] = {}
+        self._listener_task: Optional[asyncio.Task] = None
+        self._listening = False
+
+    async def get(self, customer_id: str) -> CustomerCatalog:
+        """
+        Returns the catalog of a customer, loading it if it is not cached.
+
+        Args:
+            customer_id (str): ID of the customer.
+
+        Returns:
+            CustomerCatalog: The network version catalog of the customer.
+        """
+        catalog = self._catalogs.get(customer_id)
+
+        if catalog is not None:
+            return catalog
+
+        task = self._loading.get(customer_id)
+        if task is None:
+            task = asyncio.ensure_future(self._load(customer_id))
+            self._loading[customer_id] = task
+            task.add_done_callback(lambda done: self._loaded(customer_id, done))
+
+        return await asyncio.shield(task)
+
+    async def resolve(
+        self,
+        customer_id: str,
+        name: str,
+        version: Optional[float] = None,
+        timestamp: Optional[datetime] = None,
+    ) -> Optional[RoadNetworkModel]:
+        """
+        Resolves a network version of a customer from its catalog, see `CustomerCatalog.resolve`.
+
+        Returns:
+            Optional[RoadNetworkModel]: The resolved network version, or None if it does not exist.
+        """
+        catalog = await self.get(customer_id)
+        return catalog.resolve(name, version=version, timestamp=timestamp)
+
+    def invalidate(self, customer_id: Optional[str] = None) -> None:
+        """
+        Drops the cached catalog of a customer, or of all customers.
+
+        Args:
+            customer_id (Optional[str]): ID of the customer; None drops every catalog.
+        """
+        if customer_id is None:
+            self._catalogs.clear()
+            self._generations = {
+                cached_customer_id: generation + 1
+                for cached_customer_id, generation in self._generations.items()
+            }
+            self._loading.clear()
+            return None
+
+        self._catalogs.pop(customer_id)
+        self._generations[customer_id] = self._generations.get(customer_id, 0) + 1
+        self._loading.pop(customer_id, None)
+
+    async def notify(self, session: AsyncSession, customer_id: str) -> None:
+        """
+        Queues a NOTIFY invalidating the catalog of a customer in the listening workers, delivered
+        when the session's transaction commits. The caller still invalidates its own catalog once
+        the transaction has committed.
+
+        Args:
+            session (AsyncSession): The session of the transaction changing the customer's networks.
+            customer_id (str): ID of the customer.
+        """
+        if self._notify_channel:
+            await session.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": self._notify_channel, "payload": customer_id},
+            )
+
+    def start(self) -> None:
+        """
+        Starts listening for invalidations of other workers. Must be called from the running event loop.
+        """
+        if self._notify_channel:
+            self._listener_task = asyncio.create_task(self._listen())
+
+    async def shutdown(self) -> None:
+        """
+        Stops listening for invalidations.
+        """
+        if self._listener_task:
+            self._listener_task.cancel()
+            await asyncio.gather(self._listener_task, return_exceptions=True)
+            self._listener_task = None
+
+    def _loaded(self, customer_id: str, task: asyncio.Task) -> None:
+        # After an invalidation a newer load may already be registered for the customer
+        if self._loading.get(customer_id) is task:
+            del self._loading[customer_id]
+
+    async def _load(self, customer_id: str) -> CustomerCatalog:
+        generation = self._generations.get(customer_id, 0)
+
+        async with async_session() as session:
+            road_networks_result = await session.execute(
+                select(RoadNetworkModel).where(RoadNetworkModel.customer_id == customer_id)
+            )
+            road_networks = road_networks_result.scalars().all()
+            # The snapshots outlive the session & are shared between requests
+            session.expunge_all()
+
+        catalog = CustomerCatalog(list(road_networks))
+        is_listening = self._listening or not self._notify_channel
+
+        if is_listening and self._generations.get(customer_id, 0) == generation:
+            self._catalogs.set(customer_id, catalog)
+
+        return catalog
+
+    async def _listen(self) -> None:
+        def on_notification(connection, pid, channel, payload) -> None:
+            self.invalidate(payload)
+
+        while True:
+            try:
+                async with engine.connect() as connection:
+                    raw_connection = await connection.get_raw_connection()
+                    driver_connection = raw_connection.driver_connection
+                    await driver_connection.add_listener(self._notify_channel, on_notification)
+
+                    # Notifications sent while no listener was connected are lost
+                    self.invalidate()
+                    self._listening = True
+
+                    try:
+                        while not driver_connection.is_closed():
+                            await asyncio.sleep(app_settings.ROAD_NETWORK_CATALOG_LISTEN_CHECK_INTERVAL)
+                    finally:
+                        self._listening = False
+                        if not driver_connection.is_closed():
+                            await driver_connection.remove_listener(self._notify_channel, on_notification)
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception:
+                print(traceback.format_exc())
+
+            # Without a listener other workers' changes go unnoticed, so nothing is cached meanwhile
+            self.invalidate()
+            await asyncio.sleep(app_settings.ROAD_NETWORK_CATALOG_LISTEN_CHECK_INTERVAL)
+
+
+# Shared catalog cache of the API worker, its listener is started & stopped by the app lifespan
+road_network_catalog = RoadNetworkCatalogCache(
+    max_customers=app_settings.ROAD_NETWORK_CATALOG_MAX_CUSTOMERS,
+    notify_channel=app_settings.ROAD_NETWORK_CATALOG_CHANNEL,
+)
@@ -0,0 +1,483 @@
+import asyncio
+import math
+from heapq import heappop, heappush
+from typing import Any, Optional
+
+import numpy as np
+import shapely
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import select
+
+from src.database import async_session
+from src.settings import app_settings
+from .cache import graph_cache
+from .models import EdgeModel, RoadNetworkModel
+from .utils import (
+    edge_property_value, endpoint_grid_keys, get_snap_tolerance, grid_key_coordinates, live_edge_filters
+)
+
+_EARTH_RADIUS = 6_371_008.8
+
+# `oneway` values of edges that can only be travelled along, or only against, their geometry
+_ONEWAY_FORWARD_VALUES = {True, 1, "yes", "true", "1"}
+_ONEWAY_BACKWARD_VALUES = {-1, "-1", "reverse"}
+
+
+def haversine_distance(lon1: Any, lat1: Any, lon2: Any, lat2: Any) -> Any:
+    """
+    Computes great-circle distances in meters, element-wise for NumPy arrays.
+
+    Args:
+        lon1 (Any): Longitude(s) of the first point(s).
+        lat1 (Any): Latitude(s) of the first point(s).
+        lon2 (Any): Longitude(s) of the second point(s).
+        lat2 (Any): Latitude(s) of the second point(s).
+
+    Returns:
+        Any: The distance(s) in meters.
+    """
+    lon1, lat1, lon2, lat2 = np.radians(lon1), np.radians(lat1), np.radians(lon2), np.radians(lat2)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * _EARTH_RADIUS * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _oneway_direction(value: Any) -> int:
+    if isinstance(value, str):
+        value = value.strip().lower()
+
+    if value in _ONEWAY_FORWARD_VALUES:
+        return 1
+
+    if value in _ONEWAY_BACKWARD_VALUES:
+        return -1
+
+    return 0
+
+
+def one_to_many_costs(
+    indptr: Any, arc_targets: Any, arc_costs: Any, source: int, targets: list[int]
+) -> list[float]:
+    """
+    Computes the costs of the cheapest paths from one node to many with Dijkstra, stopping once
+    every target is settled. Works on any indexable CSR arrays, e.g. memoryviews of shared memory.
+
+    Args:
+        indptr (Any): Arc offsets of the nodes, see `RoadGraph`.
+        arc_targets (Any): Target node of every arc.
+        arc_costs (Any): Cost of every arc.
+        source (int): Start node.
+        targets (list[int]): End nodes.
+
+    Returns:
+        list[float]: Cost of the path to every target, `inf` if it can't be reached.
+    """
+    remaining = set(targets)
+    costs = {source: 0.0}
+    queue = [(0.0, source)]
+
+    while queue and remaining:
+        cost, node = heappop(queue)
+
+        if cost > costs[node]:
+            continue
+
+        remaining.discard(node)
+
+        for arc in range(indptr[node], indptr[node + 1]):
+            next_node = arc_targets[arc]
+            next_cost = cost + arc_costs[arc]
+
+            if next_cost < costs.get(next_node, math.inf):
+                costs[next_node] = next_cost
+                heappush(queue, (next_cost, next_node))
+
+    return [costs.get(target, math.inf) for target in targets]
+
+
+class RoadGraph:
+    """
+    Directed graph of a road network version held in compact NumPy arrays.
+
+    Edge endpoints on the same cell of a snapping grid become one node, placed at the center of the
+    cell; the node keys stored on the edges at ingest are used as is, decoded with the tolerance of
+    the network's lineage. Every edge
+    yields an arc per direction it can be travelled in, stored in CSR form: the arcs leaving node
+    `n` are `indptr[n]:indptr[n + 1]`, each with its target node, cost in meters, edge & whether it
+    follows the edge geometry. Edge coordinates are kept flat, edge `e` being
+    `edge_coordinates[edge_offsets[e]:edge_offsets[e + 1]]`, along with its start & end node in
+    `edge_nodes[e]` & its great-circle length in `edge_lengths[e]`.
+    """
+
+    def __init__(
+        self,
+        edge_ids: np.ndarray,
+        edge_coordinates: np.ndarray,
+        edge_offsets: np.ndarray,
+        edge_nodes: np.ndarray,
+        edge_lengths: np.ndarray,
+        node_lons: np.ndarray,
+        node_lats: np.ndarray,
+        indptr: np.ndarray,
+        arc_targets: np.ndarray,
+        arc_costs: np.ndarray,
+        arc_edges: np.ndarray,
+        arc_forward: np.ndarray,
+        heuristic_scale: float,
+    ) -> None:
+        self.edge_ids = edge_ids
+        self.edge_coordinates = edge_coordinates
+        self.edge_offsets = edge_offsets
+        self.edge_nodes = edge_nodes
+        self.edge_lengths = edge_lengths
+        self.node_lons = node_lons
+        self.node_lats = node_lats
+        self.indptr = indptr
+        self.arc_targets = arc_targets
+        self.arc_costs = arc_costs
+        self.arc_edges = arc_edges
+        self.arc_forward = arc_forward
+        # Lower bound of cost per meter of great-circle distance, keeping the A* heuristic admissible
+        self.heuristic_scale = heuristic_scale
+        self._node_tree: Optional[shapely.STRtree] = None
+
+    @classmethod
+    def build(
+        cls,
+        edge_ids: list[str],
+        geometries_wkb: list[bytes],
+        lengths: list[Any],
+        oneways: list[Any],
+        endpoint_keys: Optional[list[tuple[Optional[int], Optional[int]]]] = None,
+        snap_tolerance: float = app_settings.GRAPH_SNAP_TOLERANCE,
+    ) -> "RoadGraph":
+        """
+        Builds the graph of a set of edges with vectorized NumPy operations.
+
+        Args:
+            edge_ids (list[str]): IDs of the edges.
+            geometries_wkb (list[bytes]): WKB LineString geometries of the edges.
+            lengths (list[Any]): `length` property of the edges in meters; edges without a valid
+                                 one cost their great-circle length.
+            oneways (list[Any]): `oneway` property of the edges.
+            endpoint_keys (Optional[list[tuple[Optional[int], Optional[int]]]]): Stored start &
+                                 end node keys of the edges; keys that are None, e.g. of edges
+                                 ingested before nodes were stored, are computed from the geometry.
+            snap_tolerance (float): Grid size in degrees endpoints are snapped to.
+
+        Returns:
+            RoadGraph: The graph.
+        """
+        edge_count = len(edge_ids)
+        coordinates, coordinate_edges = shapely.get_coordinates(
+            shapely.from_wkb(geometries_wkb), return_index=True
+        )
+        edge_offsets = np.zeros(edge_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(coordinate_edges, minlength=edge_count), out=edge_offsets[1:])
+
+        # Endpoints on the same grid cell are one node
+        endpoints = np.concatenate((coordinates[edge_offsets[:-1]], coordinates[edge_offsets[1:] - 1]))
+        grid_keys = endpoint_grid_keys(endpoints[:, 0], endpoints[:, 1], snap_tolerance)
+        if endpoint_keys:
+            # Start keys of all edges followed by their end keys, like `endpoints`
+            stored_keys = np.array(
+                [key if key is not None else -1 for keys in zip(*endpoint_keys) for key in keys],
+                dtype=np.int64,
+            )
+            grid_keys = np.where(stored_keys >= 0, stored_keys, grid_keys)
+        node_keys, endpoint_nodes = np.unique(grid_keys, return_inverse=True)
+        endpoint_nodes = endpoint_nodes.reshape(-1)
+        sources, targets = endpoint_nodes[:edge_count], endpoint_nodes[edge_count:]
+        node_coordinates = np.column_stack(grid_key_coordinates(node_keys, snap_tolerance))
+
+        # Great-circle length of every edge, summing the segments within the same edge
+        same_edge = coordinate_edges[:-1] == coordinate_edges[1:]
+        segment_lengths = haversine_distance(
+            coordinates[:-1, 0], coordinates[:-1, 1], coordinates[1:, 0], coordinates[1:, 1]
+        )
+        geodesic_lengths = np.bincount(
+            coordinate_edges[:-1][same_edge], weights=segment_lengths[same_edge], minlength=edge_count
+        )
+
+        costs = np.array(
+            [
+                length if isinstance(length, (int, float)) and not isinstance(length, bool) else np.nan
+                for length in lengths
+            ],
+            dtype=np.float64,
+        )
+        costs = np.where(np.isfinite(costs) & (costs >= 0), costs, geodesic_lengths)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cost_ratios = costs / geodesic_lengths
+        positive = geodesic_lengths > 0
+        heuristic_scale = float(min(1.0, cost_ratios[positive].min())) if positive.any() else 1.0
+
+        directions = np.array([_oneway_direction(oneway) for oneway in oneways], dtype=np.int8)
+        forward_edges = np.flatnonzero(directions >= 0)
+        backward_edges = np.flatnonzero(directions <= 0)
+
+        arc_sources = np.concatenate((sources[forward_edges], targets[backward_edges]))
+        arc_order = np.argsort(arc_sources, kind="stable")
+        arc_edges = np.concatenate((forward_edges, backward_edges))[arc_order]
+        arc_forward = np.concatenate(
+            (np.ones(len(forward_edges), dtype=bool), np.zeros(len(backward_edges), dtype=bool))
+        )[arc_order]
+        arc_targets = np.where(arc_forward, targets[arc_edges], sources[arc_edges])
+
+        node_count = len(node_coordinates)
+        indptr = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(arc_sources, minlength=node_count), out=indptr[1:])
+
+        return cls(
+            edge_ids=np.array([edge_id.encode() for edge_id in edge_ids], dtype=np.bytes_),
+            edge_coordinates=np.ascontiguousarray(coordinates),
+            edge_offsets=edge_offsets,
+            edge_nodes=np.stack((sources, targets), axis=1).astype(np.int64),
+            edge_lengths=geodesic_lengths,
+            node_lons=np.ascontiguousarray(node_coordinates[:, 0]),
+            node_lats=np.ascontiguousarray(node_coordinates[:, 1]),
+            indptr=indptr,
+            arc_targets=arc_targets.astype(np.int64),
+            arc_costs=costs[arc_edges],
+            arc_edges=arc_edges.astype(np.int64),
+            arc_forward=arc_forward,
+            heuristic_scale=heuristic_scale,
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Returns the memory held by the graph arrays in bytes.
+        """
+        return sum(
+            array.nbytes
+            for array in (
+                self.edge_ids, self.edge_coordinates, self.edge_offsets, self.edge_nodes,
+                self.edge_lengths, self.node_lons,
+                self.node_lats, self.indptr, self.arc_targets, self.arc_costs, self.arc_edges,
+                self.arc_forward,
+            )
+        )
+
+    def nearest_nodes(self, lons: Any, lats: Any) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Finds the nodes closest to many points at once, through an STRtree over the nodes built on
+        first use. Closeness is measured in degrees, distances are returned in meters.
+
+        Args:
+            lons (Any): Longitudes of the points.
+            lats (Any): Latitudes of the points.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The closest node of every point & its distance in meters.
+        """
+        if self._node_tree is None:
+            self._node_tree = shapely.STRtree(shapely.points(self.node_lons, self.node_lats))
+
+        lons, lats = np.asarray(lons, dtype=np.float64), np.asarray(lats, dtype=np.float64)
+        point_indices, nodes = self._node_tree.query_nearest(
+            shapely.points(lons, lats), all_matches=False
+        )
+        closest = np.empty(len(lons), dtype=np.int64)
+        closest[point_indices] = nodes
+
+        return closest, haversine_distance(self.node_lons[closest], self.node_lats[closest], lons, lats)
+
+    def nearest_node(self, lon: float, lat: float) -> tuple[int, float]:
+        """
+        Finds the node closest to a point.
+
+        Args:
+            lon (float): Longitude of the point.
+            lat (float): Latitude of the point.
+
+        Returns:
+            tuple[int, float]: The node & its distance to the point in meters.
+        """
+        nodes, distances = self.nearest_nodes([lon], [lat])
+        return int(nodes[0]), float(distances[0])
+
+    def shortest_path(self, source: int, target: int) -> Optional[tuple[float, list[int]]]:
+        """
+        Finds the cheapest path between two nodes with A*, using the great-circle distance to the
+        target as heuristic.
+
+        Args:
+            source (int): Start node.
+            target (int): End node.
+
+        Returns:
+            Optional[tuple[float, list[int]]]: Cost of the path & its arcs in order, or None if the
+                                               target can't be reached.
+        """
+        # Scalar access through memoryviews is much cheaper than indexing the NumPy arrays
+        indptr = memoryview(self.indptr)
+        arc_targets = memoryview(self.arc_targets)
+        arc_costs = memoryview(self.arc_costs)
+        node_lons = memoryview(self.node_lons)
+        node_lats = memoryview(self.node_lats)
+
+        radians = math.pi / 180
+        sin, cos, asin, sqrt = math.sin, math.cos, math.asin, math.sqrt
+        target_lon = node_lons[target] * radians
+        target_lat = node_lats[target] * radians
+        cos_target_lat = cos(target_lat)
+        heuristic_factor = 2 * _EARTH_RADIUS * self.heuristic_scale
+
+        def heuristic(node: int) -> float:
+            lat = node_lats[node] * radians
+            a = (
+                sin((target_lat - lat) / 2) ** 2
+                + cos(lat) * cos_target_lat * sin((target_lon - node_lons[node] * radians) / 2) ** 2
+            )
+            return heuristic_factor * asin(sqrt(a if a < 1.0 else 1.0))
+
+        costs = {source: 0.0}
+        previous: dict[int, tuple[int, int]] = {}
+        queue = [(heuristic(source), 0.0, source)]
+
+        while queue:
+            _, cost, node = heappop(queue)
+
+            if node == target:
+                break
+
+            if cost > costs[node]:
+                continue
+
+            for arc in range(indptr[node], indptr[node + 1]):
+                next_node = arc_targets[arc]
+                next_cost = cost + arc_costs[arc]
+
+                if next_cost < costs.get(next_node, math.inf):
+                    costs[next_node] = next_cost
+                    previous[next_node] = (node, arc)
+                    heappush(queue, (next_cost + heuristic(next_node), next_cost, next_node))
+        else:
+            return None
+
+        arcs = []
+        node = target
+        while node != source:
+            node, arc = previous[node]
+            arcs.append(arc)
+
+        return costs[target], arcs[::-1]
+
+    def path_coordinates(self, arcs: list[int]) -> list[list[float]]:
+        """
+        Joins the geometries of the edges along a path.
+
+        Args:
+            arcs (list[int]): Arcs of the path in order.
+
+        Returns:
+            list[list[float]]: Coordinates of the path, as GeoJSON positions.
+        """
+        pieces = []
+
+        for arc in arcs:
+            edge = self.arc_edges[arc]
+            coordinates = self.edge_coordinates[self.edge_offsets[edge]:self.edge_offsets[edge + 1]]
+            if not self.arc_forward[arc]:
+                coordinates = coordinates[::-1]
+            # Consecutive edges share their connecting vertex
+            pieces.append(coordinates if not pieces else coordinates[1:])
+
+        return np.concatenate(pieces).tolist() if pieces else []
+
+    def path_edge_ids(self, arcs: list[int]) -> list[str]:
+        """
+        Returns the IDs of the edges along a path.
+
+        Args:
+            arcs (list[int]): Arcs of the path in order.
+
+        Returns:
+            list[str]: The edge IDs.
+        """
+        return [self.edge_ids[self.arc_edges[arc]].decode() for arc in arcs]
+
+
+async def load_road_graph(road_network: RoadNetworkModel) -> RoadGraph:
+    """
+    Reads the edges of a road network version & builds its graph, off the event loop.
+
+    Args:
+        road_network (RoadNetworkModel): The road network version.
+
+    Returns:
+        RoadGraph: The graph of the network version.
+    """
+    edges_query = (
+        select(
+            EdgeModel.id,
+            func.ST_AsBinary(EdgeModel.geometry),
+            type_coerce(edge_property_value("length", normalized=True), JSONB),
+            type_coerce(edge_property_value("oneway"), JSONB),
+            EdgeModel.source_node,
+            EdgeModel.target_node,
+        )
+        .where(*live_edge_filters(road_network), EdgeModel.geometry.is_not(None))
+        .execution_options(yield_per=app_settings.EDGE_STREAM_CHUNK_SIZE)
+    )
+    edge_ids, geometries_wkb, lengths, oneways, endpoint_keys = [], [], [], [], []
+
+    # Graphs are shared between requests, so they are loaded in their own session
+    async with async_session() as session:
+        edges_result = await session.stream(edges_query)
+
+        async for edge_id, geometry_wkb, length, oneway, source_node, target_node in edges_result:
+            edge_ids.append(edge_id)
+            geometries_wkb.append(bytes(geometry_wkb))
+            lengths.append(length)
+            oneways.append(oneway)
+            endpoint_keys.append((source_node, target_node))
+
+    return await run_in_threadpool(
+        RoadGraph.build,
+        edge_ids,
+        geometries_wkb,
+        lengths,
+        oneways,
+        endpoint_keys,
+        get_snap_tolerance(road_network),
+    )
+
+
+_pending_graphs: dict[str, asyncio.Task] = {}
+
+
+async def get_road_graph(road_network: RoadNetworkModel) -> RoadGraph:
+    """
+    Returns the graph of a road network version from `graph_cache`, building it if it is not cached.
+    Concurrent requests for the same version share a single build.
+
+    Args:
+        road_network (RoadNetworkModel): The road network version.
+
+    Returns:
+        RoadGraph: The graph of the network version.
+    """
+    graph = graph_cache.get(road_network.id)
+
+    if graph is not None:
+        return graph
+
+    task = _pending_graphs.get(road_network.id)
+    if task is None:
+        task = asyncio.ensure_future(load_road_graph(road_network))
+        _pending_graphs[road_network.id] = task
+
+        def on_built(task: asyncio.Task) -> None:
+            _pending_graphs.pop(road_network.id, None)
+            # A network version never changes, so its graph never has to be invalidated
+            if not task.cancelled() and task.exception() is None:
+                graph_cache.set(road_network.id, task.result())
+
+        task.add_done_callback(on_built)
+
+    # A client going away must not cancel the build other requests are waiting on
+    return await asyncio.shield(task)
@@ -0,0 +1,225 @@
+from concurrent.futures import Executor
+from collections.abc import Awaitable, Callable
+from typing import Optional
+
+from fastapi import UploadFile
+from geoalchemy2 import Geometry
+from sqlalchemy import (
+    BigInteger, Boolean, Column, Float, MetaData, SmallInteger, String, Table, exists, func, insert, literal
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select, update
+
+from src.settings import app_settings
+from .models import EdgeModel, IngestJobModel, IngestOperation, RoadNetworkModel
+from .utils import (
+    EDGE_COPY_COLUMNS, VERSION_COPY_COLUMNS, get_latest_road_network, insert_edges, live_edge_filters
+)
+
+
+# Per transaction staging table holding the full edge set of an update until it is diffed
+edge_staging_table = Table(
+    "edge_staging",
+    MetaData(),
+    Column("network_id", String),
+    Column("root_network_id", String),
+    Column("valid_from_version", Float),
+    Column("properties", JSONB),
+    Column("geometry", Geometry("LINESTRING", srid=4326, spatial_index=False)),
+    Column("geometry_medium", Geometry("LINESTRING", srid=4326, spatial_index=False)),
+    Column("geometry_low", Geometry("LINESTRING", srid=4326, spatial_index=False)),
+    Column("highway", String),
+    Column("lanes", SmallInteger),
+    Column("oneway", Boolean),
+    Column("length", Float),
+    Column("source_node", BigInteger),
+    Column("target_node", BigInteger),
+    Column("content_hash", String),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+
+class IngestError(Exception):
+    """
+    Raised when an ingest job cannot be applied to the current state of the road network.
+    """
+
+
+async def lock_lineage(session: AsyncSession, root_id: str) -> None:
+    """
+    Serializes the writers of a road network lineage: waits for a transaction level advisory lock
+    on the lineage, released when the session's transaction ends.
+
+    Args:
+        session (AsyncSession): The database session of the ingest.
+        root_id (str): ID of the first version of the lineage.
+    """
+    await session.execute(select(func.pg_advisory_xact_lock(func.hashtextextended(root_id, 0))))
+
+
+async def apply_edge_delta(
+    session: AsyncSession, parent_network: RoadNetworkModel, road_network: RoadNetworkModel
+) -> None:
+    """
+    Stores a new network version as a delta against its parent, from the edges staged in
+    `edge_staging_table`.
+
+    Staged edges are matched with the parent's edges on their content hash; duplicates are paired up
+    by occurrence number, so the version keeps the multiplicity of identical edges. Only the
+    unmatched staged edges are inserted & only the unmatched parent edges are retired, by closing
+    their validity range at the new version. Edges shared with the parent are not touched.
+
+    Args:
+        session (AsyncSession): The database session of the ingest.
+        parent_network (RoadNetworkModel): The version the new one is derived from.
+        road_network (RoadNetworkModel): The new version.
+    """
+    # Edge content columns, i.e. all loaded columns but the version bookkeeping
+    content_columns = [column for column in EDGE_COPY_COLUMNS if column not in VERSION_COPY_COLUMNS]
+
+    staged = (
+        select(
+            *(edge_staging_table.c[column] for column in content_columns),
+            func.row_number().over(partition_by=edge_staging_table.c.content_hash).label("occurrence"),
+        )
+        .subquery("staged")
+    )
+
+    parent_edges = (
+        select(
+            EdgeModel.id,
+            EdgeModel.content_hash,
+            func.row_number().over(
+                partition_by=EdgeModel.content_hash, order_by=EdgeModel.id
+            ).label("occurrence"),
+        )
+        .where(*live_edge_filters(parent_network))
+        .subquery("parent_edges")
+    )
+
+    # Edges not present in the parent version
+    await session.execute(
+        insert(EdgeModel).from_select(
+            [*VERSION_COPY_COLUMNS, *content_columns],
+            select(
+                literal(road_network.id),
+                literal(road_network.root_id),
+                literal(road_network.version),
+                *(staged.c[column] for column in content_columns),
+            )
+            .where(
+                ~exists().where(
+                    parent_edges.c.content_hash == staged.c.content_hash,
+                    parent_edges.c.occurrence == staged.c.occurrence,
+                )
+            ),
+            include_defaults=False,
+        )
+    )
+
+    # Edges of the parent version not present anymore
+    await session.execute(
+        update(EdgeModel)
+        .where(
+            EdgeModel.id.in_(
+                select(parent_edges.c.id)
+                .where(
+                    ~exists().where(
+                        staged.c.content_hash == parent_edges.c.content_hash,
+                        staged.c.occurrence == parent_edges.c.occurrence,
+                    )
+                )
+            )
+        )
+        .values(valid_to_version=road_network.version)
+    )
+
+
+async def ingest_road_network(
+    session: AsyncSession,
+    job: IngestJobModel,
+    file: UploadFile,
+    executor: Optional[Executor] = None,
+    on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+) -> RoadNetworkModel:
+    """
+    Applies an ingest job: creates the road network version described by the job & loads its edges
+    from the uploaded file. The caller is responsible for committing the session.
+
+    A new network stores all of its edges. An update is stored copy-on-write: only the edges it adds
+    & removes relative to the latest version are written, as validity ranges over the versions.
+    Updates of a lineage run one at a time, see `lock_lineage`, so each one is diffed against the
+    version committed by the one before it.
+
+    Args:
+        session (AsyncSession): The database session used for the ingest.
+        job (IngestJobModel): The job being run.
+        file (UploadFile): The spooled .geojson file of the job.
+        executor (Optional[Executor]): Executor running the geometry conversion.
+        on_progress (Optional[Callable[[int, int], Awaitable[None]]]): Progress callback, see `insert_edges`.
+
+    Returns:
+        RoadNetworkModel: The created road network version.
+
+    Raises:
+        IngestError: If an update targets a missing network or a version that is not the newest.
+        GeoJSONParseError: If the file is not a valid FeatureCollection.
+    """
+    latest_network = None
+
+    if job.operation == IngestOperation.UPDATE:
+        latest_network = await get_latest_road_network(session, job.customer_id, job.name)
+
+        if not latest_network:
+            raise IngestError(f"Road network `{job.name}` not found")
+
+        # Another update may have committed a newer version while waiting for the lock
+        await lock_lineage(session, latest_network.root_id)
+        latest_network = await get_latest_road_network(session, job.customer_id, job.name)
+
+        if job.version <= latest_network.version:
+            raise IngestError(
+                f"New version `({job.version})` must be higher than current latest `({latest_network.version})`"
+            )
+
+    road_network = RoadNetworkModel(
+        name=job.name,
+        version=job.version,
+        customer_id=job.customer_id,
+        parent_id=latest_network.id if latest_network else None,
+        # Node keys are only comparable within a lineage if they are all made on the same grid
+        snap_tolerance=(
+            latest_network.snap_tolerance if latest_network else app_settings.GRAPH_SNAP_TOLERANCE
+        ),
+    )
+    # A new network is the root of its own lineage
+    road_network.root_id = latest_network.root_id if latest_network else road_network.id
+    session.add(road_network)
+    await session.flush()
+
+    if not latest_network:
+        await insert_edges(
+            session,
+            road_network,
+            file,
+            executor=executor,
+            on_progress=on_progress,
+        )
+        return road_network
+
+    connection = await session.connection()
+    await connection.run_sync(edge_staging_table.create)
+
+    await insert_edges(
+        session,
+        road_network,
+        file,
+        executor=executor,
+        on_progress=on_progress,
+        table=edge_staging_table.name,
+    )
+    await apply_edge_delta(session, latest_network, road_network)
+
+    return road_network
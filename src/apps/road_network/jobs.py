@@ -0,0 +1,300 @@
+import asyncio
+import multiprocessing
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from fastapi import UploadFile
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select, update
+
+from src.database import async_session
+from src.global_utils import time_now
+from src.settings import app_settings
+from src.apps.user.models import UserModel
+from .catalog import road_network_catalog
+from .ingest import IngestError, ingest_road_network
+from .models import IngestJobModel, IngestJobStatus, IngestOperation
+from .utils import GeoJSONParseError, spool_upload
+
+
+ACTIVE_JOB_STATUSES = (IngestJobStatus.QUEUED, IngestJobStatus.RUNNING)
+
+
+class IngestJobLimitError(Exception):
+    """
+    Raised when a customer already has `INGEST_MAX_JOBS_PER_CUSTOMER` unfinished ingest jobs.
+    """
+
+
+async def update_ingest_job(job_id: str, **values) -> None:
+    """
+    Updates an ingest job in its own short transaction, so progress is visible to other sessions
+    while the ingest transaction itself is still open.
+
+    Args:
+        job_id (str): ID of the job.
+        **values: Column values to set on the job.
+    """
+    async with async_session() as session:
+        await session.execute(
+            update(IngestJobModel)
+            .where(IngestJobModel.id == job_id)
+            .values(updated_at=time_now(), **values)
+        )
+        await session.commit()
+
+
+async def count_active_ingest_jobs(session: AsyncSession, customer_id: str) -> int:
+    """
+    Counts the queued & running ingest jobs of a customer.
+
+    Args:
+        session (AsyncSession): The database session.
+        customer_id (str): ID of the customer.
+
+    Returns:
+        int: The number of unfinished jobs.
+    """
+    active_jobs_query = (
+        select(func.count())
+        .select_from(IngestJobModel)
+        .where(IngestJobModel.customer_id == customer_id)
+        .where(IngestJobModel.status.in_(ACTIVE_JOB_STATUSES))
+    )
+    active_jobs_result = await session.execute(active_jobs_query)
+    return active_jobs_result.scalar_one()
+
+
+async def lock_customer_ingest_jobs(session: AsyncSession, customer_id: str) -> None:
+    """
+    Serializes the job submissions of a customer: waits for a transaction level advisory lock on
+    the customer's jobs, released when the session's transaction ends.
+
+    Args:
+        session (AsyncSession): The database session submitting the job.
+        customer_id (str): ID of the customer.
+    """
+    lock_key = func.hashtextextended(f"ingest_jobs:{customer_id}", 0)
+    await session.execute(select(func.pg_advisory_xact_lock(lock_key)))
+
+
+def _remove_spool_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class IngestJobRunner:
+    """
+    Runs road network ingest jobs in the background of an API worker.
+
+    At most `max_workers` jobs run at a time as asyncio tasks; the CPU bound geometry conversion of
+    every job is handed to a shared pool of `process_workers` processes.
+    """
+
+    def __init__(self, max_workers: int, process_workers: int) -> None:
+        self._max_workers = max_workers
+        self._process_workers = process_workers
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        """
+        Creates the worker slots & the process pool. Must be called from the running event loop.
+        """
+        self._semaphore = asyncio.Semaphore(self._max_workers)
+
+        if self._process_workers > 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._process_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    async def shutdown(self) -> None:
+        """
+        Cancels the running jobs & stops the process pool.
+        """
+        for task in self._tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        if self._executor:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def submit(self, job_id: str) -> None:
+        """
+        Schedules a queued job to run as soon as a worker slot is free.
+
+        Args:
+            job_id (str): ID of the job.
+        """
+        task = asyncio.create_task(self._run(job_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def fail_stale_jobs(self) -> None:
+        """
+        Fails unfinished jobs that have not made progress for `INGEST_STALE_JOB_AFTER`, e.g. because
+        the worker running them was restarted, so they stop counting against the customer's limit.
+        """
+        async with async_session() as session:
+            await session.execute(
+                update(IngestJobModel)
+                .where(IngestJobModel.status.in_(ACTIVE_JOB_STATUSES))
+                .where(IngestJobModel.updated_at < time_now() - app_settings.INGEST_STALE_JOB_AFTER)
+                .values(
+                    status=IngestJobStatus.FAILED,
+                    error="Ingest job was interrupted",
+                    finished_at=time_now(),
+                )
+            )
+            await session.commit()
+
+    async def _run(self, job_id: str) -> None:
+        async with self._semaphore:
+            try:
+                await self._process(job_id)
+            except asyncio.CancelledError:
+                await asyncio.shield(
+                    update_ingest_job(
+                        job_id,
+                        status=IngestJobStatus.FAILED,
+                        error="Ingest job was interrupted",
+                        finished_at=time_now(),
+                    )
+                )
+                raise
+
+    async def _process(self, job_id: str) -> None:
+        async def on_progress(features_parsed: int, features_inserted: int) -> None:
+            await update_ingest_job(
+                job_id,
+                features_parsed=features_parsed,
+                features_inserted=features_inserted,
+            )
+
+        async with async_session() as session:
+            job = await session.get(IngestJobModel, job_id)
+
+            if not job:
+                return None
+
+            await update_ingest_job(job_id, status=IngestJobStatus.RUNNING, started_at=time_now())
+
+            try:
+                with open(job.spool_path, "rb") as spool_file:
+                    road_network = await ingest_road_network(
+                        session,
+                        job,
+                        UploadFile(file=spool_file, filename=os.path.basename(job.spool_path)),
+                        executor=self._executor,
+                        on_progress=on_progress,
+                    )
+                await road_network_catalog.notify(session, job.customer_id)
+                await session.commit()
+                road_network_catalog.invalidate(job.customer_id)
+
+            except (GeoJSONParseError, IngestError) as e:
+                await session.rollback()
+                await self._fail(job_id, str(e))
+
+            except IntegrityError:
+                await session.rollback()
+                await self._fail(job_id, f"Network `{job.name}` already exists")
+
+            except Exception:
+                await session.rollback()
+                print(traceback.format_exc())
+                await self._fail(job_id, "Unexpected error while ingesting road network")
+
+            else:
+                await update_ingest_job(
+                    job_id,
+                    status=IngestJobStatus.SUCCEEDED,
+                    network_id=road_network.id,
+                    finished_at=time_now(),
+                )
+
+            finally:
+                _remove_spool_file(job.spool_path)
+
+    @staticmethod
+    async def _fail(job_id: str, error: str) -> None:
+        await update_ingest_job(
+            job_id,
+            status=IngestJobStatus.FAILED,
+            error=error,
+            finished_at=time_now(),
+        )
+
+
+# Shared runner of the API worker, started & stopped by the app lifespan
+ingest_job_runner = IngestJobRunner(
+    max_workers=app_settings.INGEST_MAX_WORKERS,
+    process_workers=app_settings.INGEST_PROCESS_WORKERS,
+)
+
+
+async def create_ingest_job(
+    session: AsyncSession,
+    user: UserModel,
+    operation: IngestOperation,
+    name: str,
+    version: float,
+    file: UploadFile,
+) -> IngestJobModel:
+    """
+    Spools an uploaded file to local disk, records an ingest job for it & schedules the job.
+
+    The customer's unfinished jobs are counted & the job is inserted under `lock_customer_ingest_jobs`,
+    so concurrent uploads cannot exceed `INGEST_MAX_JOBS_PER_CUSTOMER`.
+
+    Args:
+        session (AsyncSession): The database session.
+        user (UserModel): The user who uploaded the file.
+        operation (IngestOperation): Whether the job creates a network or adds a new version.
+        name (str): Name of the road network.
+        version (float): Version number of the road network.
+        file (UploadFile): The uploaded .geojson file.
+
+    Returns:
+        IngestJobModel: The queued job.
+
+    Raises:
+        IngestJobLimitError: If the customer has too many unfinished jobs; the caller rolls back.
+    """
+    job = IngestJobModel(
+        customer_id=user.customer_id,
+        created_by=user.id,
+        operation=operation,
+        name=name,
+        version=version,
+        spool_path="",
+    )
+    job.spool_path = os.path.join(app_settings.INGEST_SPOOL_DIR, f"{job.id}.geojson")
+
+    await spool_upload(file, job.spool_path)
+
+    try:
+        await lock_customer_ingest_jobs(session, user.customer_id)
+
+        if await count_active_ingest_jobs(session, user.customer_id) >= app_settings.INGEST_MAX_JOBS_PER_CUSTOMER:
+            raise IngestJobLimitError(f"Customer `{user.customer_id}` has too many unfinished ingest jobs")
+
+        session.add(job)
+        await session.commit()
+    except Exception:
+        _remove_spool_file(job.spool_path)
+        raise
+
+    ingest_job_runner.submit(job.id)
+
+    return job
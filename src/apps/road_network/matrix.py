@@ -0,0 +1,224 @@
+import asyncio
+import multiprocessing
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+
+from src.settings import app_settings
+from .graph import RoadGraph, one_to_many_costs
+
+# CSR arrays a one-to-many search needs
+_SHARED_GRAPH_ARRAYS = ("indptr", "arc_targets", "arc_costs")
+
+# Shared graphs attached by the current pool worker, by the name of their first segment
+_attached_graphs: OrderedDict[str, tuple[list[SharedMemory], list[memoryview]]] = OrderedDict()
+
+
+class SharedGraph:
+    """
+    Copy of the CSR arrays of a `RoadGraph` in shared memory, so pool workers can search the graph
+    without it being pickled for every task. Tasks only carry the small `descriptor`.
+    """
+
+    def __init__(self, graph: RoadGraph) -> None:
+        self._segments: list[SharedMemory] = []
+        descriptor = []
+
+        for name in _SHARED_GRAPH_ARRAYS:
+            array = getattr(graph, name)
+            segment = SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[:] = array
+            self._segments.append(segment)
+            descriptor.append((segment.name, array.shape, array.dtype.str))
+
+        self.descriptor = tuple(descriptor)
+
+    def close(self) -> None:
+        """
+        Releases the shared memory; workers still attached keep their mapping until they detach.
+        """
+        for segment in self._segments:
+            segment.close()
+            segment.unlink()
+
+        self._segments = []
+
+
+def _attach(descriptor: tuple) -> list[memoryview]:
+    key = descriptor[0][0]
+    attached = _attached_graphs.get(key)
+
+    if attached is not None:
+        _attached_graphs.move_to_end(key)
+        return attached[1]
+
+    segments = [SharedMemory(name=name) for name, _, _ in descriptor]
+    arrays = [
+        memoryview(np.ndarray(shape, dtype=dtype, buffer=segment.buf))
+        for segment, (_, shape, dtype) in zip(segments, descriptor)
+    ]
+    _attached_graphs[key] = (segments, arrays)
+
+    while len(_attached_graphs) > app_settings.MATRIX_MAX_SHARED_GRAPHS:
+        _, (old_segments, old_arrays) = _attached_graphs.popitem(last=False)
+        for array in old_arrays:
+            array.release()
+        for segment in old_segments:
+            segment.close()
+
+    return arrays
+
+
+def _shared_rows(descriptor: tuple, sources: list[int], targets: list[int]) -> np.ndarray:
+    # Runs in a pool worker
+    indptr, arc_targets, arc_costs = _attach(descriptor)
+    return np.array(
+        [one_to_many_costs(indptr, arc_targets, arc_costs, source, targets) for source in sources],
+        dtype=np.float64,
+    ).reshape(len(sources), len(targets))
+
+
+def _graph_rows(graph: RoadGraph, sources: list[int], targets: list[int]) -> np.ndarray:
+    indptr, arc_targets, arc_costs = (
+        memoryview(getattr(graph, name)) for name in _SHARED_GRAPH_ARRAYS
+    )
+    return np.array(
+        [one_to_many_costs(indptr, arc_targets, arc_costs, source, targets) for source in sources],
+        dtype=np.float64,
+    ).reshape(len(sources), len(targets))
+
+
+class TravelMatrixRunner:
+    """
+    Computes travel cost matrices of an API worker, spreading the one-to-many searches over a pool
+    of `process_workers` processes that read the graphs from shared memory.
+
+    At most `max_shared_graphs` graphs are kept in shared memory; the least recently used graph no
+    matrix is being computed on is released first. Without processes, searches run in threads.
+    """
+
+    def __init__(self, process_workers: int, max_shared_graphs: int) -> None:
+        self._process_workers = process_workers
+        self._max_shared_graphs = max_shared_graphs
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._shared_graphs: OrderedDict[str, SharedGraph] = OrderedDict()
+        self._users: dict[str, int] = {}
+
+    def start(self) -> None:
+        """
+        Creates the process pool. Must be called from the running event loop.
+        """
+        if self._process_workers > 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._process_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    def shutdown(self) -> None:
+        """
+        Stops the process pool & releases the shared graphs.
+        """
+        if self._executor:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+        for shared_graph in self._shared_graphs.values():
+            shared_graph.close()
+
+        self._shared_graphs.clear()
+        self._users.clear()
+
+    async def iter_rows(
+        self,
+        graph_key: str,
+        graph: RoadGraph,
+        sources: list[int],
+        targets: list[int],
+        rows_per_task: int = app_settings.MATRIX_ROWS_PER_TASK,
+    ) -> AsyncIterator[tuple[list[int], np.ndarray]]:
+        """
+        Computes the costs from every source to every target, yielding rows as their tasks finish.
+
+        Args:
+            graph_key (str): Key of the graph, the ID of its network version.
+            graph (RoadGraph): The graph.
+            sources (list[int]): Start nodes.
+            targets (list[int]): End nodes.
+            rows_per_task (int): Number of sources searched per task.
+
+        Yields:
+            tuple[list[int], np.ndarray]: Indices in `sources` of a batch of rows & their costs, a
+                                          `len(batch) x len(targets)` array with `inf` for
+                                          unreachable targets.
+        """
+        loop = asyncio.get_running_loop()
+        batches = [
+            list(range(start, min(start + rows_per_task, len(sources))))
+            for start in range(0, len(sources), rows_per_task)
+        ]
+
+        futures: dict[asyncio.Future, list[int]] = {}
+        descriptor = self._acquire(graph_key, graph).descriptor if self._executor else None
+
+        try:
+            for batch in batches:
+                batch_sources = [sources[row] for row in batch]
+                if descriptor:
+                    future = loop.run_in_executor(
+                        self._executor, _shared_rows, descriptor, batch_sources, targets
+                    )
+                else:
+                    future = asyncio.ensure_future(
+                        run_in_threadpool(_graph_rows, graph, batch_sources, targets)
+                    )
+                futures[future] = batch
+
+            pending = set(futures)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    yield futures[future], future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+            if descriptor:
+                self._release(graph_key)
+
+    def _acquire(self, graph_key: str, graph: RoadGraph) -> SharedGraph:
+        shared_graph = self._shared_graphs.get(graph_key)
+
+        if shared_graph is None:
+            shared_graph = SharedGraph(graph)
+            self._shared_graphs[graph_key] = shared_graph
+
+        self._shared_graphs.move_to_end(graph_key)
+        self._users[graph_key] = self._users.get(graph_key, 0) + 1
+        self._evict()
+        return shared_graph
+
+    def _release(self, graph_key: str) -> None:
+        # The shared graphs are gone already if the runner was shut down meanwhile
+        if graph_key in self._users:
+            self._users[graph_key] -= 1
+            self._evict()
+
+    def _evict(self) -> None:
+        unused = [key for key in self._shared_graphs if not self._users.get(key)]
+
+        # Graphs still in use by a matrix are kept even beyond the limit
+        while len(self._shared_graphs) > self._max_shared_graphs and unused:
+            key = unused.pop(0)
+            self._shared_graphs.pop(key).close()
+            self._users.pop(key, None)
+
+
+travel_matrix_runner = TravelMatrixRunner(
+    process_workers=app_settings.MATRIX_PROCESS_WORKERS,
+    max_shared_graphs=app_settings.MATRIX_MAX_SHARED_GRAPHS,
+)
@@ -1,7 +1,9 @@
+import uuid
 from typing import Optional
 from datetime import datetime
+from enum import Enum
 
-from sqlalchemy import Column
+from sqlalchemy import BigInteger, Column, Index, SmallInteger, text
 from sqlmodel import Field, Relationship, UniqueConstraint
 from sqlalchemy.dialects.postgresql import JSONB
 from geoalchemy2 import Geometry
@@ -28,29 +30,168 @@ class RoadNetworkModel(BaseModel, table=True):
     version: float
     created_at: datetime = Field(default_factory=time_now)
     customer_id: str = Field(foreign_key="customer.id", index=True)
+    # Version this one was derived from & first version of the lineage (itself for a new network)
+    parent_id: Optional[str] = Field(default=None, foreign_key="roadnetwork.id", nullable=True)
+    root_id: str = Field(foreign_key="roadnetwork.id", index=True)
+    # Grid size in degrees the node keys of the lineage are made with, fixed by its first version;
+    # None for lineages ingested before it was stored, see `get_snap_tolerance`
+    snap_tolerance: Optional[float] = Field(default=None, nullable=True)
 
     customer: "CustomerModel" = Relationship(back_populates="road_networks") # type: ignore # noqa: F821
-    edges: list["EdgeModel"] = Relationship(back_populates="network")
+    edges: list["EdgeModel"] = Relationship(
+        back_populates="network",
+        sa_relationship_kwargs={"foreign_keys": "[EdgeModel.network_id]"}
+    )
 
 
 class EdgeModel(BaseModel, table=True):
     __tablename__ = "edge"
+    __table_args__ = (
+        Index("ix_edge_validity", "root_network_id", "valid_from_version", "valid_to_version"),
+        # Keyset pagination of a lineage's edges
+        Index("ix_edge_root_network_id_id", "root_network_id", "id"),
+        Index("ix_edge_geometry", "geometry", postgresql_using="gist"),
+        # Spatial filters within one lineage; needs the btree_gist extension for the text column
+        Index("ix_edge_root_network_geometry", "root_network_id", "geometry", postgresql_using="gist"),
+        # Connectivity & degree queries over the topology
+        Index("ix_edge_root_network_source_node", "root_network_id", "source_node"),
+        Index("ix_edge_root_network_target_node", "root_network_id", "target_node"),
+        # Property filters (`@>` & `@?`)
+        Index(
+            "ix_edge_properties",
+            "properties",
+            postgresql_using="gin",
+            postgresql_ops={"properties": "jsonb_path_ops"},
+        ),
+    )
 
+    # Generated server side as well, so bulk COPY loads don't have to send an id per row
+    id: str = Field(
+        default_factory=lambda: str(uuid.uuid4()),
+        primary_key=True,
+        sa_column_kwargs={"server_default": text("gen_random_uuid()::text")}
+    )
+    # Version that added the edge; later versions of the lineage share it while it is valid
     network_id: str = Field(foreign_key="roadnetwork.id", index=True)
-    is_active: bool = Field(default=True)
+    root_network_id: str = Field(foreign_key="roadnetwork.id")
+    # Valid for the versions v of the lineage with valid_from_version <= v < valid_to_version
+    valid_from_version: float
+    valid_to_version: Optional[float] = Field(default=None, nullable=True)
+    # Hash of geometry & properties, used to match unchanged edges between versions
+    content_hash: str = Field(index=True)
     properties: dict = Field(
         sa_column=Column(JSONB)
     )
+    # Frequently used properties promoted out of `properties` at ingest, see `PROMOTED_EDGE_PROPERTIES`
+    highway: Optional[str] = Field(default=None, nullable=True, index=True)
+    lanes: Optional[int] = Field(default=None, sa_column=Column(SmallInteger, index=True))
+    oneway: Optional[bool] = Field(default=None, nullable=True)
+    length: Optional[float] = Field(default=None, nullable=True, index=True)
     geometry: Optional[WKBElement] = Field(
-        sa_column=Column(Geometry("LINESTRING", srid=4326))
+        sa_column=Column(Geometry("LINESTRING", srid=4326, spatial_index=False))
+    )
+    # Grid keys of the nodes at the start & end of the geometry, see `NodeModel`
+    source_node: Optional[int] = Field(default=None, sa_column=Column(BigInteger))
+    target_node: Optional[int] = Field(default=None, sa_column=Column(BigInteger))
+    # Simplified copies of the geometry for overviews, see `GEOMETRY_SIMPLIFY_TOLERANCES`
+    geometry_medium: Optional[WKBElement] = Field(
+        sa_column=Column(Geometry("LINESTRING", srid=4326, spatial_index=False))
+    )
+    geometry_low: Optional[WKBElement] = Field(
+        sa_column=Column(Geometry("LINESTRING", srid=4326, spatial_index=False))
+    )
+
+    network: "RoadNetworkModel" = Relationship(
+        back_populates="edges",
+        sa_relationship_kwargs={"foreign_keys": "[EdgeModel.network_id]"}
+    )
+
+    model_config = {
+        "arbitrary_types_allowed": True,
+    }
+
+
+class NodeModel(BaseModel, table=True):
+    __tablename__ = "node"
+    __table_args__ = (
+        UniqueConstraint("root_network_id", "grid_key", name="uq_node_root_network_grid_key"),
+        Index("ix_node_geometry", "geometry", postgresql_using="gist"),
     )
 
-    network: "RoadNetworkModel" = Relationship(back_populates="edges")
+    # Generated server side as well, so nodes can be inserted in bulk without sending an id per row
+    id: str = Field(
+        default_factory=lambda: str(uuid.uuid4()),
+        primary_key=True,
+        sa_column_kwargs={"server_default": text("gen_random_uuid()::text")}
+    )
+    # Nodes are shared by all versions of a lineage & never removed; a node belongs to a version
+    # while one of its live edges starts or ends on it
+    root_network_id: str = Field(foreign_key="roadnetwork.id")
+    # Cell of the snapping grid the edge endpoints of the node fall in, see `endpoint_grid_keys`
+    grid_key: int = Field(sa_column=Column(BigInteger, nullable=False))
+    # Center of the grid cell
+    geometry: Optional[WKBElement] = Field(
+        sa_column=Column(Geometry("POINT", srid=4326, spatial_index=False))
+    )
 
     model_config = {
         "arbitrary_types_allowed": True,
     }
 
 
+class GeometryResolution(str, Enum):
+    FULL = "full"
+    MEDIUM = "medium"
+    LOW = "low"
+
+
+class MatrixFormat(str, Enum):
+    JSON = "json"
+    BINARY = "binary"
+
+
+class IngestOperation(str, Enum):
+    CREATE = "create"
+    UPDATE = "update"
+
+
+class IngestJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class IngestJobModel(BaseModel, table=True):
+    __tablename__ = "ingest_job"
+
+    customer_id: str = Field(foreign_key="customer.id", index=True)
+    created_by: str = Field(foreign_key="user.id")
+    operation: IngestOperation
+    status: IngestJobStatus = Field(default=IngestJobStatus.QUEUED, index=True)
+    name: str
+    version: float
+    spool_path: str
+    features_parsed: int = Field(default=0)
+    features_inserted: int = Field(default=0)
+    error: Optional[str] = Field(default=None, nullable=True)
+    network_id: Optional[str] = Field(default=None, foreign_key="roadnetwork.id", nullable=True)
+    created_at: datetime = Field(default_factory=time_now)
+    updated_at: datetime = Field(default_factory=time_now)
+    started_at: Optional[datetime] = Field(default=None, nullable=True)
+    finished_at: Optional[datetime] = Field(default=None, nullable=True)
+
+    @property
+    def throughput(self) -> Optional[float]:
+        """
+        Returns the number of features inserted per second since the job started.
+        """
+        if not self.started_at:
+            return None
+
+        elapsed = ((self.finished_at or time_now()) - self.started_at).total_seconds()
+        return round(self.features_inserted / elapsed, 2) if elapsed > 0 else None
+
+
 # Note: This is not needed in the bottom of the file
 load_related_models()
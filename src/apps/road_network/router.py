@@ -4,6 +4,13 @@ from .api.create_road_network_api import create_road_network
 from .api.update_road_network_api import update_road_network
 from .api.get_road_network_edges_api import get_road_network_edges
 from .api.list_road_networks_api import list_road_networks
+from .api.get_ingest_job_api import get_ingest_job
+from .api.get_road_network_tile_api import get_road_network_tile
+from .api.get_road_network_diff_api import get_road_network_diff
+from .api.get_road_network_route_api import get_road_network_route
+from .api.create_travel_matrix_api import create_travel_matrix
+from .api.snap_points_api import snap_points
+from .api.match_trace_api import match_trace
 
 # Creating APIRouter instance and setting prefix, tags
 router = APIRouter(prefix="/road-network", tags=["Road Network"])
@@ -16,4 +23,18 @@ router.add_api_route(path="", endpoint=update_road_network, methods=["PUT"])
 
 router.add_api_route(path="", endpoint=list_road_networks, methods=["GET"])
 
-router.add_api_route(path="/edges", endpoint=get_road_network_edges, methods=["GET"])
\ No newline at end of file
+router.add_api_route(path="/edges", endpoint=get_road_network_edges, methods=["GET"])
+
+router.add_api_route(path="/diff", endpoint=get_road_network_diff, methods=["GET"])
+
+router.add_api_route(path="/route", endpoint=get_road_network_route, methods=["GET"])
+
+router.add_api_route(path="/matrix", endpoint=create_travel_matrix, methods=["POST"])
+
+router.add_api_route(path="/snap", endpoint=snap_points, methods=["POST"])
+
+router.add_api_route(path="/match", endpoint=match_trace, methods=["POST"])
+
+router.add_api_route(path="/tiles/{z}/{x}/{y}.mvt", endpoint=get_road_network_tile, methods=["GET"])
+
+router.add_api_route(path="/jobs/{job_id}", endpoint=get_ingest_job, methods=["GET"])
\ No newline at end of file
@@ -0,0 +1,50 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+from src.settings import app_settings
+from .models import MatrixFormat
+
+
+def _validate_positions(positions: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    for lon, lat in positions:
+        if not (-180 <= lon <= 180 and -90 <= lat <= 90):
+            raise ValueError("Positions must be valid `[lon, lat]` pairs")
+    return positions
+
+
+class TravelMatrixSchema(BaseModel):
+    name: str
+    version: Optional[float] = None
+    # `[lon, lat]` positions
+    origins: list[tuple[float, float]] = Field(..., min_length=1, max_length=app_settings.MATRIX_MAX_LOCATIONS)
+    destinations: list[tuple[float, float]] = Field(..., min_length=1, max_length=app_settings.MATRIX_MAX_LOCATIONS)
+    format: MatrixFormat = MatrixFormat.JSON
+    stream: bool = False
+
+    @field_validator("origins", "destinations")
+    def validate_positions(cls, value: list[tuple[float, float]]) -> list[tuple[float, float]]:
+        return _validate_positions(value)
+
+
+class SnapPointsSchema(BaseModel):
+    name: str
+    version: Optional[float] = None
+    points: list[tuple[float, float]] = Field(..., min_length=1, max_length=app_settings.SNAP_MAX_POINTS)
+    max_distance: float = Field(app_settings.SNAP_MAX_DISTANCE, gt=0)
+
+    @field_validator("points")
+    def validate_positions(cls, value: list[tuple[float, float]]) -> list[tuple[float, float]]:
+        return _validate_positions(value)
+
+
+class MatchTraceSchema(BaseModel):
+    name: str
+    version: Optional[float] = None
+    # Trace positions in the order they were recorded
+    points: list[tuple[float, float]] = Field(..., min_length=1, max_length=app_settings.MATCH_MAX_POINTS)
+    search_radius: float = Field(app_settings.MATCH_SEARCH_RADIUS, gt=0)
+
+    @field_validator("points")
+    def validate_positions(cls, value: list[tuple[float, float]]) -> list[tuple[float, float]]:
+        return _validate_positions(value)
@@ -0,0 +1,382 @@
+import asyncio
+import math
+from typing import Any, Optional
+
+import numpy as np
+import shapely
+from fastapi.concurrency import run_in_threadpool
+
+from src.settings import app_settings
+from .cache import edge_index_cache
+from .graph import RoadGraph, get_road_graph, haversine_distance
+from .models import RoadNetworkModel
+
+# Meters per degree of latitude, & of longitude once scaled by `EdgeIndex.lon_scale`
+_METERS_PER_DEGREE = 111_320
+
+# Rough memory held by GEOS per segment box & tree node, on top of the segment arrays
+_SEGMENT_OVERHEAD = 250
+
+# Fractions of the maximum distance points are snapped within, searched in turn
+_SNAP_RADIUS_STEPS = (1 / 8, 1)
+
+
+def _unmatched(point_count: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # Result of `EdgeIndex.snap` & `EdgeIndex.match` with no point snapped
+    return (
+        np.full(point_count, -1, dtype=np.int64),
+        np.full(point_count, np.nan),
+        np.full(point_count, np.nan),
+        np.full((point_count, 2), np.nan),
+    )
+
+
+class EdgeIndex:
+    """
+    STRtree over the segments of the edges of a road network version, for snapping points to edges.
+
+    The tree only holds the bounding boxes of the segments: candidates are found with envelope
+    queries & the exact point to segment distances are computed in bulk with NumPy, which is much
+    faster than GEOS nearest neighbour queries. Longitudes are scaled by the cosine of the
+    network's mean latitude, so planar distances in the index are close to proportional to meters.
+    """
+
+    def __init__(self, graph: RoadGraph) -> None:
+        self.edge_ids = graph.edge_ids
+        self.edge_nodes = graph.edge_nodes
+        self.edge_lengths = graph.edge_lengths
+        mean_lat = float(np.mean(graph.node_lats)) if len(graph.node_lats) else 0.0
+        self.lon_scale = math.cos(math.radians(mean_lat))
+
+        # Segment i runs from coordinate i to coordinate i + 1, except across edges
+        coordinates = graph.edge_coordinates * (self.lon_scale, 1.0)
+        starts = np.ones(len(coordinates), dtype=bool)
+        starts[graph.edge_offsets[1:] - 1] = False
+        segment_starts = np.flatnonzero(starts)
+        self.segment_a = coordinates[segment_starts]
+        self.segment_b = coordinates[segment_starts + 1]
+        self.segment_edges = np.repeat(
+            np.arange(len(graph.edge_ids)), np.diff(graph.edge_offsets) - 1
+        )
+
+        # Planar length of every segment & of the edge before it, for positions along the edges
+        self.segment_lengths = np.hypot(*(self.segment_b - self.segment_a).T)
+        edge_planar_lengths = np.bincount(
+            self.segment_edges, weights=self.segment_lengths, minlength=len(graph.edge_ids)
+        )
+        cumulative = np.cumsum(self.segment_lengths) - self.segment_lengths
+        edge_starts = np.cumsum(edge_planar_lengths) - edge_planar_lengths
+        self.segment_offsets = cumulative - edge_starts[self.segment_edges]
+        self.edge_planar_lengths = edge_planar_lengths
+
+        self.tree = shapely.STRtree(
+            shapely.box(
+                np.minimum(self.segment_a[:, 0], self.segment_b[:, 0]),
+                np.minimum(self.segment_a[:, 1], self.segment_b[:, 1]),
+                np.maximum(self.segment_a[:, 0], self.segment_b[:, 0]),
+                np.maximum(self.segment_a[:, 1], self.segment_b[:, 1]),
+            )
+        )
+        self.nbytes = len(segment_starts) * (7 * 8 + _SEGMENT_OVERHEAD)
+
+    def _candidates(
+        self, lons: np.ndarray, lats: np.ndarray, radius: float
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # Every (point, segment) pair within `radius` meters, ordered by point
+        reach = radius / _METERS_PER_DEGREE
+        xs = lons * self.lon_scale
+        point_indices, segments = self.tree.query(
+            shapely.box(xs - reach, lats - reach, xs + reach, lats + reach)
+        )
+
+        points = np.stack((xs[point_indices], lats[point_indices]), axis=1)
+        a, b = self.segment_a[segments], self.segment_b[segments]
+        ab = b - a
+        squared_lengths = np.einsum("ij,ij->i", ab, ab)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.einsum("ij,ij->i", points - a, ab) / squared_lengths
+        t = np.clip(np.nan_to_num(t), 0.0, 1.0)
+        closest = a + t[:, None] * ab
+        planar_distances = np.hypot(*(points - closest).T)
+
+        within = planar_distances <= reach
+        point_indices, segments = point_indices[within], segments[within]
+        t, closest, planar_distances = t[within], closest[within], planar_distances[within]
+
+        edges = self.segment_edges[segments]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            positions = (
+                self.segment_offsets[segments] + t * self.segment_lengths[segments]
+            ) / self.edge_planar_lengths[edges]
+        positions = np.nan_to_num(positions)
+
+        closest[:, 0] /= self.lon_scale
+        return point_indices, edges, planar_distances, positions, closest
+
+    def snap(
+        self, lons: Any, lats: Any, max_distance: float = app_settings.SNAP_MAX_DISTANCE
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Snaps points to their nearest edge with vectorized tree queries & distance computations.
+
+        Args:
+            lons (Any): Longitudes of the points.
+            lats (Any): Latitudes of the points.
+            max_distance (float): Points farther than this many meters from every edge are not snapped.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Per point the index of its edge
+            (-1 if not snapped), the distance in meters, the position along the edge as a fraction
+            of its length & the snapped `[lon, lat]`; NaN for points that are not snapped.
+        """
+        lons, lats = np.asarray(lons, dtype=np.float64), np.asarray(lats, dtype=np.float64)
+        snapped_edges, distances, snapped_positions, snapped = _unmatched(len(lons))
+
+        # The pairs to check grow with the square of the radius, while most points are close to an
+        # edge: a small radius is searched first & widened only for the points left without a
+        # candidate. A candidate within a radius proves the closest edge is within it too.
+        remaining = np.arange(len(lons))
+        for step in _SNAP_RADIUS_STEPS:
+            point_indices, edges, planar_distances, positions, closest = self._candidates(
+                lons[remaining], lats[remaining], max_distance * step
+            )
+
+            if len(point_indices):
+                # The query returns the pairs grouped by point, so the closest pair of every point
+                # is found with a grouped minimum instead of a sort
+                group_starts = np.flatnonzero(np.r_[True, point_indices[1:] != point_indices[:-1]])
+                group_minimums = np.minimum.reduceat(planar_distances, group_starts)
+                group_sizes = np.diff(np.r_[group_starts, len(point_indices)])
+                closest_pairs = np.flatnonzero(planar_distances == np.repeat(group_minimums, group_sizes))
+                # Keep one pair per point where several segments are equally close
+                closest_points = point_indices[closest_pairs]
+                closest_pairs = closest_pairs[np.r_[True, closest_points[1:] != closest_points[:-1]]]
+
+                points = remaining[point_indices[closest_pairs]]
+                snapped_edges[points] = edges[closest_pairs]
+                snapped_positions[points] = positions[closest_pairs]
+                snapped[points] = closest[closest_pairs]
+
+            remaining = remaining[snapped_edges[remaining] < 0]
+            if not len(remaining):
+                break
+
+        points = np.flatnonzero(snapped_edges >= 0)
+        distances[points] = haversine_distance(
+            snapped[points, 0], snapped[points, 1], lons[points], lats[points]
+        )
+
+        return snapped_edges, distances, snapped_positions, snapped
+
+    def match(
+        self,
+        lons: Any,
+        lats: Any,
+        search_radius: float = app_settings.MATCH_SEARCH_RADIUS,
+        max_candidates: int = app_settings.MATCH_MAX_CANDIDATES,
+        gps_sigma: float = app_settings.MATCH_GPS_SIGMA,
+        transition_beta: float = app_settings.MATCH_TRANSITION_BETA,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Matches a GPS trace to the edges it most likely followed, with a hidden Markov model solved
+        by Viterbi.
+
+        The candidates of every point are its `max_candidates` closest edges within `search_radius`,
+        scored by their distance to the point. Moving between the candidates of consecutive points
+        is scored by how much the distance travelled along the edges differs from the great-circle
+        distance between the points; travel is followed along the same edge or onto an edge sharing
+        a node, so traces must be sampled densely enough for consecutive points to be on the same
+        or adjacent edges. Where no candidate can be reached, the match restarts from that point.
+
+        Args:
+            lons (Any): Longitudes of the trace points, in order.
+            lats (Any): Latitudes of the trace points, in order.
+            search_radius (float): Radius in meters candidates are searched in.
+            max_candidates (int): Maximum number of candidate edges per point.
+            gps_sigma (float): Standard deviation in meters of the GPS positions.
+            transition_beta (float): Scale in meters of the accepted detour between two points.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Same as `snap`; points without
+            candidates are not matched.
+        """
+        lons, lats = np.asarray(lons, dtype=np.float64), np.asarray(lats, dtype=np.float64)
+        point_count = len(lons)
+
+        # Closest segment of every (point, edge) pair within the radius, closest edge first per point
+        point_indices, candidate_edges, planar_distances, positions, snapped = self._candidates(
+            lons, lats, search_radius
+        )
+
+        if not len(point_indices):
+            return _unmatched(point_count)
+
+        order = np.lexsort((planar_distances, candidate_edges, point_indices))
+        is_first = np.r_[True, (np.diff(point_indices[order]) != 0) | (np.diff(candidate_edges[order]) != 0)]
+        order = order[is_first]
+        order = order[np.lexsort((planar_distances[order], point_indices[order]))]
+        point_indices, candidate_edges = point_indices[order], candidate_edges[order]
+        positions, snapped = positions[order], snapped[order]
+        distances = haversine_distance(
+            snapped[:, 0], snapped[:, 1], lons[point_indices], lats[point_indices]
+        )
+
+        starts = np.searchsorted(point_indices, np.arange(point_count + 1))
+        candidates = [
+            np.arange(starts[point], min(starts[point + 1], starts[point] + max_candidates))
+            for point in range(point_count)
+        ]
+
+        scores: list[Optional[np.ndarray]] = [None] * point_count
+        back_pointers: list[Optional[np.ndarray]] = [None] * point_count
+        previous_point = None
+
+        for point in range(point_count):
+            current = candidates[point]
+            if not len(current):
+                previous_point = None
+                continue
+
+            emission = 0.5 * (distances[current] / gps_sigma) ** 2
+
+            if previous_point is not None:
+                previous = candidates[previous_point]
+                travelled = self._travelled_distances(
+                    candidate_edges[previous], positions[previous],
+                    candidate_edges[current], positions[current],
+                )
+                straight = haversine_distance(
+                    lons[previous_point], lats[previous_point], lons[point], lats[point]
+                )
+                transition = np.abs(travelled - straight) / transition_beta
+                totals = scores[previous_point][:, None] + transition
+
+                if np.isfinite(totals).any():
+                    back_pointers[point] = np.argmin(totals, axis=0)
+                    scores[point] = totals[back_pointers[point], np.arange(len(current))] + emission
+                    previous_point = point
+                    continue
+
+            # Start of the trace, or no candidate reachable from the previous point
+            scores[point] = emission
+            previous_point = point
+
+        edges, matched_distances, matched_positions, matched_snapped = _unmatched(point_count)
+
+        best = None
+        for point in range(point_count - 1, -1, -1):
+            if scores[point] is None:
+                best = None
+                continue
+
+            if best is None:
+                best = int(np.argmin(scores[point]))
+
+            candidate = candidates[point][best]
+            edges[point] = candidate_edges[candidate]
+            matched_distances[point] = distances[candidate]
+            matched_positions[point] = positions[candidate]
+            matched_snapped[point] = snapped[candidate]
+
+            best = int(back_pointers[point][best]) if back_pointers[point] is not None else None
+
+        return edges, matched_distances, matched_positions, matched_snapped
+
+    def _travelled_distances(
+        self,
+        from_edges: np.ndarray,
+        from_positions: np.ndarray,
+        to_edges: np.ndarray,
+        to_positions: np.ndarray,
+    ) -> np.ndarray:
+        # Distance along the edges between every pair of candidates, inf if they are not adjacent
+        from_edges, from_positions = from_edges[:, None], from_positions[:, None]
+        to_edges, to_positions = to_edges[None, :], to_positions[None, :]
+        from_lengths, to_lengths = self.edge_lengths[from_edges], self.edge_lengths[to_edges]
+
+        travelled = np.where(
+            from_edges == to_edges, np.abs(to_positions - from_positions) * from_lengths, np.inf
+        )
+
+        for from_end, from_offset in ((0, from_positions), (1, 1 - from_positions)):
+            for to_end, to_offset in ((0, to_positions), (1, 1 - to_positions)):
+                shared = self.edge_nodes[from_edges, from_end] == self.edge_nodes[to_edges, to_end]
+                via_node = from_offset * from_lengths + to_offset * to_lengths
+                travelled = np.where(
+                    shared & (from_edges != to_edges), np.minimum(travelled, via_node), travelled
+                )
+
+        return travelled
+
+
+def snapped_points_data(
+    edge_index: EdgeIndex,
+    edges: np.ndarray,
+    distances: np.ndarray,
+    positions: np.ndarray,
+    snapped: np.ndarray,
+) -> dict[str, list]:
+    """
+    Converts the result of `EdgeIndex.snap` or `EdgeIndex.match` into JSON columns.
+
+    Returns:
+        dict[str, list]: `edge_ids`, `distances` (meters), `positions` (fractions of the edge
+                         lengths) & `coordinates`, with None for points that are not snapped.
+    """
+    is_snapped = edges >= 0
+    edge_ids = np.where(is_snapped, edge_index.edge_ids[np.maximum(edges, 0)], b"")
+
+    return {
+        "edge_ids": [edge_id.decode() if edge_id else None for edge_id in edge_ids.tolist()],
+        "distances": [
+            distance if snapped_point else None
+            for distance, snapped_point in zip(np.round(distances, 2).tolist(), is_snapped.tolist())
+        ],
+        "positions": [
+            position if snapped_point else None
+            for position, snapped_point in zip(np.round(positions, 6).tolist(), is_snapped.tolist())
+        ],
+        "coordinates": [
+            coordinates if snapped_point else None
+            for coordinates, snapped_point in zip(snapped.tolist(), is_snapped.tolist())
+        ],
+    }
+
+
+_pending_indexes: dict[str, asyncio.Task] = {}
+
+
+async def _load_edge_index(road_network: RoadNetworkModel) -> EdgeIndex:
+    graph = await get_road_graph(road_network)
+    return await run_in_threadpool(EdgeIndex, graph)
+
+
+async def get_edge_index(road_network: RoadNetworkModel) -> EdgeIndex:
+    """
+    Returns the edge index of a road network version from `edge_index_cache`, building it from the
+    version's graph if it is not cached. Concurrent requests for the same version share a single build.
+
+    Args:
+        road_network (RoadNetworkModel): The road network version.
+
+    Returns:
+        EdgeIndex: The edge index of the network version.
+    """
+    edge_index = edge_index_cache.get(road_network.id)
+
+    if edge_index is not None:
+        return edge_index
+
+    task = _pending_indexes.get(road_network.id)
+    if task is None:
+        task = asyncio.ensure_future(_load_edge_index(road_network))
+        _pending_indexes[road_network.id] = task
+
+        def on_built(task: asyncio.Task) -> None:
+            _pending_indexes.pop(road_network.id, None)
+            if not task.cancelled() and task.exception() is None:
+                edge_index_cache.set(road_network.id, task.result())
+
+        task.add_done_callback(on_built)
+
+    return await asyncio.shield(task)
@@ -0,0 +1,1616 @@
+import asyncio
+import codecs
+import hashlib
+import json
+import math
+import os
+import re
+import shutil
+from collections.abc import AsyncIterator, Awaitable, Callable
+from concurrent.futures import Executor
+from enum import Enum
+from typing import Any, Optional
+
+import numpy as np
+import shapely
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import (
+    ARRAY, JSON, BigInteger, Float, Text, and_, case, cast, exists, func, literal, literal_column, not_,
+    null, or_, union_all
+)
+from sqlalchemy.dialects.postgresql import JSONPATH, insert as pg_insert
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlmodel import select
+
+from src.database import GEOMETRY_CODEC_REGISTERED, async_session, set_geometry_codec
+from src.settings import app_settings
+from .models import EdgeModel, GeometryResolution, NodeModel, RoadNetworkModel
+
+
+_JSON_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+# Characters `_ValueScanner` stops at: structure outside strings, the end or an escape inside
+_STRUCTURE = re.compile(r'[][{}"]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_SCALAR_END = re.compile(r"[\s,:\]}]")
+# Rest of a token cut off at the end of the text, e.g. `tru` or `-`
+_TOKEN_TAIL = re.compile(r'[^\s,:\[\]{}"]*')
+
+# Typed edge columns properties are promoted into at ingest, with the type a value must have
+PROMOTED_PROPERTY_COLUMNS = {"highway": str, "lanes": int, "oneway": bool, "length": float}
+
+# Columns written by the bulk edge loader, in record order
+VERSION_COPY_COLUMNS = ("network_id", "root_network_id", "valid_from_version")
+EDGE_COPY_COLUMNS = (
+    *VERSION_COPY_COLUMNS, "properties", "geometry", "geometry_medium", "geometry_low",
+    *PROMOTED_PROPERTY_COLUMNS, "source_node", "target_node", "content_hash"
+)
+
+# Precomputed simplified resolutions, in the order of their columns in `EDGE_COPY_COLUMNS`
+SIMPLIFIED_RESOLUTIONS = (GeometryResolution.MEDIUM, GeometryResolution.LOW)
+
+
+class GeoJSONParseError(ValueError):
+    """
+    Raised when an uploaded file is not a well-formed GeoJSON FeatureCollection.
+    """
+
+
+class InvalidGeometryError(GeoJSONParseError):
+    """
+    Raised when features of an uploaded file do not hold a valid LineString geometry.
+
+    Attributes:
+        indices (list[int]): Positions of the offending features in the `features` array.
+    """
+
+    def __init__(self, indices: list[int], max_reported: int = 20) -> None:
+        self.indices = indices
+        self.max_reported = max_reported
+
+        reported = ", ".join(str(index) for index in indices[:max_reported])
+        if len(indices) > max_reported:
+            reported += f", ... ({len(indices)} in total)"
+
+        super().__init__(f"Invalid LineString geometry in features at index: {reported}")
+
+    def __reduce__(self) -> tuple:
+        # Keeps the indices when the error is raised in a process pool worker
+        return self.__class__, (self.indices, self.max_reported)
+
+
+class EdgeFilterError(ValueError):
+    """
+    Raised when a filter parameter of an edge request cannot be parsed.
+    """
+
+
+class _ParserState(Enum):
+    START = "start"
+    MEMBER_FIRST = "member_first"
+    KEY = "key"
+    COLON = "colon"
+    VALUE = "value"
+    MEMBER_SEP = "member_sep"
+    FEATURES_START = "features_start"
+    FEATURE_FIRST = "feature_first"
+    FEATURE = "feature"
+    FEATURE_SEP = "feature_sep"
+    DONE = "done"
+
+
+class _ValueScanner:
+    """
+    Finds the end of a JSON value read in pieces by tracking its string & bracket nesting, jumping
+    between structural characters with regular expressions, so a value spanning many pieces is
+    scanned once & decoded only when it is complete. Mismatched brackets are reported right away.
+    """
+
+    def __init__(self, first_char: str) -> None:
+        self.is_scalar = first_char not in '"{['
+        self._closers: list[str] = []
+        self._in_string = False
+        self._escaped = False
+
+    def scan(self, text: str, position: int = 0) -> Optional[int]:
+        """
+        Scans the next piece of the value.
+
+        Returns:
+            Optional[int]: The position in `text` just after the value, or None if it continues
+                           past the end of `text`.
+
+        Raises:
+            GeoJSONParseError: If a closing bracket does not match the open one.
+        """
+        if self.is_scalar:
+            # Numbers & literals end at the first delimiter
+            match = _SCALAR_END.search(text, position)
+            return match.start() if match else None
+
+        while True:
+            if self._escaped:
+                if position >= len(text):
+                    return None
+                position += 1
+                self._escaped = False
+
+            if self._in_string:
+                match = _STRING_SPECIAL.search(text, position)
+                if not match:
+                    return None
+                position = match.end()
+
+                if match.group() == "\\":
+                    self._escaped = True
+                    continue
+
+                self._in_string = False
+                if not self._closers:
+                    return position
+                continue
+
+            match = _STRUCTURE.search(text, position)
+            if not match:
+                return None
+            char, position = match.group(), match.end()
+
+            if char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._closers.append("}")
+            elif char == "[":
+                self._closers.append("]")
+            else:
+                expected = self._closers.pop()
+                if char != expected:
+                    raise GeoJSONParseError(f"Invalid GeoJSON: expected `{expected}` but found `{char}`")
+                if not self._closers:
+                    return position
+
+
+class FeatureCollectionParser:
+    """
+    Incremental parser for a GeoJSON FeatureCollection.
+
+    Text is pushed in with `feed` as it arrives and every complete member of the top-level
+    `features` array is returned as soon as it has been read. Only the feature currently being
+    read is kept in memory, so memory use does not depend on the size of the document.
+
+    Values complete within a piece of text are decoded directly. A value continuing past the end
+    of a piece is collected by a `_ValueScanner` & decoded once it is complete, so large features
+    are not decoded again for every piece. Invalid JSON is rejected as soon as it is read.
+    """
+
+    def __init__(self, max_feature_size: int = app_settings.GEOJSON_MAX_FEATURE_SIZE) -> None:
+        self._state = _ParserState.START
+        self._key = None
+        self._max_feature_size = max_feature_size
+        # Pieces & scanner of a value continuing past the end of the text fed so far
+        self._pending: list[str] = []
+        self._pending_size = 0
+        self._scanner: Optional[_ValueScanner] = None
+
+    def feed(self, text: str, final: bool = False) -> list[dict]:
+        """
+        Adds text to the parser and returns the features completed by it.
+
+        Args:
+            text (str): The next piece of the document.
+            final (bool): True if this is the last piece of the document.
+
+        Returns:
+            list[dict]: The features that were completed by this piece of text.
+
+        Raises:
+            GeoJSONParseError: If the document is not a valid FeatureCollection.
+        """
+        position = 0
+        features = []
+
+        if self._scanner:
+            position = self._scanner.scan(text)
+
+            if position is None:
+                if not (final and self._scanner.is_scalar):
+                    self._add_pending(text)
+                    if final:
+                        raise GeoJSONParseError("Invalid GeoJSON: unexpected end of file")
+                    return features
+                position = len(text)
+
+            value_text = "".join(self._pending) + text[:position]
+            self._pending, self._pending_size, self._scanner = [], 0, None
+            self._on_value(self._decode_complete(value_text), features)
+
+        while True:
+            while position < len(text) and text[position] in _WHITESPACE:
+                position += 1
+
+            if position >= len(text):
+                break
+
+            char = text[position]
+            state = self._state
+
+            if state == _ParserState.START:
+                self._expect(char, "{")
+                self._state = _ParserState.MEMBER_FIRST
+                position += 1
+
+            elif state == _ParserState.MEMBER_FIRST and char == "}":
+                self._state = _ParserState.DONE
+                position += 1
+
+            elif state == _ParserState.FEATURE_FIRST and char == "]":
+                self._state = _ParserState.MEMBER_SEP
+                position += 1
+
+            elif state in (
+                _ParserState.MEMBER_FIRST, _ParserState.KEY, _ParserState.VALUE,
+                _ParserState.FEATURE_FIRST, _ParserState.FEATURE,
+            ):
+                decoded = self._decode(text, position, final)
+                if decoded is None:
+                    # The value continues in the next piece of text
+                    self._scanner = _ValueScanner(char)
+                    self._scanner.scan(text, position)
+                    self._add_pending(text[position:])
+                    position = len(text)
+                    break
+                value, position = decoded
+                self._on_value(value, features)
+
+            elif state == _ParserState.COLON:
+                self._expect(char, ":")
+                position += 1
+                if self._key == "features":
+                    self._state = _ParserState.FEATURES_START
+                else:
+                    self._state = _ParserState.VALUE
+
+            elif state == _ParserState.MEMBER_SEP:
+                if char == ",":
+                    self._state = _ParserState.KEY
+                else:
+                    self._expect(char, "}")
+                    self._state = _ParserState.DONE
+                position += 1
+
+            elif state == _ParserState.FEATURES_START:
+                self._expect(char, "[")
+                self._state = _ParserState.FEATURE_FIRST
+                position += 1
+
+            elif state == _ParserState.FEATURE_SEP:
+                if char == ",":
+                    self._state = _ParserState.FEATURE
+                else:
+                    self._expect(char, "]")
+                    self._state = _ParserState.MEMBER_SEP
+                position += 1
+
+            else:
+                raise GeoJSONParseError("Invalid GeoJSON: unexpected content after the end of the document")
+
+        if final and (self._scanner or self._state != _ParserState.DONE):
+            raise GeoJSONParseError("Invalid GeoJSON: unexpected end of file")
+
+        return features
+
+    def _on_value(self, value: Any, features: list[dict]) -> None:
+        state = self._state
+
+        if state in (_ParserState.MEMBER_FIRST, _ParserState.KEY):
+            if not isinstance(value, str):
+                raise GeoJSONParseError("Invalid GeoJSON: object keys must be strings")
+            self._key = value
+            self._state = _ParserState.COLON
+
+        elif state == _ParserState.VALUE:
+            # Members other than `features` (type, name, crs, ...) are skipped
+            self._state = _ParserState.MEMBER_SEP
+
+        else:
+            if not isinstance(value, dict):
+                raise GeoJSONParseError("Invalid GeoJSON: every feature must be an object")
+            features.append(value)
+            self._state = _ParserState.FEATURE_SEP
+
+    def _add_pending(self, text: str) -> None:
+        self._pending.append(text)
+        self._pending_size += len(text)
+
+        if self._pending_size > self._max_feature_size:
+            raise GeoJSONParseError("Invalid GeoJSON: feature exceeds the maximum allowed size")
+
+    @staticmethod
+    def _expect(char: str, expected: str) -> None:
+        if char != expected:
+            raise GeoJSONParseError(f"Invalid GeoJSON: expected `{expected}` but found `{char}`")
+
+    @staticmethod
+    def _decode(text: str, position: int, final: bool) -> tuple[Any, int] | None:
+        """
+        Decodes one JSON value starting at `position`.
+
+        Returns None when the value continues past the end of the text, so that the caller waits
+        for more text. A number or literal ending exactly at the end of the text is not trusted
+        either, since `12` could still be the start of `123`.
+        """
+        try:
+            value, end = _JSON_DECODER.raw_decode(text, position)
+        except json.JSONDecodeError as e:
+            # Only an error in a token running up to the end of the text can be cut off input
+            is_truncated = (
+                e.msg.startswith("Unterminated string") or _TOKEN_TAIL.fullmatch(text, e.pos) is not None
+            )
+            if final or not is_truncated:
+                raise GeoJSONParseError(f"Invalid GeoJSON: {e.msg}") from e
+            return None
+
+        if end == len(text) and not final and text[position] not in '"{[':
+            return None
+
+        return value, end
+
+    @staticmethod
+    def _decode_complete(text: str) -> Any:
+        try:
+            return _JSON_DECODER.decode(text)
+        except json.JSONDecodeError as e:
+            raise GeoJSONParseError(f"Invalid GeoJSON: {e.msg}") from e
+
+
+async def iter_geojson_features(
+    file: UploadFile, chunk_size: int = app_settings.GEOJSON_READ_CHUNK_SIZE
+) -> AsyncIterator[dict]:
+    """
+    Reads an uploaded GeoJSON FeatureCollection in chunks & yields its features one at a time.
+
+    Args:
+        file (UploadFile): The uploaded .geojson file.
+        chunk_size (int): Number of bytes read from the file at a time.
+
+    Yields:
+        dict: The next feature of the collection.
+
+    Raises:
+        GeoJSONParseError: If the file is not a valid FeatureCollection.
+    """
+    parser = FeatureCollectionParser()
+    text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+
+    try:
+        while chunk := await file.read(chunk_size):
+            for feature in parser.feed(text_decoder.decode(chunk)):
+                yield feature
+
+        for feature in parser.feed(text_decoder.decode(b"", final=True), final=True):
+            yield feature
+    except UnicodeDecodeError as e:
+        raise GeoJSONParseError("Invalid GeoJSON: file is not UTF-8 encoded") from e
+
+
+async def spool_upload(file: UploadFile, path: str) -> None:
+    """
+    Copies an uploaded file to local disk in chunks, without loading it into memory.
+
+    Args:
+        file (UploadFile): The uploaded file.
+        path (str): Destination path of the copy.
+    """
+    def _copy() -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        file.file.seek(0)
+
+        with open(path, "wb") as spool_file:
+            shutil.copyfileobj(file.file, spool_file, app_settings.GEOJSON_READ_CHUNK_SIZE)
+
+    await run_in_threadpool(_copy)
+
+
+async def get_latest_road_network(
+    session: AsyncSession, customer_id: str, name: str
+) -> Optional[RoadNetworkModel]:
+    """
+    Fetches the latest version of a customer's road network.
+
+    Args:
+        session (AsyncSession): The database session.
+        customer_id (str): ID of the customer owning the network.
+        name (str): Name of the road network.
+
+    Returns:
+        Optional[RoadNetworkModel]: The latest version of the network, or None if it does not exist.
+    """
+    latest_network_query = (
+        select(RoadNetworkModel)
+        .where(RoadNetworkModel.name == name)
+        .where(RoadNetworkModel.customer_id == customer_id)
+        .order_by(RoadNetworkModel.version.desc())
+        .limit(1)
+    )
+    latest_network_result = await session.execute(latest_network_query)
+    return latest_network_result.scalars().first()
+
+
+def get_snap_tolerance(road_network: RoadNetworkModel) -> float:
+    """
+    Returns the grid size the node keys of a road network version are made with.
+
+    Args:
+        road_network (RoadNetworkModel): The road network version.
+
+    Returns:
+        float: The stored tolerance of the lineage, else the `GRAPH_SNAP_TOLERANCE` setting.
+    """
+    if road_network.snap_tolerance is None:
+        return app_settings.GRAPH_SNAP_TOLERANCE
+
+    return road_network.snap_tolerance
+
+
+async def iter_batches(items: AsyncIterator[Any], batch_size: int) -> AsyncIterator[list[Any]]:
+    """
+    Groups the items of an async iterator into lists of at most `batch_size` items.
+
+    Args:
+        items (AsyncIterator[Any]): The items to group.
+        batch_size (int): The maximum number of items in a batch.
+
+    Yields:
+        list[Any]: The next batch of items.
+    """
+    batch = []
+
+    async for item in items:
+        batch.append(item)
+
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def _linestring_coordinates(geometry: Any) -> np.ndarray | None:
+    """
+    Returns the (n, 2) coordinate array of a GeoJSON LineString, or None if it is not a valid one.
+    Any Z values are dropped, since edges are stored as 2D geometries.
+    """
+    if not isinstance(geometry, dict) or geometry.get("type") != "LineString":
+        return None
+
+    try:
+        coordinates = np.asarray(geometry.get("coordinates"), dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+
+    if coordinates.ndim != 2 or coordinates.shape[0] < 2 or coordinates.shape[1] not in (2, 3):
+        return None
+
+    if not np.isfinite(coordinates).all():
+        return None
+
+    return coordinates[:, :2]
+
+
+def endpoint_grid_keys(
+    lons: np.ndarray, lats: np.ndarray, tolerance: float = app_settings.GRAPH_SNAP_TOLERANCE
+) -> np.ndarray:
+    """
+    Returns the keys of the snapping grid cells holding points, so endpoints within `tolerance` of
+    each other get the same key by array arithmetic instead of pairwise comparisons.
+
+    The key packs the column of the cell into the high & its row into the low 31 bits of an int64,
+    which fits any tolerance of at least 1e-7 degrees.
+
+    Args:
+        lons (np.ndarray): Longitudes of the points.
+        lats (np.ndarray): Latitudes of the points.
+        tolerance (float): Size of the grid cells, in degrees.
+
+    Returns:
+        np.ndarray: The int64 keys of the points.
+    """
+    columns = np.round((np.asarray(lons, dtype=np.float64) + 180) / tolerance).astype(np.int64)
+    rows = np.round((np.asarray(lats, dtype=np.float64) + 90) / tolerance).astype(np.int64)
+    return (columns << 31) | rows
+
+
+def grid_key_coordinates(
+    keys: np.ndarray, tolerance: float = app_settings.GRAPH_SNAP_TOLERANCE
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the centers of the snapping grid cells of keys made by `endpoint_grid_keys`.
+
+    Args:
+        keys (np.ndarray): The int64 keys.
+        tolerance (float): Size of the grid cells, in degrees.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The longitudes & latitudes of the cells.
+    """
+    keys = np.asarray(keys, dtype=np.int64)
+    return (keys >> 31) * tolerance - 180, (keys & 0x7FFFFFFF) * tolerance - 90
+
+
+def geometries_to_ewkb(
+    geometries: list[Any],
+    start_index: int = 0,
+    tolerances: tuple[float, ...] = (),
+    snap_tolerance: float = app_settings.GRAPH_SNAP_TOLERANCE,
+) -> tuple[list[list[bytes]], np.ndarray]:
+    """
+    Converts a chunk of GeoJSON LineString geometries to EWKB (SRID 4326) in one vectorized pass,
+    along with simplified copies of them & the grid keys of their endpoints.
+
+    All coordinates of the chunk are gathered into a single array, turned into LineStrings with
+    `shapely.linestrings`, simplified with `shapely.simplify` & serialized together with
+    `shapely.to_wkb`. Only when the fast path rejects the chunk are the geometries checked one by
+    one to find the offending features.
+
+    Args:
+        geometries (list[Any]): The `geometry` members of a chunk of features.
+        start_index (int): Index of the first geometry in the whole `features` array, used for
+                           error reporting.
+        tolerances (tuple[float, ...]): Tolerances of the simplified copies, in degrees.
+        snap_tolerance (float): Grid size in degrees of the node keys, see `get_snap_tolerance`.
+
+    Returns:
+        tuple[list[list[bytes]], np.ndarray]: The EWKB encoded geometries in input order, followed
+                                              by the EWKB encoded simplified copies for each
+                                              tolerance, & the `(n, 2)` start & end node keys of
+                                              the geometries, see `endpoint_grid_keys`.
+
+    Raises:
+        InvalidGeometryError: If any geometry is not a valid LineString.
+    """
+    points = []
+    counts = []
+    invalid = []
+
+    for index, geometry in enumerate(geometries):
+        coordinates = geometry.get("coordinates") if isinstance(geometry, dict) else None
+
+        if (
+            not isinstance(geometry, dict) or geometry.get("type") != "LineString"
+            or not isinstance(coordinates, list) or len(coordinates) < 2
+        ):
+            invalid.append(start_index + index)
+            continue
+
+        points.extend(coordinates)
+        counts.append(len(coordinates))
+
+    if invalid:
+        raise InvalidGeometryError(invalid)
+
+    try:
+        coordinates = np.asarray(points, dtype=np.float64)
+    except (TypeError, ValueError):
+        coordinates = None
+
+    if (
+        coordinates is None or coordinates.ndim != 2 or coordinates.shape[1] not in (2, 3)
+        or not np.isfinite(coordinates).all()
+    ):
+        # Slow path: find the bad geometries, or stitch together chunks mixing 2D & 3D input
+        arrays = [_linestring_coordinates(geometry) for geometry in geometries]
+        invalid = [start_index + index for index, array in enumerate(arrays) if array is None]
+
+        if invalid:
+            raise InvalidGeometryError(invalid)
+
+        coordinates = np.concatenate(arrays)
+
+    indices = np.repeat(np.arange(len(counts)), counts)
+    lines = shapely.linestrings(coordinates[:, :2], indices=indices)
+
+    is_valid = shapely.is_valid(lines)
+    if not is_valid.all():
+        raise InvalidGeometryError((np.flatnonzero(~is_valid) + start_index).tolist())
+
+    resolutions = [lines]
+    for tolerance in tolerances:
+        # Topology preserving simplification never collapses a LineString below two points
+        resolutions.append(shapely.simplify(lines, tolerance, preserve_topology=True))
+
+    ends = np.cumsum(counts)
+    endpoints = coordinates[np.concatenate([ends - counts, ends - 1])]
+    endpoint_keys = endpoint_grid_keys(endpoints[:, 0], endpoints[:, 1], snap_tolerance).reshape(2, -1).T
+
+    return [
+        shapely.to_wkb(shapely.set_srid(resolution, 4326), include_srid=True).tolist()
+        for resolution in resolutions
+    ], endpoint_keys
+
+
+# A JSON number written as a string, e.g. OSM's "lanes": "2"
+_NUMERIC_STRING_PATTERN = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?")
+
+
+def _promoted_value(column_type: type, value: Any) -> Any:
+    # The value of the typed column for a property value, None if it has no value of that type
+    if column_type is bool:
+        return value if isinstance(value, bool) else None
+
+    if column_type is str:
+        return value if isinstance(value, str) and "\x00" not in value else None
+
+    if isinstance(value, str) and _NUMERIC_STRING_PATTERN.fullmatch(value):
+        value = float(value)
+
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+
+    if column_type is int:
+        return int(value) if -32768 <= value <= 32767 and value == int(value) else None
+
+    try:
+        value = float(value)
+    except OverflowError:
+        return None
+
+    return value if math.isfinite(value) else None
+
+
+def _reads_back_exactly(column_type: type, value: Any) -> bool:
+    # Whether PostgreSQL renders the typed column back to the same JSON value
+    if column_type is bool or column_type is str:
+        return True
+
+    if isinstance(value, str):
+        return False
+
+    if column_type is int:
+        return isinstance(value, int)
+
+    if isinstance(value, int):
+        return abs(value) < 10 ** 15
+
+    # `float8` output switches to exponent notation & drops a trailing `.0`
+    text = repr(value)
+    return "e" not in text and not text.endswith(".0") and abs(value) < 1e15
+
+
+def split_promoted_properties(properties: Any) -> tuple[Any, list[Any]]:
+    """
+    Moves the properties listed in `PROMOTED_EDGE_PROPERTIES` out of a feature's properties into
+    the values of their typed edge columns.
+
+    Numeric strings & integral floats are normalized into the numeric columns, e.g. `"lanes": "2"`
+    or `"length": 191.0`, so range filters find them through the column. A value whose column
+    does not read back to its original JSON spelling is kept in the JSONB blob as well, where
+    `edge_properties` takes it from, so the original properties are still rebuilt exactly.
+
+    Args:
+        properties (Any): The `properties` member of a feature.
+
+    Returns:
+        tuple[Any, list[Any]]: The remaining properties & the values of the columns of
+                               `PROMOTED_PROPERTY_COLUMNS`, None where nothing was promoted.
+    """
+    if not isinstance(properties, dict):
+        return properties, [None] * len(PROMOTED_PROPERTY_COLUMNS)
+
+    remaining = dict(properties)
+    values = []
+
+    for column, column_type in PROMOTED_PROPERTY_COLUMNS.items():
+        value = remaining.get(column)
+        promoted_value = (
+            _promoted_value(column_type, value) if column in app_settings.PROMOTED_EDGE_PROPERTIES else None
+        )
+
+        if promoted_value is not None and _reads_back_exactly(column_type, value):
+            del remaining[column]
+
+        values.append(promoted_value)
+
+    return remaining, values
+
+
+def edge_content_hash(geometry_ewkb: bytes, properties_json: str) -> str:
+    """
+    Returns the content hash identifying an edge across network versions.
+
+    Args:
+        geometry_ewkb (bytes): The EWKB encoded geometry of the edge.
+        properties_json (str): The canonical (key sorted) JSON encoding of the edge properties.
+
+    Returns:
+        str: The hex digest of the hash.
+    """
+    digest = hashlib.blake2b(geometry_ewkb, digest_size=16)
+    digest.update(properties_json.encode())
+    return digest.hexdigest()
+
+
+async def copy_edge_records(
+    session: AsyncSession, records: list[tuple], table: str = EdgeModel.__tablename__
+) -> None:
+    """
+    Bulk loads edge records into the edge table (or a table shaped like it) with a binary COPY.
+
+    The COPY runs on the session's own connection, so it is part of the session's transaction.
+
+    Args:
+        session (AsyncSession): The database session used for the load.
+        records (list[tuple]): Records holding the values of `EDGE_COPY_COLUMNS`, with the
+                               properties as a JSON string & the geometries as EWKB.
+        table (str): Name of the table to load. Defaults to the edge table.
+    """
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+
+    # Usually registered when the connection was opened, see `register_geometry_codec`
+    if not raw_connection.info.get(GEOMETRY_CODEC_REGISTERED):
+        await set_geometry_codec(driver_connection)
+        raw_connection.info[GEOMETRY_CODEC_REGISTERED] = True
+
+    await driver_connection.copy_records_to_table(
+        table,
+        records=records,
+        columns=EDGE_COPY_COLUMNS,
+    )
+
+
+async def insert_nodes(
+    session: AsyncSession, road_network: RoadNetworkModel, endpoint_keys: np.ndarray
+) -> None:
+    """
+    Adds the nodes edge endpoints fall on to the node table of a road network lineage.
+
+    The keys are deduplicated with `np.unique` & sent as arrays in a single statement; nodes the
+    lineage already has are skipped by the unique (lineage, grid key) constraint.
+
+    Args:
+        session (AsyncSession): The database session used for the insert.
+        road_network (RoadNetworkModel): The road network version adding the edges.
+        endpoint_keys (np.ndarray): Grid keys of the edge endpoints, see `endpoint_grid_keys`.
+    """
+    grid_keys = np.unique(endpoint_keys)
+    if not len(grid_keys):
+        return
+
+    lons, lats = grid_key_coordinates(grid_keys, get_snap_tolerance(road_network))
+    nodes = func.unnest(
+        literal(grid_keys.tolist(), ARRAY(BigInteger)),
+        literal(lons.tolist(), ARRAY(Float)),
+        literal(lats.tolist(), ARRAY(Float)),
+    ).table_valued("grid_key", "lon", "lat").render_derived()
+
+    await session.execute(
+        pg_insert(NodeModel)
+        .from_select(
+            ["root_network_id", "grid_key", "geometry"],
+            select(
+                literal(road_network.root_id),
+                nodes.c.grid_key,
+                func.ST_SetSRID(func.ST_MakePoint(nodes.c.lon, nodes.c.lat), 4326),
+            ),
+            include_defaults=False,
+        )
+        .on_conflict_do_nothing(index_elements=["root_network_id", "grid_key"])
+    )
+
+
+async def insert_edges(
+    session: AsyncSession,
+    road_network: RoadNetworkModel,
+    file: UploadFile,
+    batch_size: int = app_settings.EDGE_INSERT_BATCH_SIZE,
+    executor: Optional[Executor] = None,
+    on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+    table: str = EdgeModel.__tablename__,
+) -> int:
+    """
+    Streams the features of an uploaded GeoJSON file into the edge table of a road network.
+
+    Features are parsed incrementally & bulk loaded with COPY in bounded batches, so each batch
+    reaches the database while the rest of the file is still being parsed. The endpoints of each
+    batch are joined into nodes, see `insert_nodes`, so the topology is stored with the edges.
+
+    Args:
+        session (AsyncSession): The database session used for the inserts.
+        road_network (RoadNetworkModel): The road network version adding the edges.
+        file (UploadFile): The uploaded .geojson file.
+        batch_size (int): The number of edges sent to the database at a time.
+        executor (Optional[Executor]): Executor running the geometry conversion. Defaults to
+                                       converting in the calling thread.
+        on_progress (Optional[Callable[[int, int], Awaitable[None]]]): Called with the number of
+                                       features parsed & inserted so far after every batch.
+        table (str): Name of the table the edges are loaded into. Defaults to the edge table.
+
+    Returns:
+        int: The number of edges inserted.
+
+    Raises:
+        GeoJSONParseError: If the file is not a valid FeatureCollection.
+        InvalidGeometryError: If any feature does not hold a valid LineString geometry.
+    """
+    total = 0
+    loop = asyncio.get_running_loop()
+    tolerances = tuple(
+        app_settings.GEOMETRY_SIMPLIFY_TOLERANCES[resolution.value]
+        for resolution in SIMPLIFIED_RESOLUTIONS
+    )
+    snap_tolerance = get_snap_tolerance(road_network)
+
+    async for features in iter_batches(iter_geojson_features(file), batch_size):
+        if on_progress:
+            await on_progress(total + len(features), total)
+
+        geometries = [feature.get("geometry") for feature in features]
+        if executor:
+            resolutions_ewkb, endpoint_keys = await loop.run_in_executor(
+                executor, geometries_to_ewkb, geometries, total, tolerances, snap_tolerance
+            )
+        else:
+            resolutions_ewkb, endpoint_keys = geometries_to_ewkb(
+                geometries, start_index=total, tolerances=tolerances, snap_tolerance=snap_tolerance
+            )
+        geometries_ewkb, *simplified_ewkb = resolutions_ewkb
+
+        records = []
+        for feature, (source_node, target_node), geometry_ewkb, *simplified in zip(
+            features, endpoint_keys.tolist(), geometries_ewkb, *simplified_ewkb
+        ):
+            properties = feature.get("properties", {})
+            properties_json = json.dumps(properties, sort_keys=True, separators=(",", ":"))
+            remaining_properties, promoted = split_promoted_properties(properties)
+            records.append(
+                (
+                    road_network.id,
+                    road_network.root_id,
+                    road_network.version,
+                    json.dumps(remaining_properties, separators=(",", ":")),
+                    geometry_ewkb,
+                    *simplified,
+                    *promoted,
+                    source_node,
+                    target_node,
+                    # Hashed over all properties, so edges match between versions however they are stored
+                    edge_content_hash(geometry_ewkb, properties_json),
+                )
+            )
+        await copy_edge_records(session, records, table=table)
+        await insert_nodes(session, road_network, endpoint_keys)
+        total += len(records)
+
+        if on_progress:
+            await on_progress(total, total)
+
+    return total
+
+
+def live_edge_filters(road_network: RoadNetworkModel) -> list:
+    """
+    Builds the filters selecting the edges of a road network version: the edges of its lineage
+    whose validity range contains the version. Served by the `ix_edge_validity` index.
+
+    Args:
+        road_network (RoadNetworkModel): The road network version.
+
+    Returns:
+        list: Filter expressions on `EdgeModel`.
+    """
+    return [
+        EdgeModel.root_network_id == road_network.root_id,
+        EdgeModel.valid_from_version <= road_network.version,
+        or_(
+            EdgeModel.valid_to_version.is_(None),
+            EdgeModel.valid_to_version > road_network.version,
+        ),
+    ]
+
+
+def _parse_numbers(value: str, count: int, parameter: str, format_hint: str) -> tuple[float, ...]:
+    try:
+        numbers = tuple(float(number) for number in value.split(","))
+    except ValueError:
+        numbers = ()
+
+    if len(numbers) != count or not all(math.isfinite(number) for number in numbers):
+        raise EdgeFilterError(f"`{parameter}` must be `{format_hint}`")
+
+    return numbers
+
+
+def parse_point(value: str, parameter: str) -> tuple[float, float]:
+    """
+    Parses a WGS 84 point given as `lon,lat`.
+
+    Args:
+        value (str): The parameter value.
+        parameter (str): Name of the parameter, for the error message.
+
+    Returns:
+        tuple[float, float]: Longitude & latitude of the point.
+
+    Raises:
+        EdgeFilterError: If the value is not a valid point.
+    """
+    lon, lat = _parse_numbers(value, 2, parameter, "lon,lat")
+    if not (-180 <= lon <= 180 and -90 <= lat <= 90):
+        raise EdgeFilterError(f"`{parameter}` must be a valid `lon,lat` point")
+
+    return lon, lat
+
+
+def _envelope(min_lon: float, min_lat: float, max_lon: float, max_lat: float) -> ColumnElement:
+    return func.ST_MakeEnvelope(min_lon, min_lat, max_lon, max_lat, 4326)
+
+
+def spatial_edge_filters(
+    bbox: Optional[str] = None,
+    intersects: Optional[str] = None,
+    within_distance: Optional[str] = None,
+) -> list:
+    """
+    Builds the filters restricting edges to an area, evaluated by PostGIS on the GiST indexes of
+    `edge.geometry`. All coordinates are WGS 84 longitude & latitude.
+
+    Args:
+        bbox (Optional[str]): `min_lon,min_lat,max_lon,max_lat`; keeps edges whose bounding box
+            overlaps it.
+        intersects (Optional[str]): A Polygon or MultiPolygon as WKT or GeoJSON; keeps edges
+            intersecting it.
+        within_distance (Optional[str]): `lon,lat,meters`; keeps edges within that many meters of
+            the point, measured on the spheroid.
+
+    Returns:
+        list: Filter expressions on `EdgeModel`.
+
+    Raises:
+        EdgeFilterError: If a parameter is malformed.
+    """
+    filters = []
+
+    if bbox:
+        min_lon, min_lat, max_lon, max_lat = _parse_numbers(
+            bbox, 4, "bbox", "min_lon,min_lat,max_lon,max_lat"
+        )
+        if min_lon > max_lon or min_lat > max_lat:
+            raise EdgeFilterError("`bbox` minimum must not be greater than its maximum")
+
+        filters.append(EdgeModel.geometry.op("&&")(_envelope(min_lon, min_lat, max_lon, max_lat)))
+
+    if intersects:
+        try:
+            if intersects.lstrip().startswith("{"):
+                area = shapely.from_geojson(intersects)
+            else:
+                area = shapely.from_wkt(intersects)
+        except (shapely.errors.GEOSException, ValueError):
+            raise EdgeFilterError("`intersects` must be a WKT or GeoJSON polygon")
+
+        if area.geom_type not in ("Polygon", "MultiPolygon") or not area.is_valid:
+            raise EdgeFilterError("`intersects` must be a valid Polygon or MultiPolygon")
+
+        filters.append(
+            func.ST_Intersects(
+                EdgeModel.geometry,
+                func.ST_GeomFromText(shapely.to_wkt(area, rounding_precision=-1), 4326)
+            )
+        )
+
+    if within_distance:
+        lon, lat, meters = _parse_numbers(within_distance, 3, "within_distance", "lon,lat,meters")
+        if not (-180 <= lon <= 180 and -90 <= lat <= 90) or meters < 0:
+            raise EdgeFilterError("`within_distance` needs a valid point & a non negative distance")
+
+        # The geography distance can't use the geometry index, so candidates are first narrowed
+        # down to an envelope that contains the search circle
+        lat_delta = meters / 110_574
+        max_abs_lat = min(abs(lat) + lat_delta, 90)
+        lon_scale = 111_320 * math.cos(math.radians(max_abs_lat))
+        lon_delta = meters / lon_scale if lon_scale > 1 else 180
+
+        filters.append(
+            EdgeModel.geometry.op("&&")(
+                _envelope(lon - lon_delta, lat - lat_delta, lon + lon_delta, lat + lat_delta)
+            )
+        )
+        filters.append(
+            func.ST_DWithin(
+                func.geography(EdgeModel.geometry),
+                func.geography(func.ST_SetSRID(func.ST_MakePoint(lon, lat), 4326)),
+                meters,
+            )
+        )
+
+    return filters
+
+
+# One clause of a property filter, e.g. `highway in (primary,secondary)`, `lanes>=2`
+_PROPERTY_CLAUSE_PATTERN = re.compile(
+    r'^\s*(?P<key>"[^"]+"|[\w:.-]+)\s*(?P<operator>>=|<=|!=|=|>|<|\s+in\s+)\s*(?P<value>.+?)\s*$',
+    re.IGNORECASE,
+)
+_MAX_PROPERTY_CLAUSES = 20
+
+
+def _parse_property_value(value: str) -> Any:
+    # JSON literals keep their type (`true`, `2`, `"2"`); anything else is a plain string
+    try:
+        parsed_value = json.loads(value)
+    except ValueError:
+        return value
+
+    if isinstance(parsed_value, (dict, list)):
+        raise EdgeFilterError(f"Property filter values must be scalars, got `{value}`")
+
+    return parsed_value
+
+
+def _property_equals(key: str, value: Any) -> ColumnElement:
+    conditions = [EdgeModel.properties.contains({key: value})]
+
+    # Promoted values live in their typed column instead of the JSONB blob
+    column_type = PROMOTED_PROPERTY_COLUMNS.get(key)
+    if column_type and isinstance(value, str) == (column_type is str):
+        promoted_value = _promoted_value(column_type, value)
+
+        if promoted_value is not None:
+            conditions.append(getattr(EdgeModel, key) == promoted_value)
+
+    # Numbers & booleans frequently arrive as strings in GeoJSON sources, e.g. OSM's "lanes": "2"
+    if value is not None and not isinstance(value, str):
+        conditions.append(EdgeModel.properties.contains({key: json.dumps(value)}))
+
+    return or_(*conditions)
+
+
+def property_edge_filters(expression: Optional[str]) -> list:
+    """
+    Translates a property filter expression into filters on the edge properties, evaluated by
+    PostgreSQL on the `jsonb_path_ops` GIN index of `edge.properties`.
+
+    The expression is a `;` separated list of clauses, all of which must hold:
+
+    - `key=value`: JSONB containment (`@>`); numbers & booleans also match their string form.
+    - `key in (a,b,...)`: containment of any of the values.
+    - `key!=value`: the negated containment; also keeps edges without the property.
+    - `key>value`, `key>=value`, `key<value`, `key<=value`: numeric comparison through a jsonpath
+      predicate (`@?`), numeric strings included. Numeric properties promoted to typed columns are
+      compared on their column as well; the predicate still finds values that were not promoted,
+      e.g. numeric strings of edges ingested before they were normalized into the column. It
+      cannot use an index, so it is checked on every live edge matched by the other filters.
+
+    Properties promoted to typed columns are matched on their column as well, through its index.
+
+    Values are JSON literals or plain strings; keys may be double quoted, e.g. `"name:en"=Berlin`.
+
+    Args:
+        expression (Optional[str]): The filter expression.
+
+    Returns:
+        list: Filter expressions on `EdgeModel`.
+
+    Raises:
+        EdgeFilterError: If the expression is malformed.
+    """
+    if not expression:
+        return []
+
+    clauses = [clause for clause in expression.split(";") if clause.strip()]
+    if len(clauses) > _MAX_PROPERTY_CLAUSES:
+        raise EdgeFilterError(f"Property filters support at most {_MAX_PROPERTY_CLAUSES} clauses")
+
+    filters = []
+
+    for clause in clauses:
+        match = _PROPERTY_CLAUSE_PATTERN.match(clause)
+
+        if not match:
+            raise EdgeFilterError(f"Invalid property filter clause `{clause.strip()}`")
+
+        key = match["key"].strip('"')
+        operator = match["operator"].strip().lower()
+        value = match["value"]
+
+        if operator == "in":
+            values = [
+                _parse_property_value(item.strip())
+                for item in value.strip("()").split(",")
+                if item.strip()
+            ]
+            if not values:
+                raise EdgeFilterError(f"Empty value list in property filter clause `{clause.strip()}`")
+
+            filters.append(or_(*(_property_equals(key, item) for item in values)))
+
+        elif operator in ("=", "!="):
+            condition = _property_equals(key, _parse_property_value(value))
+            # NULL typed columns must not turn the negation into NULL
+            filters.append(condition if operator == "=" else not_(func.coalesce(condition, False)))
+
+        else:
+            number = _parse_property_value(value)
+            if isinstance(number, bool) or not isinstance(number, (int, float)):
+                raise EdgeFilterError(f"`{operator}` needs a number in property filter clause `{clause.strip()}`")
+
+            path = f"$.{json.dumps(key)} ? (@.double() {operator} {json.dumps(number)})"
+            condition = EdgeModel.properties.op("@?")(cast(literal(path), JSONPATH))
+
+            if (
+                PROMOTED_PROPERTY_COLUMNS.get(key) in (int, float)
+                and key in app_settings.PROMOTED_EDGE_PROPERTIES
+            ):
+                condition = or_(getattr(EdgeModel, key).op(operator)(number), condition)
+
+            filters.append(condition)
+
+    return filters
+
+
+def edge_property_value(key: str, normalized: bool = False) -> ColumnElement:
+    """
+    Returns the JSON value of a single edge property, wherever it is stored.
+
+    Args:
+        key (str): Name of the property.
+        normalized (bool): If True, prefers the value of a promoted property's typed column, e.g.
+            `2` for an ingested `"lanes": "2"`, over its original spelling.
+
+    Returns:
+        ColumnElement: A jsonb expression, NULL if the edge lacks the property.
+    """
+    value = EdgeModel.properties.op("->")(key)
+
+    # The JSONB properties keep the original spelling of values normalized into their column
+    if key in PROMOTED_PROPERTY_COLUMNS:
+        column_value = func.to_jsonb(getattr(EdgeModel, key))
+        value = func.coalesce(column_value, value) if normalized else func.coalesce(value, column_value)
+
+    return value
+
+
+def edge_properties(edge: Any = EdgeModel) -> ColumnElement:
+    """
+    Returns the full properties of an edge, merging the promoted typed columns back into the JSONB
+    properties.
+
+    Args:
+        edge (Any): `EdgeModel` or an alias of it, when a query reads several edges per row.
+
+    Returns:
+        ColumnElement: A jsonb expression equal to the properties of the ingested feature.
+    """
+    promoted = func.jsonb_strip_nulls(
+        func.jsonb_build_object(
+            *(
+                argument
+                for column in PROMOTED_PROPERTY_COLUMNS
+                for argument in (literal_column(f"'{column}'"), getattr(edge, column))
+            )
+        )
+    )
+
+    # Only object properties have promoted values; other JSON values are returned as they are.
+    # Original spellings kept in the JSONB properties override their normalized column values
+    return case(
+        (func.jsonb_typeof(edge.properties) == "object", promoted.op("||")(edge.properties)),
+        else_=edge.properties,
+    )
+
+
+def edge_geometry_column(resolution: GeometryResolution = GeometryResolution.FULL) -> ColumnElement:
+    """
+    Returns the edge geometry column holding a resolution.
+
+    Args:
+        resolution (GeometryResolution): The geometry resolution.
+
+    Returns:
+        ColumnElement: The geometry column of `EdgeModel`.
+    """
+    if resolution == GeometryResolution.FULL:
+        return EdgeModel.geometry
+
+    return getattr(EdgeModel, f"geometry_{resolution.value}")
+
+
+def edge_feature_json(
+    resolution: GeometryResolution = GeometryResolution.FULL,
+    precision: Optional[int] = None,
+    remove_repeated_points: bool = False,
+) -> ColumnElement:
+    """
+    Builds the SQL expression rendering an edge as a GeoJSON Feature inside PostGIS, so the
+    serialized text can be passed through to the client without decoding it in Python.
+
+    Args:
+        resolution (GeometryResolution): Resolution of the rendered geometry.
+        precision (Optional[int]): Number of decimal digits coordinates are rounded to. Defaults to
+                                   PostGIS' default of 9 digits.
+        remove_repeated_points (bool): If True, consecutive vertices that are equal after rounding
+                                       are rendered once.
+
+    Returns:
+        ColumnElement: A text expression holding the Feature JSON of an `EdgeModel` row.
+    """
+    geometry = edge_geometry_column(resolution)
+
+    if remove_repeated_points:
+        if precision is not None:
+            # Snapping to the output grid first makes vertices that round to the same point equal
+            geometry = func.ST_SnapToGrid(geometry, 10.0 ** -precision)
+        geometry = func.ST_RemoveRepeatedPoints(geometry)
+
+    geometry_json = (
+        func.ST_AsGeoJSON(geometry, precision) if precision is not None else func.ST_AsGeoJSON(geometry)
+    )
+
+    return cast(
+        func.json_build_object(
+            literal_column("'type'"), literal_column("'Feature'"),
+            literal_column("'geometry'"), cast(geometry_json, JSON),
+            literal_column("'properties'"), edge_properties(),
+        ),
+        Text,
+    )
+
+
+async def stream_edges_geojson(
+    road_network: RoadNetworkModel,
+    filters: Optional[list] = None,
+    feature_json: Optional[ColumnElement] = None,
+    chunk_size: int = app_settings.EDGE_STREAM_CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """
+    Streams the edges of a road network version as a GeoJSON FeatureCollection.
+
+    Edges are read through a server side cursor as Feature JSON built by PostGIS & written out
+    `chunk_size` features at a time, between the FeatureCollection header & footer, so neither the
+    rows nor the document are ever held in memory as a whole. The generator opens its own session,
+    since it runs after the request's dependencies have been closed.
+
+    Args:
+        road_network (RoadNetworkModel): The road network version.
+        filters (Optional[list]): Additional filters on the edges, e.g. from `spatial_edge_filters`.
+        feature_json (Optional[ColumnElement]): Feature JSON expression from `edge_feature_json`.
+                                                Defaults to full resolution & precision.
+        chunk_size (int): Number of features fetched & written at a time.
+
+    Yields:
+        bytes: The next piece of the GeoJSON document.
+    """
+    edges_query = (
+        select(feature_json if feature_json is not None else edge_feature_json())
+        .where(*live_edge_filters(road_network), *(filters or []))
+    )
+
+    async for chunk in stream_feature_collection(edges_query, chunk_size):
+        yield chunk
+
+
+async def stream_feature_collection(
+    features_query: Any, chunk_size: int = app_settings.EDGE_STREAM_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    Streams the Feature JSON rows of a query as a GeoJSON FeatureCollection, through a server side
+    cursor & in its own session.
+
+    Args:
+        features_query (Any): Query selecting a single text column of Feature JSON.
+        chunk_size (int): Number of features fetched & written at a time.
+
+    Yields:
+        bytes: The next piece of the GeoJSON document.
+    """
+    async with async_session() as session:
+        features_result = await session.stream(features_query.execution_options(yield_per=chunk_size))
+
+        yield b'{"type":"FeatureCollection","features":['
+
+        separator = ""
+        async for features in features_result.scalars().partitions(chunk_size):
+            yield (separator + ",".join(features)).encode()
+            separator = ","
+
+        yield b"]}"
+
+
+def _changed_edges(candidates: Any, counterparts: Any, name: str) -> Any:
+    # Drops the candidates whose content is still found on the other side, e.g. an edge removed &
+    # re-added unchanged in between, & numbers the rest per geometry so equal geometries pair up
+    geometry_hash = func.md5(func.ST_AsBinary(EdgeModel.geometry))
+
+    return (
+        select(
+            candidates.c.id,
+            geometry_hash.label("geometry_hash"),
+            func.row_number().over(partition_by=geometry_hash, order_by=candidates.c.id).label("rank"),
+        )
+        .select_from(candidates)
+        .join(EdgeModel, EdgeModel.id == candidates.c.id)
+        .where(~exists().where(counterparts.c.content_hash == candidates.c.content_hash))
+        .cte(name)
+    )
+
+
+def edge_changes_query(from_network: RoadNetworkModel, to_network: RoadNetworkModel) -> Any:
+    """
+    Builds the query classifying the edges that differ between two road network versions, computed
+    with set operations inside the database.
+
+    Edges live in only one of the versions are the candidates; within a lineage those are found on
+    the validity ranges, without reading the edges both versions share. Candidates whose content
+    hash appears on both sides are unchanged. Of the remaining ones, a removed & an added edge with
+    the same geometry hash are reported as one `modified` edge, the others as `removed` or `added`.
+
+    Args:
+        from_network (RoadNetworkModel): The version compared from.
+        to_network (RoadNetworkModel): The version compared to.
+
+    Returns:
+        Any: Query selecting `id`, `previous_id` (the removed edge of a modified one) & `change`.
+    """
+    live_in_from = and_(*live_edge_filters(from_network))
+    live_in_to = and_(*live_edge_filters(to_network))
+
+    removed_candidates = (
+        select(EdgeModel.id, EdgeModel.content_hash)
+        .where(live_in_from, not_(live_in_to))
+        .cte("removed_candidates")
+    )
+    added_candidates = (
+        select(EdgeModel.id, EdgeModel.content_hash)
+        .where(live_in_to, not_(live_in_from))
+        .cte("added_candidates")
+    )
+    removed = _changed_edges(removed_candidates, added_candidates, "removed")
+    added = _changed_edges(added_candidates, removed_candidates, "added")
+
+    pairs = and_(added.c.geometry_hash == removed.c.geometry_hash, added.c.rank == removed.c.rank)
+    return union_all(
+        select(
+            added.c.id.label("id"),
+            removed.c.id.label("previous_id"),
+            literal_column("'modified'").label("change"),
+        ).join(removed, pairs),
+        select(
+            added.c.id,
+            cast(null(), Text),
+            literal_column("'added'"),
+        ).where(~exists().where(pairs)),
+        select(
+            removed.c.id,
+            cast(null(), Text),
+            literal_column("'removed'"),
+        ).where(~exists().where(pairs)),
+    )
+
+
+def edge_diff_query(from_network: RoadNetworkModel, to_network: RoadNetworkModel) -> Any:
+    """
+    Builds the query rendering the differences between two road network versions as GeoJSON
+    Features, see `edge_changes_query`.
+
+    Args:
+        from_network (RoadNetworkModel): The version compared from.
+        to_network (RoadNetworkModel): The version compared to.
+
+    Returns:
+        Any: Query selecting the Feature JSON of each changed edge. Features carry a `change`
+             member & modified ones the former properties in `previous_properties`.
+    """
+    changes = edge_changes_query(from_network, to_network).subquery("changes")
+    previous_edge = aliased(EdgeModel)
+    feature_json = cast(
+        func.json_build_object(
+            literal_column("'type'"), literal_column("'Feature'"),
+            literal_column("'change'"), changes.c.change,
+            literal_column("'geometry'"), cast(func.ST_AsGeoJSON(EdgeModel.geometry), JSON),
+            literal_column("'properties'"), edge_properties(),
+            literal_column("'previous_properties'"), edge_properties(previous_edge),
+        ),
+        Text,
+    )
+
+    return (
+        select(feature_json)
+        .select_from(changes)
+        .join(EdgeModel, EdgeModel.id == changes.c.id)
+        .outerjoin(previous_edge, previous_edge.id == changes.c.previous_id)
+    )
+
+
+def edge_response_key(road_network: RoadNetworkModel, **params: Any) -> str:
+    """
+    Builds the key identifying an edge response of a road network version. A version never changes,
+    so its ID & the parameters shaping the response identify the response body exactly; the key is
+    used both as ETag & as export cache key.
+
+    Args:
+        road_network (RoadNetworkModel): The resolved road network version.
+        **params: Parameters changing the response body; `None` values are ignored.
+
+    Returns:
+        str: The response key.
+    """
+    params = {key: value for key, value in params.items() if value is not None}
+
+    if not params:
+        return road_network.id
+
+    params_digest = hashlib.blake2b(
+        json.dumps(params, sort_keys=True, default=str).encode(), digest_size=8
+    ).hexdigest()
+    return f"{road_network.id}-{params_digest}"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Checks an `If-None-Match` header against an ETag, using the weak comparison the header calls for.
+
+    Args:
+        if_none_match (Optional[str]): Value of the `If-None-Match` request header.
+        etag (str): The quoted ETag of the current response.
+
+    Returns:
+        bool: True if the client's cached copy is still current.
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+async def fetch_edges_page(
+    session: AsyncSession,
+    road_network: RoadNetworkModel,
+    page_size: int,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    filters: Optional[list] = None,
+    feature_json: Optional[ColumnElement] = None,
+) -> tuple[bytes, Optional[str]]:
+    """
+    Fetches one page of the edges of a road network version as a GeoJSON FeatureCollection.
+
+    Pages are ordered by edge ID & seeked to with the ID of the last edge of the previous page
+    (keyset pagination), so every page is read straight from the `ix_edge_root_network_id_id` index
+    no matter how deep into the network it lies. `after` & `before` also allow splitting the ID
+    space into slices fetched in parallel.
+
+    Args:
+        session (AsyncSession): The database session.
+        road_network (RoadNetworkModel): The road network version.
+        page_size (int): Maximum number of edges on the page.
+        after (Optional[str]): Cursor of the previous page; only edges with a greater ID are returned.
+        before (Optional[str]): Only edges with a smaller ID are returned.
+        filters (Optional[list]): Additional filters on the edges, e.g. from `spatial_edge_filters`.
+        feature_json (Optional[ColumnElement]): Feature JSON expression from `edge_feature_json`.
+                                                Defaults to full resolution & precision.
+
+    Returns:
+        tuple[bytes, Optional[str]]: The FeatureCollection & the cursor of the next page, None on the last page.
+    """
+    page_filters = [*live_edge_filters(road_network), *(filters or [])]
+
+    if after is not None:
+        page_filters.append(EdgeModel.id > after)
+
+    if before is not None:
+        page_filters.append(EdgeModel.id < before)
+
+    # One extra row tells whether another page follows
+    edges_query = (
+        select(EdgeModel.id, feature_json if feature_json is not None else edge_feature_json())
+        .where(*page_filters)
+        .order_by(EdgeModel.id)
+        .limit(page_size + 1)
+    )
+    edges_result = await session.execute(edges_query)
+    rows = edges_result.all()
+
+    next_cursor = rows[page_size - 1][0] if len(rows) > page_size else None
+    features = ",".join(feature for _, feature in rows[:page_size])
+
+    content = (
+        f'{{"type":"FeatureCollection","next_cursor":{json.dumps(next_cursor)},"features":[{features}]}}'
+    )
+    return content.encode(), next_cursor
+
+
+# Width of the Web Mercator world in meters
+_WEB_MERCATOR_WORLD_SIZE = 40075016.68557849
+
+
+def tile_properties(z: int) -> Optional[list[str]]:
+    """
+    Returns the edge properties included in vector tiles of a zoom level, from `TILE_ZOOM_PROPERTIES`:
+    the properties of the closest configured zoom level at or below it. Tiles below the lowest
+    configured zoom level include no properties.
+
+    Args:
+        z (int): Zoom level of the tile.
+
+    Returns:
+        Optional[list[str]]: Names of the included properties, empty to include none, or None to
+            include all of them.
+    """
+    min_zoom = max(
+        (zoom for zoom in app_settings.TILE_ZOOM_PROPERTIES if zoom <= z), default=None
+    )
+    return app_settings.TILE_ZOOM_PROPERTIES[min_zoom] if min_zoom is not None else []
+
+
+async def build_edge_tile(
+    session: AsyncSession, road_network: RoadNetworkModel, z: int, x: int, y: int
+) -> bytes:
+    """
+    Renders the edges of a road network version within a Web Mercator tile as a Mapbox Vector
+    Tile with PostGIS. Edges are picked through the GiST index on `edge.geometry` & clipped to the
+    tile plus its buffer.
+
+    Args:
+        session (AsyncSession): The database session.
+        road_network (RoadNetworkModel): The road network version.
+        z (int): Zoom level of the tile.
+        x (int): Column of the tile.
+        y (int): Row of the tile.
+
+    Returns:
+        bytes: The encoded tile; empty if no edge crosses the tile.
+    """
+    extent = app_settings.TILE_EXTENT
+    buffer = app_settings.TILE_BUFFER
+    tile_envelope = func.ST_TileEnvelope(z, x, y)
+    margin = _WEB_MERCATOR_WORLD_SIZE / 2 ** z * buffer / extent
+
+    property_names = tile_properties(z)
+    if property_names is None:
+        properties = edge_properties()
+    else:
+        properties = func.jsonb_strip_nulls(
+            func.jsonb_build_object(
+                *(
+                    argument
+                    for property_name in property_names
+                    for argument in (
+                        cast(property_name, Text), edge_property_value(property_name)
+                    )
+                )
+            )
+        )
+
+    tile_rows = (
+        select(
+            func.ST_AsMVTGeom(
+                func.ST_Transform(EdgeModel.geometry, 3857), tile_envelope, extent, buffer
+            ).label("geom"),
+            properties.label("properties"),
+        )
+        .where(
+            *live_edge_filters(road_network),
+            EdgeModel.geometry.op("&&")(
+                func.ST_Transform(func.ST_Expand(tile_envelope, margin), 4326)
+            ),
+        )
+        .subquery("tile_rows")
+    )
+
+    tile_query = (
+        select(func.ST_AsMVT(tile_rows.table_valued(), app_settings.TILE_LAYER_NAME, extent, "geom"))
+        .select_from(tile_rows)
+        .where(tile_rows.c.geom.is_not(None))
+    )
+    tile_result = await session.execute(tile_query)
+    return bytes(tile_result.scalar() or b"")
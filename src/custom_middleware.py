@@ -1,10 +1,14 @@
 import time
 import traceback
+from typing import Optional
 
 from fastapi import Request
 from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from .global_utils import DEFAULT_COMPRESSION_LEVELS, SUPPORTED_ENCODINGS, create_compressor, negotiate_encoding
 from .logger import logger
 
 
@@ -46,4 +50,117 @@ class LoggingMiddleware(BaseHTTPMiddleware):
                 "process_time": process_time,
             }
         )
-        return response
\ No newline at end of file
+        return response
+
+
+class CompressionMiddleware:
+    """
+    Compresses response bodies with the content coding negotiated through `Accept-Encoding`.
+
+    Bodies are compressed chunk by chunk as the app sends them, so streamed responses stay streamed
+    & only the compressor's own window is buffered. Responses below `minimum_size`, of other media
+    types, already encoded or partial (Range) responses are passed through untouched.
+
+    `levels` maps path prefixes to the compression level of each content coding; the longest
+    matching prefix applies. Codings a prefix leaves out take the level of the "" prefix, then
+    `DEFAULT_COMPRESSION_LEVELS`.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        media_types: set[str],
+        levels: dict[str, dict[str, int]],
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.media_types = media_types
+
+        for prefix, prefix_levels in levels.items():
+            unknown = set(prefix_levels) - set(SUPPORTED_ENCODINGS)
+            if unknown:
+                raise ValueError(
+                    f"Unknown content codings {sorted(unknown)} in compression levels of `{prefix}`"
+                )
+
+        default_levels = {**DEFAULT_COMPRESSION_LEVELS, **levels.get("", {})}
+        # Longest prefix first, so the most specific level wins; "" matches every path
+        self.levels = sorted(
+            [(prefix, {**default_levels, **prefix_levels}) for prefix, prefix_levels in levels.items()]
+            + ([] if "" in levels else [("", default_levels)]),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            return await self.app(scope, receive, send)
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+
+        if not encoding:
+            return await self.app(scope, receive, send)
+
+        level = next(
+            levels[encoding] for prefix, levels in self.levels if scope["path"].startswith(prefix)
+        )
+        start_message: Optional[Message] = None
+        compress = finish = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, compress, finish, passthrough
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = Headers(raw=message["headers"])
+                media_type = headers.get("content-type", "").split(";")[0].strip()
+                content_length = headers.get("content-length")
+
+                passthrough = (
+                    "content-encoding" in headers
+                    or message["status"] in (204, 206, 304) or message["status"] < 200
+                    or media_type not in self.media_types
+                    or (content_length is not None and int(content_length) < self.minimum_size)
+                )
+
+                if passthrough:
+                    await send(message)
+
+                return None
+
+            if message["type"] != "http.response.body" or passthrough:
+                return await send(message)
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compress is None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                headers.add_vary_header("Accept-Encoding")
+
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    return await send(message)
+
+                compress, finish = create_compressor(encoding, level)
+                headers["Content-Encoding"] = encoding
+                del headers["Content-Length"]
+
+                # The encoded body is a different representation; weak ETags still revalidate
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+
+                await send(start_message)
+
+            compressed = compress(body)
+            if not more_body:
+                compressed += finish()
+
+            if compressed or not more_body:
+                await send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
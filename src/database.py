@@ -1,7 +1,7 @@
 import os
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel
@@ -29,6 +29,48 @@ engine = create_async_engine(
     pool_pre_ping=True
 )
 
+# Connection info flag set once the geometry codec is registered on a connection
+GEOMETRY_CODEC_REGISTERED = "geometry_codec_registered"
+
+
+async def set_geometry_codec(connection: Any) -> None:
+    """
+    Registers a binary codec for the PostGIS `geometry` type on an asyncpg connection, so bulk loads
+    send EWKB as is; PostGIS uses EWKB as the binary wire format of `geometry`.
+
+    asyncpg drops the statement cache of the connection whenever a codec is set, so this is done
+    once per connection.
+
+    Args:
+        connection (Any): The asyncpg connection.
+
+    Raises:
+        ValueError: If the postgis extension is not installed yet.
+    """
+    await connection.set_type_codec(
+        "geometry",
+        schema="public",
+        encoder=bytes,
+        decoder=bytes,
+        format="binary",
+    )
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def register_geometry_codec(dbapi_connection: Any, connection_record: Any) -> None:
+    """
+    Registers the geometry codec on every new pooled connection, before it has cached statements.
+    Connections opened before the postgis extension exists are registered on first use instead,
+    see `copy_edge_records`.
+    """
+    try:
+        dbapi_connection.run_async(set_geometry_codec)
+    except ValueError:
+        return
+
+    connection_record.info[GEOMETRY_CODEC_REGISTERED] = True
+
+
 # Session
 async_session = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
@@ -1,9 +1,45 @@
+import zlib
+from collections.abc import AsyncIterator, Callable
 from datetime import datetime
 from typing import Any, Optional
 
+import brotli
+import orjson
+import zstandard
 from fastapi import status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+# Content codings the server can produce, in order of preference
+SUPPORTED_ENCODINGS = ("zstd", "br", "gzip")
+
+# Compression level of each content coding where none is configured
+DEFAULT_COMPRESSION_LEVELS = {"zstd": 3, "br": 5, "gzip": 6}
+
+# File name suffixes of precompressed files
+ENCODING_SUFFIXES = {"zstd": ".zst", "br": ".br", "gzip": ".gz"}
+
+
+def _json_default(obj: Any) -> Any:
+    # Models are dumped straight to Python values; anything else falls back to FastAPI's encoder
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+
+    return jsonable_encoder(obj)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response serialized with orjson.
+
+    Model objects (SQLModel/pydantic) are encoded directly, without a `jsonable_encoder` pass over
+    the whole payload; datetimes, UUIDs & enums are handled natively by orjson.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
 
 
 def success_response(
@@ -37,7 +73,7 @@ def success_response(
     content = {
         "status_code": status_code,
         "detail": detail,
-        "data": jsonable_encoder(data)
+        "data": data
     }
 
     if is_paginated:
@@ -51,7 +87,7 @@ def success_response(
             }
         )
 
-    return JSONResponse(status_code=status_code, content=content)
+    return FastJSONResponse(status_code=status_code, content=content)
 
 
 def error_response(
@@ -72,7 +108,7 @@ def error_response(
         "status_code": status_code,
         "detail": detail
         }
-    response = JSONResponse(status_code=status_code, content=content)
+    response = FastJSONResponse(status_code=status_code, content=content)
     return response
 
 
@@ -83,4 +119,89 @@ def time_now() -> datetime:
     Returns:
         datetime: The current datetime.
     """
-    return datetime.now()
\ No newline at end of file
+    return datetime.now()
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Picks the preferred supported content coding accepted by the client.
+
+    Args:
+        accept_encoding (Optional[str]): Value of the `Accept-Encoding` request header.
+
+    Returns:
+        Optional[str]: One of `SUPPORTED_ENCODINGS`, or None if the response must not be compressed.
+    """
+    if not accept_encoding:
+        return None
+
+    qualities = {}
+    for coding in accept_encoding.split(","):
+        name, _, parameters = coding.strip().partition(";")
+        quality = 1.0
+        parameter_name, _, value = parameters.strip().partition("=")
+
+        if parameter_name.strip() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+
+        qualities[name.strip().lower()] = quality
+
+    wildcard_quality = qualities.get("*", 0.0)
+
+    for encoding in SUPPORTED_ENCODINGS:
+        if qualities.get(encoding, wildcard_quality) > 0:
+            return encoding
+
+    return None
+
+
+def create_compressor(encoding: str, level: int) -> tuple[Callable[[bytes], bytes], Callable[[], bytes]]:
+    """
+    Creates an incremental compressor for a content coding.
+
+    Args:
+        encoding (str): One of `SUPPORTED_ENCODINGS`.
+        level (int): Compression level, on the scale of the coding's library.
+
+    Returns:
+        tuple[Callable[[bytes], bytes], Callable[[], bytes]]: Function compressing the next chunk
+        of data & function ending the stream, both returning the compressed output produced so far.
+    """
+    if encoding == "zstd":
+        compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        return compressor.compress, compressor.flush
+
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=level)
+        return compressor.process, compressor.finish
+
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress, compressor.flush
+
+
+async def iter_compressed_file(
+    path: str, encoding: str, level: int, chunk_size: int = 1024 * 1024
+) -> AsyncIterator[bytes]:
+    """
+    Reads & compresses a file chunk by chunk, off the event loop.
+
+    Args:
+        path (str): Path of the file.
+        encoding (str): One of `SUPPORTED_ENCODINGS`.
+        level (int): Compression level, on the scale of the coding's library.
+        chunk_size (int): Number of bytes read at a time.
+
+    Yields:
+        bytes: The next piece of the compressed file.
+    """
+    compress, finish = create_compressor(encoding, level)
+
+    with open(path, "rb") as file:
+        while chunk := await run_in_threadpool(file.read, chunk_size):
+            if compressed := await run_in_threadpool(compress, chunk):
+                yield compressed
+
+    yield finish()
@@ -1,7 +1,9 @@
 import os
+import tempfile
 from datetime import timedelta
 from enum import Enum
 from functools import lru_cache
+from typing import Optional
 from cryptography.fernet import Fernet
 
 from passlib.context import CryptContext
@@ -47,6 +49,65 @@ class Settings(BaseSettings):
         JWT_REFRESH_TOKEN_EXPIRE (timedelta): The expiration time for refresh tokens.
         PWD_CONTEXT (CryptContext): The password hashing context, set to use the bcrypt algorithm.
         CELERY_APP (Celery): The Celery App Instance.
+        GEOJSON_READ_CHUNK_SIZE (int): Number of bytes read from an uploaded GeoJSON file at a time.
+        GEOJSON_MAX_FEATURE_SIZE (int): Maximum size in characters of a single GeoJSON feature.
+        EDGE_INSERT_BATCH_SIZE (int): Number of edges written to the database at a time during ingest.
+        PROMOTED_EDGE_PROPERTIES (set): Feature properties stored in typed edge columns
+            (`highway`, `lanes`, `oneway`, `length`) instead of the JSONB properties. Numeric strings
+            & integral floats are normalized into the numeric columns, keeping their original
+            spelling in the JSONB properties.
+        GEOMETRY_SIMPLIFY_TOLERANCES (dict): Simplification tolerance in degrees of each precomputed
+            edge geometry resolution.
+        INGEST_SPOOL_DIR (str): Directory where uploaded files are stored until their ingest job runs.
+        INGEST_MAX_WORKERS (int): Number of ingest jobs run concurrently by each API worker.
+        INGEST_PROCESS_WORKERS (int): Number of processes used for the geometry conversion of ingest jobs.
+        INGEST_MAX_JOBS_PER_CUSTOMER (int): Number of queued or running ingest jobs allowed per customer.
+        INGEST_STALE_JOB_AFTER (timedelta): Time without progress after which an unfinished job is failed.
+        EDGE_STREAM_CHUNK_SIZE (int): Number of edges fetched & written at a time when streaming GeoJSON.
+        EDGE_PAGE_SIZE (int): Default number of edges per page of a paginated edge request.
+        EDGE_MAX_PAGE_SIZE (int): Maximum number of edges per page of a paginated edge request.
+        EXPORT_CACHE_DIR (str): Directory where built export files are cached.
+        EXPORT_CACHE_MAX_BYTES (int): Total size of the export cache above which old exports are evicted.
+        EXPORT_CACHE_LOCK_TIMEOUT (timedelta): Time after which the lock of an unfinished export is taken over.
+        TILE_MAX_ZOOM (int): Highest zoom level vector tiles are served for.
+        TILE_EXTENT (int): Size of a vector tile in tile coordinate units.
+        TILE_BUFFER (int): Width of the buffer around a vector tile in tile coordinate units.
+        TILE_LAYER_NAME (str): Name of the edge layer of a vector tile.
+        TILE_ZOOM_PROPERTIES (dict): Edge properties included in vector tiles from the given zoom level
+            upwards; None includes all properties. Tiles below the lowest zoom level include none.
+        TILE_CACHE_MAX_BYTES (int): Size of the in-memory vector tile cache of each API worker.
+        GRAPH_CACHE_MAX_BYTES (int): Memory budget of the routable graphs cached by each API worker.
+        GRAPH_SNAP_TOLERANCE (float): Grid size in degrees edge endpoints are snapped to when they
+            are joined into nodes, at ingest & in graphs; at least 1e-7 so node keys fit 64 bits.
+            A lineage keeps the tolerance of its first version, so changing it only affects new networks.
+        GRAPH_MAX_SNAP_DISTANCE (float): Maximum distance in meters between a route's start or end
+            point & the closest graph node.
+        EDGE_INDEX_CACHE_MAX_BYTES (int): Memory budget of the edge STRtrees cached by each API worker.
+        SNAP_MAX_POINTS (int): Maximum number of points snapped per request.
+        SNAP_MAX_DISTANCE (float): Default distance in meters beyond which points are not snapped.
+        MATCH_MAX_POINTS (int): Maximum number of points of a matched GPS trace.
+        MATCH_SEARCH_RADIUS (float): Radius in meters candidate edges of trace points are searched in.
+        MATCH_MAX_CANDIDATES (int): Maximum number of candidate edges per trace point.
+        MATCH_GPS_SIGMA (float): Standard deviation in meters of GPS positions.
+        MATCH_TRANSITION_BETA (float): Scale in meters of the detour accepted between trace points.
+        MATRIX_PROCESS_WORKERS (int): Number of processes computing travel cost matrices; 0 runs
+            the searches in threads.
+        MATRIX_MAX_LOCATIONS (int): Maximum number of origins & of destinations of a matrix.
+        MATRIX_ROWS_PER_TASK (int): Number of matrix rows computed by one process pool task.
+        MATRIX_MAX_SHARED_GRAPHS (int): Number of graphs kept in shared memory for the matrix processes.
+        ROAD_NETWORK_CATALOG_MAX_CUSTOMERS (int): Number of customers whose network version catalog
+            is cached by each API worker.
+        ROAD_NETWORK_CATALOG_CHANNEL (Optional[str]): Postgres NOTIFY channel keeping the catalogs of
+            all API workers in sync; None if only a single worker runs.
+        ROAD_NETWORK_CATALOG_LISTEN_CHECK_INTERVAL (float): Seconds between checks of the listening
+            connection.
+        COMPRESSION_MIN_SIZE (int): Size in bytes below which responses are sent uncompressed.
+        COMPRESSIBLE_MEDIA_TYPES (set): Media types of the responses that are compressed.
+        COMPRESSION_LEVELS (dict): Compression level of each content coding by path prefix; the
+            longest matching prefix applies, "" being the default. Codings left out fall back to
+            the "" prefix, then to built-in defaults.
+        EXPORT_COMPRESSION_LEVELS (dict): Compression level of each content coding for the
+            precompressed export files; codings left out use the built-in defaults.
     """
 
     # Current Environment
@@ -84,6 +145,92 @@ class Settings(BaseSettings):
     # For Database
     DATABASE_URL: str = os.environ.get("DATABASE_URL")
 
+    # For GeoJSON ingest
+    GEOJSON_READ_CHUNK_SIZE: int = 64 * 1024
+    GEOJSON_MAX_FEATURE_SIZE: int = 16 * 1024 * 1024
+    EDGE_INSERT_BATCH_SIZE: int = 5000
+    PROMOTED_EDGE_PROPERTIES: set[str] = {"highway", "lanes", "oneway", "length"}
+    GEOMETRY_SIMPLIFY_TOLERANCES: dict[str, float] = {
+        "medium": 0.0001,
+        "low": 0.001,
+    }
+
+    # For ingest jobs
+    INGEST_SPOOL_DIR: str = os.environ.get(
+        "INGEST_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "road_network_ingest")
+    )
+    INGEST_MAX_WORKERS: int = 2
+    INGEST_PROCESS_WORKERS: int = 2
+    INGEST_MAX_JOBS_PER_CUSTOMER: int = 2
+    INGEST_STALE_JOB_AFTER: timedelta = timedelta(hours=1)
+
+    # For edge responses
+    EDGE_STREAM_CHUNK_SIZE: int = 1000
+    EDGE_PAGE_SIZE: int = 1000
+    EDGE_MAX_PAGE_SIZE: int = 10000
+
+    # For export cache
+    EXPORT_CACHE_DIR: str = os.environ.get(
+        "EXPORT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "road_network_exports")
+    )
+    EXPORT_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+    EXPORT_CACHE_LOCK_TIMEOUT: timedelta = timedelta(minutes=10)
+
+    # For vector tiles
+    TILE_MAX_ZOOM: int = 22
+    TILE_EXTENT: int = 4096
+    TILE_BUFFER: int = 64
+    TILE_LAYER_NAME: str = "edges"
+    TILE_ZOOM_PROPERTIES: dict[int, Optional[list[str]]] = {
+        0: ["highway"],
+        12: None,
+    }
+    TILE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+
+    # For routing
+    GRAPH_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    GRAPH_SNAP_TOLERANCE: float = 1e-7
+    GRAPH_MAX_SNAP_DISTANCE: float = 1000.0
+
+    # For snapping & map matching
+    EDGE_INDEX_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    SNAP_MAX_POINTS: int = 1_000_000
+    SNAP_MAX_DISTANCE: float = 100.0
+    MATCH_MAX_POINTS: int = 100_000
+    MATCH_SEARCH_RADIUS: float = 50.0
+    MATCH_MAX_CANDIDATES: int = 5
+    MATCH_GPS_SIGMA: float = 10.0
+    MATCH_TRANSITION_BETA: float = 5.0
+
+    # For travel cost matrices
+    MATRIX_PROCESS_WORKERS: int = 2
+    MATRIX_MAX_LOCATIONS: int = 1000
+    MATRIX_ROWS_PER_TASK: int = 8
+    MATRIX_MAX_SHARED_GRAPHS: int = 4
+
+    # For road network version catalog
+    ROAD_NETWORK_CATALOG_MAX_CUSTOMERS: int = 1000
+    ROAD_NETWORK_CATALOG_CHANNEL: Optional[str] = (
+        os.environ.get("ROAD_NETWORK_CATALOG_CHANNEL", "road_network_catalog") or None
+    )
+    ROAD_NETWORK_CATALOG_LISTEN_CHECK_INTERVAL: float = 5.0
+
+    # For response compression
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSIBLE_MEDIA_TYPES: set[str] = {
+        "application/json",
+        "application/geo+json",
+        "application/vnd.mapbox-vector-tile",
+        "text/plain",
+        "text/html",
+    }
+    COMPRESSION_LEVELS: dict[str, dict[str, int]] = {
+        "": {"gzip": 6, "br": 5, "zstd": 3},
+        # Large streamed payloads favour throughput over ratio
+        "/api/v1/road-network/edges": {"gzip": 4, "br": 4, "zstd": 3},
+    }
+    EXPORT_COMPRESSION_LEVELS: dict[str, int] = {"gzip": 9, "br": 9, "zstd": 12}
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -10,17 +10,22 @@ from asyncpg.exceptions import (
     InvalidAuthorizationSpecificationError, InvalidCatalogNameError, InvalidPasswordError
 )
 
-from .custom_middleware import LoggingMiddleware
+from .custom_middleware import CompressionMiddleware, LoggingMiddleware
 from .database import async_session, engine
+from .global_utils import FastJSONResponse
 from .apps.customer.models import CustomerModel
 from .apps.user.models import UserModel, UserType
-from .apps.road_network.models import RoadNetworkModel, EdgeModel
+from .apps.road_network.models import RoadNetworkModel, EdgeModel, IngestJobModel, NodeModel
+from .apps.road_network.catalog import road_network_catalog
+from .apps.road_network.jobs import ingest_job_runner
+from .apps.road_network.matrix import travel_matrix_runner
 from .settings import app_settings
 
 async def init_db():
     async with engine.begin() as conn:
         # Enable PostGIS extension first
         await conn.execute(text("CREATE EXTENSION IF NOT EXISTS postgis;"))
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist;"))
 
         # Create all tables
         await conn.run_sync(SQLModel.metadata.create_all)
@@ -89,6 +94,13 @@ def lifespan_factory() -> callable:
 
         """
         await init_db()
+
+        # Start background ingest workers
+        await ingest_job_runner.fail_stale_jobs()
+        ingest_job_runner.start()
+        # Keep the cached network catalogs in sync with the other workers
+        road_network_catalog.start()
+        travel_matrix_runner.start()
         # try:
         #     # Postgres Ping
         #     async with async_session() as session:
@@ -102,6 +114,10 @@ def lifespan_factory() -> callable:
 
         yield
 
+        travel_matrix_runner.shutdown()
+        await road_network_catalog.shutdown()
+        await ingest_job_runner.shutdown()
+
         # await engine.dispose()
 
         print("Worker stopped successfully")
@@ -129,9 +145,16 @@ def create_application(app_settings: BaseSettings, router: APIRouter) -> FastAPI
         title=app_settings.APP_TITLE,
         version=app_settings.APP_VERSION,
         lifespan=lifespan,
+        default_response_class=FastJSONResponse,
     )
 
     # Adding middleware
+    application.add_middleware(
+        CompressionMiddleware,
+        minimum_size=app_settings.COMPRESSION_MIN_SIZE,
+        media_types=app_settings.COMPRESSIBLE_MEDIA_TYPES,
+        levels=app_settings.COMPRESSION_LEVELS,
+    )
     application.add_middleware(
         CORSMiddleware,
         allow_origins=app_settings.ALLOWED_ORIGINS,
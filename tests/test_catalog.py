@@ -0,0 +1,81 @@
+import asyncio
+from datetime import datetime
+
+from src.apps.road_network.catalog import CustomerCatalog, RoadNetworkCatalogCache
+
+
+def _day(day: int) -> datetime:
+    return datetime(2024, 1, day)
+
+
+def test_resolves_versions_and_latest(make_network):
+    catalog = CustomerCatalog([
+        make_network(2.0, created_at=_day(2)),
+        make_network(1.0, created_at=_day(1)),
+        make_network(1.0, created_at=_day(1), name="rails"),
+    ])
+
+    assert catalog.resolve("roads").version == 2.0
+    assert catalog.resolve("roads", version=1.0).id == "roads-1.0"
+    assert catalog.resolve("roads", version=1.5) is None
+    # A pinned version never falls back to the latest one
+    assert catalog.resolve("roads", version=0.0) is None
+    assert catalog.resolve("ferries") is None
+    assert [network.id for network in catalog.road_networks()] == ["rails-1.0", "roads-2.0", "roads-1.0"]
+
+
+def test_timestamp_resolves_the_highest_version_created_by_then(make_network):
+    # Version 3.0 committed before version 2.0, e.g. from concurrent transactions
+    catalog = CustomerCatalog([
+        make_network(1.0, created_at=_day(1)),
+        make_network(2.0, created_at=_day(5)),
+        make_network(3.0, created_at=_day(3)),
+    ])
+
+    assert catalog.resolve("roads", timestamp=datetime(2023, 12, 31)) is None
+    assert catalog.resolve("roads", timestamp=datetime(2024, 1, 2)).version == 1.0
+    assert catalog.resolve("roads", timestamp=datetime(2024, 1, 4)).version == 3.0
+    assert catalog.resolve("roads", timestamp=datetime(2024, 1, 6)).version == 3.0
+
+
+def test_version_created_after_the_timestamp_is_not_resolved(make_network):
+    catalog = CustomerCatalog([
+        make_network(1.0, created_at=_day(1)),
+        make_network(2.0, created_at=_day(5)),
+        make_network(3.0, created_at=_day(3)),
+    ])
+
+    assert catalog.resolve("roads", version=3.0, timestamp=datetime(2024, 1, 4)).version == 3.0
+    assert catalog.resolve("roads", version=2.0, timestamp=datetime(2024, 1, 4)) is None
+
+
+def test_finished_load_does_not_drop_a_newer_load():
+    cache = RoadNetworkCatalogCache(max_customers=4)
+    releases = {}
+
+    async def load(customer_id):
+        release = releases[len(releases)] = asyncio.Event()
+        await release.wait()
+        return CustomerCatalog([])
+
+    cache._load = load
+
+    async def scenario():
+        first = asyncio.ensure_future(cache.get("customer"))
+        await asyncio.sleep(0)
+        cache.invalidate("customer")
+
+        second = asyncio.ensure_future(cache.get("customer"))
+        await asyncio.sleep(0)
+        newer_load = cache._loading["customer"]
+
+        releases[0].set()
+        await first
+        assert cache._loading["customer"] is newer_load
+
+        releases[1].set()
+        await second
+        await asyncio.sleep(0)
+        assert "customer" not in cache._loading
+
+    asyncio.run(scenario())
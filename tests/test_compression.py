@@ -0,0 +1,138 @@
+import asyncio
+import gzip
+import zlib
+
+import brotli
+import pytest
+import zstandard
+
+from src.custom_middleware import CompressionMiddleware
+from src.global_utils import create_compressor, negotiate_encoding
+
+BODY = b'{"type":"FeatureCollection","features":[' + b'{"type":"Feature"},' * 200 + b"]}"
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        (None, None),
+        ("", None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip, br", "br"),
+        ("gzip, br, zstd", "zstd"),
+        ("zstd;q=0, br;q=0.5, gzip", "br"),
+        ("GZIP", "gzip"),
+        ("*", "zstd"),
+        ("*, zstd;q=0", "br"),
+        ("gzip;q=abc", None),
+    ],
+)
+def test_encoding_negotiation(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+DECOMPRESS = {
+    "gzip": gzip.decompress,
+    "br": brotli.decompress,
+    "zstd": lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data),
+}
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br", "zstd"])
+def test_incremental_compressors_round_trip(encoding):
+    compress, finish = create_compressor(encoding, 3)
+
+    compressed = b"".join(compress(BODY[start:start + 100]) for start in range(0, len(BODY), 100)) + finish()
+
+    assert DECOMPRESS[encoding](compressed) == BODY
+
+
+def _app(body: bytes, media_type: str = "application/json", chunks: int = 1):
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", media_type.encode()), (b"etag", b'"v1"')],
+        })
+        size = -(-len(body) // chunks)
+        for index in range(chunks):
+            await send({
+                "type": "http.response.body",
+                "body": body[index * size:(index + 1) * size],
+                "more_body": index < chunks - 1,
+            })
+
+    return app
+
+
+def _call(middleware, accept_encoding: str, path: str = "/api/v1/road-network/edges"):
+    messages = []
+    scope = {
+        "type": "http", "method": "GET", "path": path,
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(middleware(scope, None, send))
+    headers = dict(messages[0]["headers"])
+    return headers, b"".join(message.get("body", b"") for message in messages[1:])
+
+
+def _middleware(app, levels=None):
+    return CompressionMiddleware(
+        app, minimum_size=100, media_types={"application/json"}, levels=levels or {}
+    )
+
+
+def test_streamed_response_is_compressed_with_the_negotiated_coding():
+    headers, body = _call(_middleware(_app(BODY, chunks=5)), "gzip, br")
+
+    assert headers[b"content-encoding"] == b"br"
+    assert headers[b"etag"] == b'W/"v1"'
+    assert b"Accept-Encoding" in headers[b"vary"]
+    assert brotli.decompress(body) == BODY
+
+
+@pytest.mark.parametrize(
+    "app", [_app(b"{}"), _app(BODY, media_type="image/png")], ids=["small", "media type"]
+)
+def test_responses_are_passed_through(app):
+    headers, body = _call(_middleware(app), "gzip")
+
+    assert b"content-encoding" not in headers
+    assert body in (b"{}", BODY)
+
+
+def test_levels_fall_back_to_the_default_prefix_and_built_in_levels(monkeypatch):
+    levels_used = []
+
+    def record_compressor(encoding, level):
+        levels_used.append((encoding, level))
+        return create_compressor(encoding, level)
+
+    monkeypatch.setattr("src.custom_middleware.create_compressor", record_compressor)
+    # No "" prefix & no level for zstd or br anywhere
+    middleware = _middleware(_app(BODY), levels={"/api/v1/road-network/edges": {"gzip": 1}})
+
+    _call(middleware, "gzip")
+    _call(middleware, "zstd")
+    _call(middleware, "br", path="/api/v1/road-network")
+
+    assert levels_used == [("gzip", 1), ("zstd", 3), ("br", 5)]
+
+
+def test_prefix_levels_inherit_the_default_prefix():
+    middleware = _middleware(_app(BODY), levels={"": {"br": 9}, "/edges": {"gzip": 2}})
+
+    assert dict(middleware.levels) == {
+        "/edges": {"zstd": 3, "br": 9, "gzip": 2},
+        "": {"zstd": 3, "br": 9, "gzip": 6},
+    }
+
+
+def test_unknown_codings_are_rejected():
+    with pytest.raises(ValueError, match="deflate"):
+        _middleware(_app(BODY), levels={"": {"deflate": 6}})
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from src.apps.road_network.api.get_road_network_edges_api import get_road_network_edges
+from src.apps.road_network.api.get_road_network_tile_api import get_road_network_tile
+from src.apps.road_network.catalog import road_network_catalog
+from src.apps.road_network.models import GeometryResolution, RoadNetworkModel
+from src.apps.road_network.utils import edge_response_key, etag_matches
+from src.apps.user.models import UserModel
+
+NETWORK = RoadNetworkModel(id="network", name="roads", version=1.0, customer_id="customer", root_id="network")
+
+
+def test_response_key_is_the_version_id_without_parameters():
+    assert edge_response_key(NETWORK) == "network"
+    assert edge_response_key(NETWORK, bbox=None) == "network"
+
+
+def test_response_key_depends_on_the_parameters_only():
+    key = edge_response_key(NETWORK, bbox="0,0,1,1", precision=5)
+
+    assert key.startswith("network-")
+    assert key == edge_response_key(NETWORK, precision=5, bbox="0,0,1,1", intersects=None)
+    assert key != edge_response_key(NETWORK, bbox="0,0,1,1", precision=6)
+
+
+@pytest.mark.parametrize(
+    "if_none_match, expected",
+    [
+        (None, False),
+        ("", False),
+        ("*", True),
+        ('"network"', True),
+        ('W/"network"', True),
+        ('"other", W/"network"', True),
+        ('"other"', False),
+        ("network", False),
+    ],
+)
+def test_etag_matching(if_none_match, expected):
+    assert etag_matches(if_none_match, '"network"') is expected
+
+
+@pytest.fixture
+def resolve_network(monkeypatch):
+    async def resolve(customer_id, name, version=None, timestamp=None):
+        return NETWORK
+
+    monkeypatch.setattr(road_network_catalog, "resolve", resolve)
+
+
+def _edges_response(session, version):
+    return asyncio.run(get_road_network_edges(
+        request=None, name="roads", timestamp=None, version=version, export=False, bbox=None,
+        intersects=None, within_distance=None, properties_filter=None, page_size=None, after=None,
+        before=None, resolution=GeometryResolution.FULL, precision=5, remove_repeated_points=False,
+        if_none_match="*", accept_encoding=None, session=session, user=UserModel(customer_id="customer"),
+    ))
+
+
+def _tile_response(session, version):
+    return asyncio.run(get_road_network_tile(
+        z=0, x=0, y=0, name="roads", version=version, if_none_match="*", session=session,
+        user=UserModel(customer_id="customer"),
+    ))
+
+
+@pytest.mark.parametrize("get_response", [_edges_response, _tile_response])
+@pytest.mark.parametrize(
+    "version, cache_control",
+    [
+        (None, "private, no-cache"),
+        (0.0, "private, max-age=31536000, immutable"),
+        (1.0, "private, max-age=31536000, immutable"),
+    ],
+)
+def test_only_pinned_versions_are_cached_as_immutable(
+    resolve_network, fake_session, get_response, version, cache_control
+):
+    response = get_response(fake_session, version)
+
+    assert response.status_code == 304
+    assert response.headers["Cache-Control"] == cache_control
@@ -0,0 +1,52 @@
+import asyncio
+
+from src.database import GEOMETRY_CODEC_REGISTERED
+from src.apps.road_network.utils import EDGE_COPY_COLUMNS, copy_edge_records
+
+
+class FakeDriverConnection:
+    def __init__(self) -> None:
+        self.codecs = []
+        self.copies = []
+
+    async def set_type_codec(self, typename, **kwargs) -> None:
+        self.codecs.append(typename)
+
+    async def copy_records_to_table(self, table, records, columns) -> None:
+        self.copies.append((table, records, columns))
+
+
+class FakeRawConnection:
+    def __init__(self, info: dict) -> None:
+        self.driver_connection = FakeDriverConnection()
+        self.info = info
+
+
+def _copy_batches(session, raw_connection: FakeRawConnection, batches: int) -> None:
+    session.raw_connection = raw_connection
+
+    async def copy() -> None:
+        for batch in range(batches):
+            await copy_edge_records(session, [(batch,)], table="edge_staging")
+
+    asyncio.run(copy())
+
+
+def test_codec_is_registered_once_per_connection(fake_session):
+    raw_connection = FakeRawConnection({})
+
+    _copy_batches(fake_session, raw_connection, 3)
+
+    assert raw_connection.driver_connection.codecs == ["geometry"]
+    assert raw_connection.info[GEOMETRY_CODEC_REGISTERED]
+    assert [copy[0] for copy in raw_connection.driver_connection.copies] == ["edge_staging"] * 3
+    assert raw_connection.driver_connection.copies[0][2] == EDGE_COPY_COLUMNS
+
+
+def test_codec_registered_on_connect_is_reused(fake_session):
+    raw_connection = FakeRawConnection({GEOMETRY_CODEC_REGISTERED: True})
+
+    _copy_batches(fake_session, raw_connection, 2)
+
+    assert raw_connection.driver_connection.codecs == []
+    assert len(raw_connection.driver_connection.copies) == 2
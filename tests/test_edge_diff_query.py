@@ -0,0 +1,51 @@
+import pytest
+
+from src.apps.road_network.utils import edge_changes_query
+
+
+@pytest.fixture
+def changes(edge_rows, make_network):
+    def query(from_version: float = 1.0, to_version: float = 1.1) -> set[tuple]:
+        return set(edge_rows.query(edge_changes_query(make_network(from_version), make_network(to_version))))
+
+    return query
+
+
+def test_edges_are_classified_as_added_removed_or_modified(edge_rows, changes):
+    edge_rows.add("kept", geometry=b"kept")
+    edge_rows.add("removed", valid_to_version=1.1, geometry=b"removed")
+    edge_rows.add("added", valid_from_version=1.1, geometry=b"added")
+    # Same geometry, new properties
+    edge_rows.add("old", valid_to_version=1.1, geometry=b"moved")
+    edge_rows.add("new", valid_from_version=1.1, geometry=b"moved")
+
+    assert changes() == {
+        ("added", None, "added"),
+        ("removed", None, "removed"),
+        ("new", "old", "modified"),
+    }
+
+
+def test_edges_removed_and_readded_unchanged_are_not_reported(edge_rows, changes):
+    edge_rows.add("before", valid_to_version=1.1, content_hash="same", geometry=b"line")
+    edge_rows.add("after", valid_from_version=1.1, content_hash="same", geometry=b"line")
+
+    assert changes() == set()
+
+
+def test_equal_geometries_pair_up_one_to_one(edge_rows, changes):
+    edge_rows.add("old-1", valid_to_version=1.1, geometry=b"line")
+    edge_rows.add("old-2", valid_to_version=1.1, geometry=b"line")
+    edge_rows.add("new-1", valid_from_version=1.1, geometry=b"line")
+
+    assert changes() == {("new-1", "old-1", "modified"), ("old-2", None, "removed")}
+
+
+def test_diff_spans_several_versions_in_both_directions(edge_rows, changes):
+    edge_rows.add("gone", valid_to_version=1.2)
+    edge_rows.add("short-lived", valid_from_version=1.1, valid_to_version=1.2)
+    edge_rows.add("late", valid_from_version=1.2)
+    edge_rows.add("other-lineage", valid_from_version=1.2, root_network_id="other")
+
+    assert changes(1.0, 1.2) == {("gone", None, "removed"), ("late", None, "added")}
+    assert changes(1.2, 1.0) == {("late", None, "removed"), ("gone", None, "added")}
@@ -0,0 +1,18 @@
+from src.apps.road_network.models import GeometryResolution
+from src.apps.road_network.utils import edge_feature_json
+
+
+def test_feature_json_is_built_in_postgis(compile_sql):
+    sql = compile_sql(edge_feature_json())
+
+    assert sql.startswith("CAST(json_build_object('type', 'Feature', 'geometry', CAST(ST_AsGeoJSON(")
+    assert "edge.geometry" in sql
+    assert sql.endswith("AS TEXT)")
+
+
+def test_precision_and_repeated_point_removal(compile_sql):
+    sql = compile_sql(edge_feature_json(GeometryResolution.LOW, precision=5, remove_repeated_points=True))
+
+    assert "ST_AsGeoJSON(ST_RemoveRepeatedPoints(ST_SnapToGrid(" in sql
+    assert "edge.geometry_low" in sql
+    assert ", 5)" in sql
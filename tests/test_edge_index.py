@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from src.apps.road_network import snapping
+from src.apps.road_network.snapping import EdgeIndex, snapped_points_data
+
+
+# Two roads in a row along the equator & a parallel one ~111 m north
+ROADS = [[(0, 0), (0.001, 0)], [(0.001, 0), (0.002, 0)], [(0, 0.001), (0.002, 0.001)]]
+
+
+@pytest.fixture
+def edge_index(build_graph) -> EdgeIndex:
+    return EdgeIndex(build_graph(ROADS))
+
+
+def test_snaps_to_the_closest_edge(edge_index):
+
+    edges, distances, positions, snapped = edge_index.snap([0.0005, 0.0015, 0.001], [0.0001, -0.0001, 0.0009])
+
+    assert edges.tolist() == [0, 1, 2]
+    assert distances == pytest.approx([11.12, 11.12, 11.12], abs=0.01)
+    assert positions == pytest.approx([0.5, 0.5, 0.5])
+    np.testing.assert_allclose(snapped, [[0.0005, 0], [0.0015, 0], [0.001, 0.001]], atol=1e-12)
+
+
+def test_points_beyond_max_distance_are_not_snapped(edge_index):
+
+    edges, distances, positions, snapped = edge_index.snap([0.0005, 0.0005], [0.0001, -0.001], max_distance=20)
+
+    assert edges.tolist() == [0, -1]
+    assert np.isnan(distances[1]) and np.isnan(positions[1]) and np.isnan(snapped[1]).all()
+    assert snapped_points_data(edge_index, edges, distances, positions, snapped)["edge_ids"] == ["e0", None]
+
+
+def test_radius_steps_snap_like_a_single_search(edge_index, monkeypatch):
+    generator = np.random.default_rng(0)
+    lons, lats = generator.uniform(-0.001, 0.003, 500), generator.uniform(-0.001, 0.002, 500)
+
+    stepped = edge_index.snap(lons, lats)
+    monkeypatch.setattr(snapping, "_SNAP_RADIUS_STEPS", (1,))
+    single = edge_index.snap(lons, lats)
+
+    for stepped_values, single_values in zip(stepped, single):
+        np.testing.assert_array_equal(stepped_values, single_values)
+
+
+def test_match_without_candidates_matches_nothing(edge_index):
+
+    for lons, lats in (([10.0], [10.0]), ([], [])):
+        edges, distances, positions, snapped = edge_index.match(lons, lats)
+
+        assert edges.tolist() == [-1] * len(lons)
+        assert np.isnan(distances).all() and np.isnan(positions).all() and np.isnan(snapped).all()
+        assert snapped.shape == (len(lons), 2)
+
+
+def test_match_follows_the_trace_across_adjacent_edges(edge_index):
+    # The fifth point has no candidate, the match restarts after it
+    lons = np.linspace(0.0001, 0.0019, 10)
+    lats = np.where(np.arange(10) == 4, 0.01, 0.0001)
+
+    edges, distances, positions, snapped = edge_index.match(lons, lats)
+
+    assert edges.tolist() == [0] * 4 + [-1] + [1] * 5
+    assert positions[edges >= 0] == pytest.approx([0.1, 0.3, 0.5, 0.7, 0.1, 0.3, 0.5, 0.7, 0.9])
+    assert np.all(snapped[edges >= 0, 1] == 0)
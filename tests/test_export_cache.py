@@ -0,0 +1,111 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from src.apps.road_network.cache import ExportCache
+
+
+def _producer(content: bytes, calls: list):
+    async def produce():
+        calls.append(content)
+        yield content[:2]
+        yield content[2:]
+
+    return produce
+
+
+def test_artifact_is_produced_once(tmp_path):
+    cache = ExportCache(str(tmp_path), max_bytes=1000, lock_timeout=60)
+    calls = []
+
+    async def get_twice():
+        return await asyncio.gather(*(cache.get("a", _producer(b"abcdef", calls)) for _ in range(2)))
+
+    paths = asyncio.run(get_twice())
+
+    assert paths == [cache.path("a")] * 2
+    assert calls == [b"abcdef"]
+    with open(paths[0], "rb") as file:
+        assert file.read() == b"abcdef"
+
+
+def test_least_recently_used_artifacts_are_evicted(tmp_path):
+    cache = ExportCache(str(tmp_path), max_bytes=10, lock_timeout=60)
+    calls = []
+
+    async def fill():
+        await cache.get("old", _producer(b"123456", calls))
+        os.utime(cache.path("old"), (time.time() - 10, time.time() - 10))
+        await cache.get("new", _producer(b"abcdef", calls))
+
+    asyncio.run(fill())
+
+    assert not os.path.exists(cache.path("old"))
+    assert os.path.exists(cache.path("new"))
+
+
+def test_leased_artifact_stays_readable_after_eviction(tmp_path):
+    cache = ExportCache(str(tmp_path), max_bytes=10, lock_timeout=60)
+    calls = []
+
+    async def lease_then_evict():
+        lease_path = await cache.lease("old", _producer(b"123456", calls))
+        os.utime(cache.path("old"), (time.time() - 10, time.time() - 10))
+        await cache.get("new", _producer(b"abcdef", calls))
+        return lease_path
+
+    lease_path = asyncio.run(lease_then_evict())
+
+    assert not os.path.exists(cache.path("old"))
+    with open(lease_path, "rb") as file:
+        assert file.read() == b"123456"
+
+    cache.release(lease_path)
+    assert not os.path.exists(lease_path)
+
+
+def test_lease_refills_an_artifact_evicted_before_it_is_linked(tmp_path):
+    cache = ExportCache(str(tmp_path), max_bytes=1000, lock_timeout=60)
+    calls = []
+    get = cache.get
+
+    async def get_then_evict(*args, **kwargs):
+        path = await get(*args, **kwargs)
+        if len(calls) == 1:
+            os.remove(path)
+        return path
+
+    cache.get = get_then_evict
+    lease_path = asyncio.run(cache.lease("a", _producer(b"abcdef", calls)))
+
+    assert calls == [b"abcdef", b"abcdef"]
+    with open(lease_path, "rb") as file:
+        assert file.read() == b"abcdef"
+
+
+def test_lease_gives_up_on_an_artifact_that_keeps_being_evicted(tmp_path):
+    cache = ExportCache(str(tmp_path), max_bytes=1000, lock_timeout=60)
+
+    async def evicted_get(key, produce, suffix=".geojson"):
+        return cache.path(key, suffix)
+
+    cache.get = evicted_get
+
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(cache.lease("a", _producer(b"abcdef", [])))
+
+
+def test_leases_are_not_evicted_until_they_are_stale(tmp_path):
+    cache = ExportCache(str(tmp_path), max_bytes=1000, lock_timeout=60)
+    lease_path = asyncio.run(cache.lease("a", _producer(b"abcdef", [])))
+    stale_path = cache.path("b") + ".0123.lease"
+    with open(stale_path, "wb") as file:
+        file.write(b"x")
+    os.utime(stale_path, (time.time() - 120, time.time() - 120))
+
+    cache._evict(keep=cache.path("a"))
+
+    assert os.path.exists(lease_path)
+    assert not os.path.exists(stale_path)
@@ -0,0 +1,142 @@
+import asyncio
+import io
+import json
+
+import pytest
+from starlette.datastructures import UploadFile
+
+from src.apps.road_network import utils
+from src.apps.road_network.utils import (
+    FeatureCollectionParser, GeoJSONParseError, iter_batches, iter_geojson_features
+)
+
+FEATURES = [
+    {"type": "Feature", "properties": {"name": f"road {index}", "lanes": index},
+     "geometry": {"type": "LineString", "coordinates": [[index, 0.5], [index + 1, -12.25]]}}
+    for index in range(3)
+]
+DOCUMENT = json.dumps(
+    {"type": "FeatureCollection", "name": "roads", "features": FEATURES, "crs": {"type": "name"}},
+    indent=1,
+)
+
+
+def _parse(text: str, chunk_size: int) -> list[dict]:
+    parser = FeatureCollectionParser()
+    features = []
+
+    for start in range(0, len(text), chunk_size):
+        features.extend(parser.feed(text[start:start + chunk_size]))
+
+    return features + parser.feed("", final=True)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, len(DOCUMENT)])
+def test_features_are_parsed_across_chunk_boundaries(chunk_size):
+    assert _parse(DOCUMENT, chunk_size) == FEATURES
+
+
+def test_features_are_returned_as_soon_as_they_are_complete():
+    parser = FeatureCollectionParser()
+    first_feature = json.dumps(FEATURES[0])
+
+    assert parser.feed('{"type": "FeatureCollection", "features": [' + first_feature + ",") == [FEATURES[0]]
+    assert parser.feed(first_feature + "]") == [FEATURES[0]]
+    assert parser.feed("}", final=True) == []
+
+
+def test_empty_collection():
+    assert _parse('{"type": "FeatureCollection", "features": []}', 5) == []
+    assert _parse("{}", 1) == []
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        '[{"type": "Feature"}]',
+        '{"type": "FeatureCollection", "features": {"type": "Feature"}}',
+        '{"type": "FeatureCollection", "features": [1, 2]}',
+        '{"type": "FeatureCollection", "features": [{"type": "Feature"}',
+        '{"type": "FeatureCollection", "features": []} {}',
+        '{"type": "FeatureCollection", "features": [{"type": "Feature",]}',
+        "",
+    ],
+)
+def test_invalid_documents_are_rejected(document):
+    with pytest.raises(GeoJSONParseError):
+        _parse(document, 3)
+
+
+def test_oversized_feature_is_rejected():
+    parser = FeatureCollectionParser(max_feature_size=100)
+
+    with pytest.raises(GeoJSONParseError, match="maximum allowed size"):
+        parser.feed('{"features": [{"properties": {"name": "' + "x" * 200)
+
+
+def test_invalid_json_is_rejected_before_the_feature_ends():
+    parser = FeatureCollectionParser(max_feature_size=100)
+
+    with pytest.raises(GeoJSONParseError, match="delimiter"):
+        parser.feed('{"features": [{"properties": {"a": 1 "b": 2}, "name": "' + "x" * 50)
+
+
+def test_mismatched_bracket_of_a_pending_feature_is_rejected():
+    parser = FeatureCollectionParser()
+    parser.feed('{"features": [{"geometry": {"coordinates": [[1, 2], [3, 4')
+
+    with pytest.raises(GeoJSONParseError, match="expected `]` but found `}`"):
+        parser.feed("]}")
+
+
+@pytest.mark.parametrize("value", ['"a \\" ] } \\u00e9"', "-12.5e3", "true", '{"b": "}"}'])
+def test_pending_values_end_where_json_says(value):
+    document = '{"name": ' + value + ', "features": [{"type": "Feature"}]}'
+
+    assert _parse(document, 1) == [{"type": "Feature"}]
+
+
+def test_large_feature_is_decoded_once(monkeypatch):
+    decoded = []
+
+    class CountingDecoder(json.JSONDecoder):
+        def raw_decode(self, s, idx=0):
+            decoded.append(len(s) - idx)
+            return super().raw_decode(s, idx)
+
+    monkeypatch.setattr(utils, "_JSON_DECODER", CountingDecoder())
+    feature = {"type": "Feature", "geometry": {"coordinates": [[index, index] for index in range(20000)]}}
+    document = json.dumps({"type": "FeatureCollection", "features": [feature]})
+
+    assert _parse(document, 1000) == [feature]
+    assert sum(decoded) < 2 * len(document)
+
+
+def test_upload_is_read_in_chunks_and_decoded():
+    file = UploadFile(io.BytesIO(b"\xef\xbb\xbf" + DOCUMENT.encode()))
+
+    async def collect() -> list[dict]:
+        return [feature async for feature in iter_geojson_features(file, chunk_size=5)]
+
+    assert asyncio.run(collect()) == FEATURES
+
+
+def test_upload_that_is_not_utf8_is_rejected():
+    file = UploadFile(io.BytesIO(b'{"features": ["\xff"]}'))
+
+    async def collect() -> list[dict]:
+        return [feature async for feature in iter_geojson_features(file)]
+
+    with pytest.raises(GeoJSONParseError, match="UTF-8"):
+        asyncio.run(collect())
+
+
+def test_batches_are_bounded():
+    async def items():
+        for item in range(7):
+            yield item
+
+    async def collect() -> list[list[int]]:
+        return [batch async for batch in iter_batches(items(), 3)]
+
+    assert asyncio.run(collect()) == [[0, 1, 2], [3, 4, 5], [6]]
@@ -0,0 +1,72 @@
+import pickle
+
+import pytest
+import shapely
+
+from src.apps.road_network.utils import InvalidGeometryError, geometries_to_ewkb
+
+
+def _line(*coordinates) -> dict:
+    return {"type": "LineString", "coordinates": [list(coordinate) for coordinate in coordinates]}
+
+
+def test_geometries_are_encoded_as_ewkb_in_input_order():
+    geometries = [_line((0, 0), (1, 1)), _line((2, 2), (3, 3), (4, 2))]
+
+    (encoded,), _ = geometries_to_ewkb(geometries)
+
+    lines = shapely.from_wkb(encoded)
+    assert shapely.get_srid(lines).tolist() == [4326, 4326]
+    assert [line.coords[:] for line in lines] == [
+        [(0, 0), (1, 1)], [(2, 2), (3, 3), (4, 2)]
+    ]
+
+
+def test_z_values_are_dropped():
+    (encoded,), _ = geometries_to_ewkb([_line((0, 0, 10), (1, 1, 20))])
+
+    line = shapely.from_wkb(encoded[0])
+    assert not line.has_z
+    assert line.coords[:] == [(0, 0), (1, 1)]
+
+
+def test_chunks_mixing_2d_and_3d_geometries_are_encoded():
+    (encoded,), _ = geometries_to_ewkb([_line((0, 0), (1, 1)), _line((2, 2, 5), (3, 3, 5))])
+
+    assert [line.coords[:] for line in shapely.from_wkb(encoded)] == [
+        [(0, 0), (1, 1)], [(2, 2), (3, 3)]
+    ]
+
+
+def test_simplified_copies_follow_the_geometries():
+    wiggly = _line(*[(step * 0.001, 0.00001 * (step % 2)) for step in range(11)])
+
+    (encoded, simplified), _ = geometries_to_ewkb([wiggly], tolerances=(0.001,))
+
+    assert len(shapely.from_wkb(encoded[0]).coords) == 11
+    assert shapely.from_wkb(simplified[0]).coords[:] == [(0, 0), (0.01, 0)]
+
+
+@pytest.mark.parametrize(
+    "geometry",
+    [
+        None,
+        {"type": "Point", "coordinates": [0, 0]},
+        _line((0, 0)),
+        _line((0, 0), (0, 0)),
+        {"type": "LineString", "coordinates": [[0, 0], [1, "x"]]},
+        {"type": "LineString", "coordinates": [[0, 0], [float("nan"), 1]]},
+    ],
+)
+def test_invalid_geometries_are_reported_by_feature_index(geometry):
+    with pytest.raises(InvalidGeometryError) as error:
+        geometries_to_ewkb([_line((0, 0), (1, 1)), geometry], start_index=10)
+
+    assert error.value.indices == [11]
+
+
+def test_invalid_geometry_error_survives_pickling():
+    error = pickle.loads(pickle.dumps(InvalidGeometryError(list(range(30)))))
+
+    assert error.indices == list(range(30))
+    assert "(30 in total)" in str(error)
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from src.apps.road_network.models import RoadNetworkModel
+from src.apps.road_network.utils import (
+    endpoint_grid_keys, geometries_to_ewkb, get_snap_tolerance, grid_key_coordinates
+)
+
+
+def test_points_within_the_tolerance_share_a_key():
+    keys = endpoint_grid_keys(
+        np.array([11.5, 11.5 + 4e-8, 11.5 + 2e-7, -180.0]), np.array([48.1, 48.1 - 4e-8, 48.1, 90.0]), 1e-7
+    )
+
+    assert keys[0] == keys[1]
+    assert keys[0] != keys[2]
+    assert keys.dtype == np.int64 and (keys >= 0).all()
+
+
+@pytest.mark.parametrize("tolerance", [1e-7, 1e-6, 1e-5])
+def test_keys_decode_to_the_cell_centers(tolerance):
+    generator = np.random.default_rng(0)
+    lons, lats = generator.uniform(-180, 180, 1000), generator.uniform(-90, 90, 1000)
+
+    decoded_lons, decoded_lats = grid_key_coordinates(endpoint_grid_keys(lons, lats, tolerance), tolerance)
+
+    assert np.abs(decoded_lons - lons).max() <= tolerance / 2 + 1e-9
+    assert np.abs(decoded_lats - lats).max() <= tolerance / 2 + 1e-9
+
+
+def test_snap_tolerance_falls_back_to_the_setting(monkeypatch):
+    monkeypatch.setattr("src.apps.road_network.utils.app_settings.GRAPH_SNAP_TOLERANCE", 1e-5)
+
+    assert get_snap_tolerance(RoadNetworkModel(name="roads", version=1.0, snap_tolerance=1e-6)) == 1e-6
+    assert get_snap_tolerance(RoadNetworkModel(name="roads", version=1.0)) == 1e-5
+
+
+def test_graph_decodes_stored_keys_with_the_stored_tolerance(monkeypatch, build_graph):
+    geometry = {"type": "LineString", "coordinates": [[11.5, 48.1], [11.501, 48.1]]}
+    _, endpoint_keys = geometries_to_ewkb([geometry], snap_tolerance=1e-6)
+    # The setting changed after the ingest
+    monkeypatch.setattr("src.apps.road_network.graph.app_settings.GRAPH_SNAP_TOLERANCE", 1e-5)
+
+    graph = build_graph(
+        [geometry["coordinates"]], endpoint_keys=[tuple(endpoint_keys[0].tolist())], snap_tolerance=1e-6
+    )
+
+    np.testing.assert_allclose(graph.node_lons, [11.5, 11.501], atol=1e-9)
+    np.testing.assert_allclose(graph.node_lats, [48.1, 48.1], atol=1e-9)
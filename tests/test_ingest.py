@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from src.apps.road_network import ingest
+from src.apps.road_network.ingest import IngestError, ingest_road_network
+from src.apps.road_network.models import IngestJobModel, IngestOperation
+from src.apps.road_network.utils import edge_content_hash
+
+
+def test_update_rechecks_the_latest_version_under_the_lineage_lock(monkeypatch, fake_session, make_network):
+    session = fake_session
+    # A concurrent update commits version 1.1 while this job waits for the lock
+    latest_networks = iter([make_network(1.0), make_network(1.1)])
+
+    async def get_latest_road_network(*args):
+        return next(latest_networks)
+
+    monkeypatch.setattr(ingest, "get_latest_road_network", get_latest_road_network)
+    job = IngestJobModel(
+        customer_id="customer", name="roads", version=1.1, operation=IngestOperation.UPDATE
+    )
+
+    with pytest.raises(IngestError, match=r"must be higher than current latest `\(1.1\)`"):
+        asyncio.run(ingest_road_network(session, job, file=None))
+
+    assert len(session.statements) == 1
+    assert "pg_advisory_xact_lock(hashtextextended(" in session.statements[0]
+
+
+def test_update_of_missing_network_takes_no_lock(monkeypatch, fake_session):
+    session = fake_session
+
+    async def get_latest_road_network(*args):
+        return None
+
+    monkeypatch.setattr(ingest, "get_latest_road_network", get_latest_road_network)
+    job = IngestJobModel(
+        customer_id="customer", name="roads", version=1.1, operation=IngestOperation.UPDATE
+    )
+
+    with pytest.raises(IngestError, match="not found"):
+        asyncio.run(ingest_road_network(session, job, file=None))
+
+    assert session.statements == []
+
+
+def test_lineage_keeps_the_snap_tolerance_of_its_first_version(monkeypatch, fake_session, make_network):
+    latest = make_network(1.0)
+    latest.snap_tolerance = 1e-6
+
+    async def get_latest_road_network(*args):
+        return latest
+
+    async def insert_edges(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr(ingest, "get_latest_road_network", get_latest_road_network)
+    monkeypatch.setattr(ingest, "insert_edges", insert_edges)
+    monkeypatch.setattr(ingest.app_settings, "GRAPH_SNAP_TOLERANCE", 1e-5)
+
+    job = IngestJobModel(customer_id="customer", name="new", version=1.0, operation=IngestOperation.CREATE)
+    assert asyncio.run(ingest_road_network(fake_session, job, file=None)).snap_tolerance == 1e-5
+
+    job = IngestJobModel(customer_id="customer", name="roads", version=1.1, operation=IngestOperation.UPDATE)
+    assert asyncio.run(ingest_road_network(fake_session, job, file=None)).snap_tolerance == 1e-6
+
+
+def test_content_hash_depends_on_geometry_and_properties():
+    base = edge_content_hash(b"\x01geometry", '{"highway":"primary"}')
+
+    assert base == edge_content_hash(b"\x01geometry", '{"highway":"primary"}')
+    assert len(base) == 32
+    assert base != edge_content_hash(b"\x01geometry", '{"highway":"secondary"}')
+    assert base != edge_content_hash(b"\x01other", '{"highway":"primary"}')
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from src.apps.road_network import jobs
+from src.apps.road_network.jobs import IngestJobLimitError, create_ingest_job
+from src.apps.road_network.models import IngestOperation
+from src.apps.user.models import UserModel
+
+
+@pytest.fixture
+def spooled(monkeypatch, tmp_path):
+    paths = []
+
+    async def spool_upload(file, path):
+        paths.append(path)
+        open(path, "w").close()
+
+    monkeypatch.setattr(jobs, "spool_upload", spool_upload)
+    monkeypatch.setattr(jobs.app_settings, "INGEST_SPOOL_DIR", str(tmp_path))
+    monkeypatch.setattr(jobs.app_settings, "INGEST_MAX_JOBS_PER_CUSTOMER", 2)
+    monkeypatch.setattr(jobs.ingest_job_runner, "submit", lambda job_id: None)
+    return paths
+
+
+def _create(session):
+    user = UserModel(id="user", customer_id="customer", username="u", email="u@example.com", hashed_password="x")
+    return asyncio.run(create_ingest_job(session, user, IngestOperation.CREATE, "roads", 1.0, file=None))
+
+
+def test_jobs_are_counted_and_inserted_under_the_customer_lock(spooled, fake_session):
+    session = fake_session
+    session.scalar = 1
+
+    job = _create(session)
+
+    assert session.added == [job] and session.committed
+    assert "pg_advisory_xact_lock(hashtextextended(" in session.statements[0]
+    assert "count(*)" in session.statements[1]
+
+
+def test_job_over_the_limit_is_rejected_and_its_spool_file_removed(spooled, fake_session):
+    session = fake_session
+    session.scalar = 2
+
+    with pytest.raises(IngestJobLimitError):
+        _create(session)
+
+    assert session.added == [] and not session.committed
+    assert not any(jobs.os.path.exists(path) for path in spooled)
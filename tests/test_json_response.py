@@ -0,0 +1,36 @@
+import json
+from datetime import datetime
+from enum import Enum
+
+from src.global_utils import FastJSONResponse, error_response, success_response
+from src.apps.road_network.models import RoadNetworkModel
+
+
+class Color(str, Enum):
+    RED = "red"
+
+
+def test_models_and_native_types_are_rendered():
+    network = RoadNetworkModel(
+        id="network", name="roads", version=1.1, customer_id="customer", root_id="network",
+        created_at=datetime(2025, 1, 2, 3, 4, 5),
+    )
+
+    body = json.loads(FastJSONResponse(content={"data": [network], 1: Color.RED}).body)
+
+    assert body["1"] == "red"
+    assert body["data"][0]["version"] == 1.1
+    assert body["data"][0]["created_at"] == "2025-01-02T03:04:05"
+
+
+def test_success_and_error_responses():
+    success = success_response(detail="ok", data={"a": 1}, is_paginated=True, total=1)
+    error = error_response(status_code=404, detail="missing")
+
+    assert isinstance(success, FastJSONResponse)
+    assert json.loads(success.body) == {
+        "status_code": 200, "detail": "ok", "data": {"a": 1}, "previous_page": None,
+        "current_page": None, "next_page": None, "total_pages": None, "total": 1,
+    }
+    assert error.status_code == 404
+    assert json.loads(error.body)["detail"] == "missing"
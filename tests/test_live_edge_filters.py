@@ -0,0 +1,41 @@
+import pytest
+from sqlmodel import select
+
+from src.apps.road_network.models import EdgeModel
+from src.apps.road_network.utils import live_edge_filters
+
+
+@pytest.fixture
+def live_edges(edge_rows, make_network):
+    def query(version: float, root_id: str = "root") -> set[str]:
+        filters = live_edge_filters(make_network(version, root_id=root_id))
+        return {edge_id for edge_id, in edge_rows.query(select(EdgeModel.id).where(*filters))}
+
+    return query
+
+
+@pytest.mark.parametrize(
+    "version, expected",
+    [
+        (0.9, set()),
+        (1.0, {"open", "until-1.1"}),
+        (1.05, {"open", "until-1.1"}),
+        # Valid from the version it was added in, no longer in the version it was removed in
+        (1.1, {"open", "from-1.1"}),
+        (2.0, {"open", "from-1.1"}),
+    ],
+)
+def test_validity_range_includes_its_start_and_excludes_its_end(edge_rows, version, expected, live_edges):
+    edge_rows.add("open", valid_from_version=1.0)
+    edge_rows.add("until-1.1", valid_from_version=1.0, valid_to_version=1.1)
+    edge_rows.add("from-1.1", valid_from_version=1.1)
+
+    assert live_edges(version) == expected
+
+
+def test_edges_of_other_lineages_are_not_live(edge_rows, live_edges):
+    edge_rows.add("mine", valid_from_version=1.0)
+    edge_rows.add("theirs", valid_from_version=1.0, root_network_id="other")
+
+    assert live_edges(1.0) == {"mine"}
+    assert live_edges(1.0, root_id="other") == {"theirs"}
@@ -0,0 +1,63 @@
+from src.apps.road_network.cache import LRUCache
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = LRUCache(max_weight=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_entries_are_weighed():
+    cache = LRUCache(max_weight=10, weigh=len)
+    cache.set("a", b"123456")
+    cache.set("b", b"1234")
+    cache.set("c", b"12")
+
+    assert "a" not in cache
+    assert cache.get("b") == b"1234"
+    assert cache.get("c") == b"12"
+
+
+def test_value_heavier_than_the_cache_is_not_cached():
+    cache = LRUCache(max_weight=4, weigh=len)
+    cache.set("a", b"12")
+
+    cache.set("b", b"12345")
+
+    assert "b" not in cache
+    assert cache.get("a") == b"12"
+
+
+def test_replacing_an_entry_updates_its_weight():
+    cache = LRUCache(max_weight=6, weigh=len)
+    cache.set("a", b"123456")
+    cache.set("a", b"12")
+    cache.set("b", b"1234")
+
+    assert cache.get("a") == b"12"
+    assert cache.get("b") == b"1234"
+
+
+def test_pop_and_clear():
+    cache = LRUCache(max_weight=3)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    assert cache.pop("a") == 1
+    assert cache.pop("a", "missing") == "missing"
+    assert cache.get("a", "missing") == "missing"
+
+    cache.clear()
+    assert len(cache) == 0
+    cache.set("c", 3)
+    cache.set("d", 4)
+    cache.set("e", 5)
+    assert len(cache) == 3
@@ -0,0 +1,122 @@
+import pytest
+
+from src.apps.road_network.utils import (
+    EdgeFilterError, edge_properties, edge_property_value, property_edge_filters, split_promoted_properties
+)
+from src.settings import app_settings
+
+
+def test_empty_expression_gives_no_filters():
+    assert property_edge_filters(None) == []
+    assert property_edge_filters(" ; ") == []
+
+
+def test_equality_uses_containment_and_the_typed_column(compile_sql, compile_params):
+    filters = property_edge_filters("highway=primary")
+    (sql,), (params,) = compile_sql(filters, literal_binds=False), compile_params(filters)
+
+    assert "edge.properties @> " in sql
+    assert "edge.highway = " in sql
+    assert sorted(params.values(), key=str) == ["primary", {"highway": "primary"}]
+
+
+def test_numbers_also_match_their_string_form(compile_sql, compile_params):
+    filters = property_edge_filters("maxspeed=50")
+    (sql,), (params,) = compile_sql(filters, literal_binds=False), compile_params(filters)
+
+    assert sql.count("edge.properties @> ") == 2
+    assert {"maxspeed": 50} in params.values() and {"maxspeed": "50"} in params.values()
+
+
+@pytest.mark.parametrize("key", ["lanes", "length"])
+def test_range_on_promoted_number_also_checks_the_json_properties(key, compile_sql, compile_params):
+    filters = property_edge_filters(f"{key}>=2")
+
+    # Values that were not promoted, e.g. numeric strings, are only found in the JSONB properties
+    assert compile_sql(filters, literal_binds=False) == [
+        f"(edge.{key} >= %({key}_1)s) OR (edge.properties @? CAST(%(param_1)s AS JSONPATH))"
+    ]
+    assert compile_params(filters) == [{f"{key}_1": 2, "param_1": f'$."{key}" ? (@.double() >= 2)'}]
+
+
+def test_range_on_other_property_uses_a_jsonpath_predicate(compile_sql, compile_params):
+    filters = property_edge_filters('"maxspeed:forward"<80.5')
+
+    assert compile_sql(filters, literal_binds=False) == ["edge.properties @? CAST(%(param_1)s AS JSONPATH)"]
+    assert compile_params(filters) == [{"param_1": '$."maxspeed:forward" ? (@.double() < 80.5)'}]
+
+
+def test_range_on_unpromoted_key_falls_back_to_jsonpath(monkeypatch, compile_sql):
+    monkeypatch.setattr(app_settings, "PROMOTED_EDGE_PROPERTIES", {"highway"})
+
+    (sql,) = compile_sql(property_edge_filters("lanes>2"), literal_binds=False)
+
+    assert sql.startswith("edge.properties @? ")
+
+
+def test_negation_and_value_lists(compile_sql, compile_params):
+    filters = property_edge_filters("oneway!=true; highway in (primary, secondary)")
+    (negated, _), (_, listed) = compile_sql(filters, literal_binds=False), compile_params(filters)
+
+    assert negated.startswith("NOT coalesce(")
+    assert "primary" in str(listed) and "secondary" in str(listed)
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["lanes", "lanes>=two", "lanes>true", "highway in ()", "name=[1]", ";".join(["a=1"] * 21)],
+)
+def test_malformed_expressions_are_rejected(expression):
+    with pytest.raises(EdgeFilterError):
+        property_edge_filters(expression)
+
+
+def test_only_values_that_read_back_exactly_leave_the_json_properties():
+    remaining, promoted = split_promoted_properties(
+        {"highway": "primary", "lanes": "2", "oneway": 1, "length": 12.5, "name": "Main"}
+    )
+
+    assert remaining == {"lanes": "2", "oneway": 1, "name": "Main"}
+    assert promoted == ["primary", 2, None, 12.5]
+
+
+@pytest.mark.parametrize(
+    "properties, promoted, remaining",
+    [
+        # Numeric strings & integral floats are normalized, their original spelling is kept
+        ({"lanes": "2"}, [None, 2, None, None], {"lanes": "2"}),
+        ({"lanes": 2.0}, [None, 2, None, None], {"lanes": 2.0}),
+        ({"length": "191.0"}, [None, None, None, 191.0], {"length": "191.0"}),
+        ({"length": 10.0}, [None, None, None, 10.0], {"length": 10.0}),
+        ({"length": 1e20}, [None, None, None, 1e20], {"length": 1e20}),
+        ({"length": 10}, [None, None, None, 10.0], {}),
+        ({"lanes": 40000}, [None, None, None, None], {"lanes": 40000}),
+        ({"lanes": 2.5}, [None, None, None, None], {"lanes": 2.5}),
+        ({"lanes": "2;3"}, [None, None, None, None], {"lanes": "2;3"}),
+        ({"length": "1e999"}, [None, None, None, None], {"length": "1e999"}),
+        ({"oneway": False}, [None, None, False, None], {}),
+        ({"oneway": "yes"}, [None, None, None, None], {"oneway": "yes"}),
+        ({"highway": "a\x00b"}, [None, None, None, None], {"highway": "a\x00b"}),
+        (None, [None, None, None, None], None),
+    ],
+)
+def test_promotion_edge_cases(properties, promoted, remaining):
+    assert split_promoted_properties(properties) == (remaining, promoted)
+
+
+def test_equality_matches_normalized_numbers_on_the_typed_column(compile_sql, compile_params):
+    filters = property_edge_filters("lanes=2.0")
+    (sql,), (params,) = compile_sql(filters, literal_binds=False), compile_params(filters)
+
+    assert "edge.lanes = " in sql
+    assert 2 in params.values()
+
+
+def test_original_spellings_override_the_typed_columns(compile_sql):
+    assert compile_sql(edge_properties()).endswith(
+        ", 'length', edge.length)) || edge.properties ELSE edge.properties END"
+    )
+    assert compile_sql(edge_property_value("lanes")) == "coalesce(edge.properties -> 'lanes', to_jsonb(edge.lanes))"
+    assert compile_sql(edge_property_value("lanes", normalized=True)) == (
+        "coalesce(to_jsonb(edge.lanes), edge.properties -> 'lanes')"
+    )
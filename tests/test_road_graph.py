@@ -0,0 +1,79 @@
+import math
+
+import numpy as np
+
+from src.apps.road_network.graph import RoadGraph, one_to_many_costs
+
+
+def _grid(build_graph, size: int, seed: int = 0) -> RoadGraph:
+    random = np.random.default_rng(seed)
+    step = 0.001
+    lines = []
+
+    for x in range(size):
+        for y in range(size):
+            if x + 1 < size:
+                lines.append([(x * step, y * step), ((x + 1) * step, y * step)])
+            if y + 1 < size:
+                lines.append([(x * step, y * step), (x * step, (y + 1) * step)])
+
+    # Costs above the great-circle length, some below, and some one-way streets
+    lengths = [float(length) for length in random.uniform(50, 400, len(lines))]
+    oneways = [random.choice(["yes", "-1", None, None]) for _ in lines]
+    return build_graph(lines, lengths, oneways)
+
+
+def _node(graph: RoadGraph, lon: float, lat: float) -> int:
+    return graph.nearest_node(lon, lat)[0]
+
+
+def test_a_star_costs_match_dijkstra(build_graph):
+    graph = _grid(build_graph, 8)
+    nodes = len(graph.node_lons)
+
+    for source in range(0, nodes, 7):
+        targets = list(range(nodes))
+        expected = one_to_many_costs(graph.indptr, graph.arc_targets, graph.arc_costs, source, targets)
+
+        for target, cost in zip(targets, expected):
+            path = graph.shortest_path(source, target)
+
+            if math.isinf(cost):
+                assert path is None
+                continue
+
+            path_cost, arcs = path
+            assert math.isclose(path_cost, cost)
+            assert math.isclose(sum(graph.arc_costs[arc] for arc in arcs), cost)
+
+
+def test_path_arcs_connect_source_to_target(build_graph):
+    graph = build_graph(
+        [[(0, 0), (0.001, 0)], [(0.001, 0), (0.001, 0.0005), (0.002, 0)]], lengths=[10.0, 20.0]
+    )
+    source, target = _node(graph, 0, 0), _node(graph, 0.002, 0)
+
+    cost, arcs = graph.shortest_path(source, target)
+
+    assert cost == 30.0
+    assert graph.path_edge_ids(arcs) == ["e0", "e1"]
+    assert graph.path_coordinates(arcs) == [[0, 0], [0.001, 0], [0.001, 0.0005], [0.002, 0]]
+
+
+def test_oneway_edges_are_travelled_in_their_direction_only(build_graph):
+    lines = [[(0, 0), (0.001, 0)], [(0.001, 0), (0.002, 0)]]
+    forward = build_graph(lines, oneways=["yes", True])
+    backward = build_graph(lines, oneways=["-1", "reverse"])
+    start, end = _node(forward, 0, 0), _node(forward, 0.002, 0)
+
+    assert forward.shortest_path(start, end) is not None
+    assert forward.shortest_path(end, start) is None
+    assert backward.shortest_path(start, end) is None
+    assert backward.path_coordinates(backward.shortest_path(end, start)[1])[0] == [0.002, 0]
+
+
+def test_unreachable_target_has_no_path(build_graph):
+    graph = build_graph([[(0, 0), (0.001, 0)], [(1, 1), (1.001, 1)]])
+
+    assert graph.shortest_path(_node(graph, 0, 0), _node(graph, 1, 1)) is None
+    assert graph.shortest_path(_node(graph, 0, 0), _node(graph, 0, 0)) == (0.0, [])
@@ -0,0 +1,59 @@
+import pytest
+
+from src.apps.road_network.utils import EdgeFilterError, parse_point, spatial_edge_filters
+
+
+def test_no_parameters_give_no_filters():
+    assert spatial_edge_filters() == []
+
+
+def test_bbox_filter_uses_the_index_operator(compile_sql):
+    (sql,) = compile_sql(spatial_edge_filters(bbox="11.8,47.6,11.9,47.7"))
+
+    assert sql == "edge.geometry && ST_MakeEnvelope(11.8, 47.6, 11.9, 47.7, 4326)"
+
+
+def test_intersects_accepts_wkt_and_geojson(compile_sql):
+    wkt = spatial_edge_filters(intersects="POLYGON((0 0, 1 0, 1 1, 0 0))")
+    geojson = spatial_edge_filters(
+        intersects='{"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 0]]]}'
+    )
+
+    (sql,) = compile_sql(wkt)
+    assert compile_sql(geojson) == [sql]
+    assert "ST_Intersects(edge.geometry, ST_GeomFromText('POLYGON ((0 0, 1 0, 1 1, 0 0))', 4326))" in sql
+
+
+def test_within_distance_is_narrowed_down_by_an_envelope(compile_sql):
+    envelope, distance = compile_sql(spatial_edge_filters(within_distance="11.85,47.65,1000"))
+
+    assert envelope.startswith("edge.geometry && ST_MakeEnvelope(")
+    assert distance.startswith("ST_DWithin(geography(edge.geometry), geography(ST_SetSRID(ST_MakePoint(11.85, 47.65)")
+    assert distance.endswith(", 1000.0)")
+
+
+@pytest.mark.parametrize(
+    "parameters",
+    [
+        {"bbox": "0,0,1"},
+        {"bbox": "0,0,1,x"},
+        {"bbox": "1,0,0,1"},
+        {"bbox": "0,0,inf,1"},
+        {"intersects": "LINESTRING(0 0, 1 1)"},
+        {"intersects": "POLYGON((0 0, 1 1, 1 0, 0 1, 0 0))"},
+        {"intersects": "not a polygon"},
+        {"within_distance": "0,0"},
+        {"within_distance": "0,91,10"},
+        {"within_distance": "0,0,-1"},
+    ],
+)
+def test_malformed_parameters_are_rejected(parameters):
+    with pytest.raises(EdgeFilterError):
+        spatial_edge_filters(**parameters)
+
+
+def test_points_are_parsed_and_checked():
+    assert parse_point("11.85, 47.65", "from") == (11.85, 47.65)
+
+    with pytest.raises(EdgeFilterError, match="`from`"):
+        parse_point("181,0", "from")
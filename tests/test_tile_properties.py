@@ -0,0 +1,28 @@
+import pytest
+
+from src.apps.road_network.utils import tile_properties
+from src.settings import app_settings
+
+
+@pytest.fixture
+def zoom_properties(monkeypatch):
+    monkeypatch.setattr(app_settings, "TILE_ZOOM_PROPERTIES", {4: ["highway"], 10: ["highway", "lanes"], 14: None})
+
+
+@pytest.mark.parametrize(
+    "z, expected",
+    [(4, ["highway"]), (9, ["highway"]), (10, ["highway", "lanes"]), (14, None), (22, None)],
+)
+def test_properties_of_the_closest_lower_zoom_level(zoom_properties, z, expected):
+    assert tile_properties(z) == expected
+
+
+@pytest.mark.parametrize("z", [0, 3])
+def test_zoom_below_all_levels_includes_no_properties(zoom_properties, z):
+    assert tile_properties(z) == []
+
+
+def test_without_zoom_levels_no_properties_are_included(monkeypatch):
+    monkeypatch.setattr(app_settings, "TILE_ZOOM_PROPERTIES", {})
+
+    assert tile_properties(14) == []
@@ -0,0 +1,49 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.apps.road_network import matrix
+from src.apps.road_network.api.create_travel_matrix_api import _json_row
+from src.apps.road_network.graph import RoadGraph, one_to_many_costs
+from src.apps.road_network.matrix import SharedGraph, _graph_rows, _shared_rows
+
+
+@pytest.fixture
+def graph(build_graph) -> RoadGraph:
+    # A one-way chain 0 -> 1 -> 2 & a separate two-way edge
+    lines = [[(0, 0), (0.001, 0)], [(0.001, 0), (0.002, 0)], [(1, 1), (1.001, 1)]]
+    return build_graph(lines, lengths=[10.0, 20.0, 5.0], oneways=["yes", "yes", None])
+
+
+def test_one_to_many_costs(graph):
+    start, middle, end = (graph.nearest_node(lon, 0)[0] for lon in (0, 0.001, 0.002))
+    far = graph.nearest_node(1, 1)[0]
+
+    assert one_to_many_costs(graph.indptr, graph.arc_targets, graph.arc_costs, start, [end, middle, start, far]) == [
+        30.0, 10.0, 0.0, math.inf
+    ]
+    assert one_to_many_costs(graph.indptr, graph.arc_targets, graph.arc_costs, end, [start]) == [math.inf]
+
+
+def test_shared_graph_rows_match_the_graph(graph, monkeypatch):
+    nodes = list(range(len(graph.node_lons)))
+    shared = SharedGraph(graph)
+    monkeypatch.setattr(matrix, "_attached_graphs", matrix.OrderedDict())
+
+    try:
+        np.testing.assert_array_equal(
+            _shared_rows(shared.descriptor, nodes, nodes), _graph_rows(graph, nodes, nodes)
+        )
+        assert _graph_rows(graph, nodes, nodes).shape == (len(nodes), len(nodes))
+    finally:
+        for segments, arrays in matrix._attached_graphs.values():
+            for array in arrays:
+                array.release()
+            for segment in segments:
+                segment.close()
+        shared.close()
+
+
+def test_unreachable_costs_render_as_null():
+    assert _json_row(np.array([1.234, math.inf, 0.0])) == [1.23, None, 0.0]